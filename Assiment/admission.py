@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Admission control for registration bursts
+
+When registration for a popular event opens, clients submit requests to an
+AdmissionController instead of calling register_for_event directly:
+
+- requests for events that are already full are rejected immediately;
+- each user is rate limited by a token bucket, dropped again once it has
+  been idle long enough to refill;
+- accepted requests wait in a bounded queue that is served round-robin per
+  user, so one client retrying in a loop cannot starve the others;
+- one worker drains the queue in batches, and each batch is applied in one
+  store transaction, i.e. one lock and one save for many registrations. A
+  transaction holds the store's exclusive lock, so more workers would only
+  wait for each other.
+
+Run this module to simulate a burst:
+    python admission.py --students 2000 --capacity 500
+"""
+
+import argparse
+import io
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import redirect_stdout
+from typing import Deque, Dict, List, Optional, Tuple
+
+from event_management_system import EventManagementSystem, UserRole
+
+# Outcomes a submitted request's future resolves to
+REGISTERED = "registered"
+EVENT_FULL = "event_full"
+EVENT_NOT_FOUND = "event_not_found"
+RATE_LIMITED = "rate_limited"
+QUEUE_FULL = "queue_full"
+FAILED = "failed"  # Rejected by the system, e.g. already registered
+SHUT_DOWN = "shut_down"
+ERROR = "error"  # The batch's transaction raised; the future raises too
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def allow(self, now: float) -> bool:
+        """Take one token if available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class FairQueue:
+    """Bounded queue with one FIFO per user, served round-robin across users"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._size = 0
+        self._per_user: Dict[str, Deque] = {}
+        self._ready_users: Deque[str] = deque()  # Users with queued items, in service order
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, user_id: str, item) -> bool:
+        """Queue an item; returns False if the queue is full or closed"""
+        with self._condition:
+            if self._closed or self._size >= self.capacity:
+                return False
+            items = self._per_user.get(user_id)
+            if items is None:
+                items = self._per_user[user_id] = deque()
+                self._ready_users.append(user_id)
+            items.append(item)
+            self._size += 1
+            self._condition.notify()
+            return True
+
+    def get_batch(self, max_items: int, timeout: float) -> List:
+        """Take up to max_items, one per user per round; waits up to timeout for the first"""
+        with self._condition:
+            if not self._size and not self._closed:
+                self._condition.wait(timeout)
+
+            batch = []
+            while self._ready_users and len(batch) < max_items:
+                user_id = self._ready_users.popleft()
+                items = self._per_user[user_id]
+                batch.append(items.popleft())
+                if items:
+                    self._ready_users.append(user_id)
+                else:
+                    del self._per_user[user_id]
+            self._size -= len(batch)
+            return batch
+
+    def close(self) -> List:
+        """Stop accepting items and return whatever was still queued"""
+        with self._condition:
+            self._closed = True
+            leftovers = [item for items in self._per_user.values() for item in items]
+            self._per_user.clear()
+            self._ready_users.clear()
+            self._size = 0
+            self._condition.notify_all()
+            return leftovers
+
+
+class AdmissionController:
+    """Front door for register_for_event during registration bursts"""
+
+    def __init__(self, system: EventManagementSystem,
+                 queue_capacity: int = 10000, batch_size: int = 64,
+                 rate: float = 2.0, burst: float = 5.0, clock=time.monotonic):
+        self.system = system
+        self.batch_size = batch_size
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._queue = FairQueue(queue_capacity)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._pruned = clock()  # When idle buckets were last dropped
+        self._stats_lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._outcomes: Dict[str, int] = {}
+        self._running = True
+        self._worker = threading.Thread(target=self._work, name="admission", daemon=True)
+        self._worker.start()
+
+    def submit(self, user_id: str, event_id: str) -> Future:
+        """Request a registration; the returned future resolves to one of the outcome constants"""
+        submitted = self.clock()
+        future: Future = Future()
+
+        # Fast rejections never touch the queue (reads are lock-free hints)
+        event = self.system.get_event(event_id)
+        if event is None:
+            return self._finish(future, EVENT_NOT_FOUND, submitted)
+        if event.is_full():
+            return self._finish(future, EVENT_FULL, submitted)
+
+        with self._buckets_lock:
+            if submitted - self._pruned >= self.burst / self.rate:
+                self._prune_buckets(submitted)
+            bucket = self._buckets.get(user_id)
+            if bucket is None:
+                bucket = self._buckets[user_id] = TokenBucket(self.rate, self.burst, submitted)
+            allowed = bucket.allow(submitted)
+        if not allowed:
+            return self._finish(future, RATE_LIMITED, submitted)
+
+        if not self._queue.put(user_id, (user_id, event_id, future, submitted)):
+            return self._finish(future, QUEUE_FULL if self._running else SHUT_DOWN, submitted)
+        return future
+
+    def _prune_buckets(self, now: float):
+        """Drop buckets idle long enough to have refilled; a new bucket starts
+        full, so the user is limited exactly as before"""
+        refill_seconds = self.burst / self.rate
+        for user_id in [user_id for user_id, bucket in self._buckets.items()
+                        if now - bucket.updated >= refill_seconds]:
+            del self._buckets[user_id]
+        self._pruned = now
+
+    def _finish(self, future: Future, outcome: str, submitted: float) -> Future:
+        """Resolve a future and record its latency"""
+        self._record(outcome, submitted)
+        future.set_result(outcome)
+        return future
+
+    def _record(self, outcome: str, submitted: float):
+        """Count an outcome and its latency"""
+        latency = self.clock() - submitted
+        with self._stats_lock:
+            self._latencies.append(latency)
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+
+    def _work(self):
+        """Worker loop: apply queued requests in batches, one transaction per batch"""
+        while self._running or len(self._queue):
+            batch = self._queue.get_batch(self.batch_size, timeout=0.1)
+            if batch:
+                self._apply(batch)
+
+    def _apply(self, batch: List[Tuple[str, str, Future, float]]):
+        """Register a batch of requests with a single lock and save, on each
+        user's behalf so the system's session is left alone"""
+        outcomes = []
+        try:
+            with self.system.transaction():
+                for user_id, event_id, _, _ in batch:
+                    event = self.system.get_event(event_id)
+                    if event is None:
+                        outcomes.append(EVENT_NOT_FOUND)
+                    elif event.is_full():
+                        outcomes.append(EVENT_FULL)
+                    elif self.system._register_user_for_event(user_id, event_id):
+                        outcomes.append(REGISTERED)
+                    else:
+                        outcomes.append(FAILED)
+        except Exception as e:
+            for _, _, future, submitted in batch:
+                self._record(ERROR, submitted)
+                future.set_exception(e)
+            return
+
+        # Acknowledge only after the transaction has been saved
+        for (_, _, future, submitted), outcome in zip(batch, outcomes):
+            self._finish(future, outcome, submitted)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker; queued requests are finished first when wait=True"""
+        self._running = False
+        if wait:
+            self._worker.join()
+        for _, _, future, submitted in self._queue.close():
+            self._finish(future, SHUT_DOWN, submitted)
+
+    def stats(self) -> Dict:
+        """Outcome counts and latency percentiles (milliseconds)"""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            outcomes = dict(self._outcomes)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {"outcomes": outcomes, "requests": len(latencies), "p50_ms": percentile(0.50),
+                "p99_ms": percentile(0.99), "max_ms": latencies[-1] * 1000 if latencies else 0.0}
+
+
+def simulate_burst(students: int = 2000, capacity: int = 500, clients: int = 32,
+                   data_dir: Optional[str] = None) -> Dict:
+    """Open registration for one event and let `students` clients hit it at once.
+    Returns the admission controller stats and the naive direct-call stats."""
+    def setup(directory):
+        with redirect_stdout(io.StringIO()):
+            system = EventManagementSystem(data_dir=directory)
+            with system.transaction():
+                admin_id = system.register_user("admin", UserRole.ADMIN)
+                student_ids = [system.register_user(f"student_{i}", UserRole.STUDENT)
+                               for i in range(students)]
+                system.login(admin_id)
+                event_id = system.create_event("Popular Workshop", "Limited seats",
+                                               "2024-09-01", "10:00", "Hall", capacity)
+                system.logout()
+        return system, student_ids, event_id
+
+    def run_clients(student_ids, request):
+        """Fire one request per student from `clients` threads started together"""
+        start = threading.Barrier(clients)
+
+        def client(chunk):
+            start.wait()
+            for student_id in chunk:
+                request(student_id)
+
+        threads = [threading.Thread(target=client, args=(student_ids[i::clients],))
+                   for i in range(clients)]
+        began = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - began
+
+    root = data_dir or tempfile.mkdtemp(prefix="ems_burst_")
+    results = {}
+
+    # Admission controller: queue + batches
+    system, student_ids, event_id = setup(f"{root}/admission")
+    controller = AdmissionController(system)
+    futures = []
+    with redirect_stdout(io.StringIO()):
+        elapsed = run_clients(student_ids,
+                              lambda student_id: futures.append(controller.submit(student_id, event_id)))
+        for future in futures:
+            future.result()
+        controller.shutdown()
+    results["admission"] = dict(controller.stats(), seconds=elapsed,
+                                attendees=len(system.events[event_id].attendees))
+
+    # Naive: every client calls register_for_event directly, one save each
+    system, student_ids, event_id = setup(f"{root}/naive")
+    lock = threading.Lock()
+    latencies = []
+
+    def direct(student_id):
+        submitted = time.perf_counter()
+        with lock:
+            system.login(student_id)
+            system.register_for_event(event_id)
+        latencies.append(time.perf_counter() - submitted)
+
+    with redirect_stdout(io.StringIO()):
+        elapsed = run_clients(student_ids, direct)
+    latencies.sort()
+    results["naive"] = {"requests": len(latencies), "seconds": elapsed,
+                        "p50_ms": latencies[len(latencies) // 2] * 1000,
+                        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+                        "max_ms": latencies[-1] * 1000,
+                        "attendees": len(system.events[event_id].attendees)}
+
+    if data_dir is None:
+        shutil.rmtree(root)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a registration burst")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--capacity", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=32)
+    args = parser.parse_args()
+
+    results = simulate_burst(args.students, args.capacity, args.clients)
+    for name, stats in results.items():
+        print(f"📊 {name}: {stats['requests']} requests in {stats['seconds']:.2f}s, "
+              f"p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms, "
+              f"max {stats['max_ms']:.1f} ms, {stats['attendees']} registered")
+        if "outcomes" in stats:
+            print(f"   outcomes: {stats['outcomes']}")
+
+
+if __name__ == "__main__":
+    main()
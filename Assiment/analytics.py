@@ -0,0 +1,213 @@
+"""
+Columnar attendance analytics for the Campus Event Management System
+
+Events and registrations are projected once into flat integer columns, which
+the system then keeps current, and every report is a group-by over those
+columns. NumPy is used when it is installed; otherwise the same group-bys run
+over the standard library's array module.
+"""
+
+from array import array
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import recurrence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class AttendanceColumns:
+    """Events and registrations as parallel integer columns plus code
+    dictionaries, kept current as events and registrations change"""
+
+    def __init__(self, users: Dict):
+        self._users = users
+
+        # One row per event, or per date of a series someone registered for
+        self.event_ids: List[str] = []
+        self.capacity = array('l')
+        self.attendance = array('l')
+        self.organizer = array('l')  # Code into organizer_names
+        self.location = array('l')  # Code into location_names
+        self.weekday = array('l')  # 0-6, or 7 for an unparseable date
+        self.month = array('l')  # Code into month_names
+        self.rows: Dict[str, int] = {}  # Event or date ID -> row
+
+        # Registrations per role code
+        self.role_registrations = array('l')
+
+        self.organizer_names: List[str] = []
+        self.location_names: List[str] = []
+        self.month_names: List[str] = []
+        self.role_names: List[str] = []
+        self._organizer_codes: Dict[str, int] = {}
+        self._location_codes: Dict[str, int] = {}
+        self._month_codes: Dict[str, int] = {}
+        self._role_codes: Dict[str, int] = {}
+
+    def add_event(self, event):
+        """Add the rows of a stored event"""
+        for row_id, day, attendees in _event_rows(event):
+            self._add_row(row_id, day, event, attendees)
+
+    def remove_event(self, event):
+        """Remove the rows of a stored event"""
+        for row_id, _, attendees in _event_rows(event):
+            self._remove_row(row_id, attendees)
+
+    def remove_date(self, occurrence):
+        """Remove the row of one date of a series"""
+        if occurrence.event_id in self.rows:
+            self._remove_row(occurrence.event_id, occurrence.attendees)
+
+    def register(self, event, user_id: str):
+        """Count a registration for an event or one date of a series"""
+        row = self.rows.get(event.event_id)
+        if row is None:  # First registration for a date of a series
+            row = self._add_row(event.event_id, event.date, event, ())
+        self.attendance[row] += 1
+        self._count_roles((user_id,), 1)
+
+    def unregister(self, event, user_id: str, series_date: bool = False):
+        """Uncount a registration for an event or, with series_date, one date of
+        a series; a date of a series nobody is registered for loses its row"""
+        row = self.rows[event.event_id]
+        if series_date and self.attendance[row] == 1:
+            self._remove_row(event.event_id, (user_id,))  # Nobody left on that date
+            return
+        self.attendance[row] -= 1
+        self._count_roles((user_id,), -1)
+
+    def _add_row(self, row_id: str, day: str, event, attendees: List[str]) -> int:
+        row = self.rows[row_id] = len(self.event_ids)
+        organizer = self._users.get(event.organizer_id)
+        organizer_name = organizer.username if organizer else event.organizer_id
+        self.event_ids.append(row_id)
+        self.capacity.append(event.max_capacity)
+        self.attendance.append(len(attendees))
+        self.organizer.append(_encode(organizer_name, self._organizer_codes, self.organizer_names))
+        self.location.append(_encode(event.location, self._location_codes, self.location_names))
+        try:
+            self.weekday.append(date.fromisoformat(day).weekday())
+            self.month.append(_encode(day[:7], self._month_codes, self.month_names))
+        except ValueError:
+            self.weekday.append(7)
+            self.month.append(_encode("unknown", self._month_codes, self.month_names))
+        self._count_roles(attendees, 1)
+        return row
+
+    def _remove_row(self, row_id: str, attendees: List[str]):
+        """Remove a row by moving the last row into its place"""
+        row = self.rows.pop(row_id)
+        last = len(self.event_ids) - 1
+        for column in (self.event_ids, self.capacity, self.attendance, self.organizer,
+                       self.location, self.weekday, self.month):
+            column[row] = column[last]
+            column.pop()
+        if row != last:
+            self.rows[self.event_ids[row]] = row
+        self._count_roles(attendees, -1)
+
+    def _count_roles(self, user_ids, sign: int):
+        """Add (or with sign -1 remove) registrations by these users to the role
+        totals; users without a record are counted under the "unknown" role"""
+        for role, count in Counter(map(self._role, user_ids)).items():
+            code = _encode(role, self._role_codes, self.role_names)
+            if code == len(self.role_registrations):
+                self.role_registrations.append(0)
+            self.role_registrations[code] += sign * count
+
+    def _role(self, user_id: str) -> str:
+        user = self._users.get(user_id)
+        return user.role.value if user else "unknown"
+
+
+def _encode(value: str, codes: Dict[str, int], names: List[str]) -> int:
+    """Dictionary-encode a string value"""
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(names)
+        names.append(value)
+    return code
+
+
+def _event_rows(event) -> List[Tuple[str, str, List[str]]]:
+    """(row ID, date, attendees) of an event, or of each date of a series someone registered for"""
+    if event.recurrence:
+        return [(recurrence.occurrence_id(event.event_id, day), day, attendees)
+                for day, attendees in event.occurrence_attendees.items()]
+    return [(event.event_id, event.date, event.attendees)]
+
+
+def project(users: Dict, events: Dict) -> AttendanceColumns:
+    """Project user/event objects into attendance columns"""
+    columns = AttendanceColumns(users)
+    for event in events.values():
+        columns.add_event(event)
+    return columns
+
+
+def _as_numpy(column: array):
+    """Zero-copy NumPy view of an integer array column"""
+    return np.frombuffer(column, dtype=f"i{column.itemsize}")
+
+
+def _group_sum(codes: array, weights: Optional[array], size: int) -> List[int]:
+    """Sum weights (or count rows) per code"""
+    if np is not None:
+        weight_column = _as_numpy(weights) if weights is not None else None
+        totals = np.bincount(_as_numpy(codes), weights=weight_column, minlength=size)
+        return [int(total) for total in totals[:size]]
+
+    totals = [0] * size
+    if weights is None:
+        for code, count in Counter(codes).items():
+            totals[code] = count
+    else:
+        for code, weight in zip(codes, weights):
+            totals[code] += weight
+    return totals
+
+
+def _fill_rates(attendance: array, capacity: array) -> List[float]:
+    """Attendance divided by capacity for every event"""
+    if np is not None:
+        attended = _as_numpy(attendance)
+        capacities = _as_numpy(capacity)
+        rates = np.divide(attended, capacities, out=np.zeros(len(attended)), where=capacities > 0)
+        return rates.tolist()
+    return [attended / capacity_ if capacity_ > 0 else 0.0
+            for attended, capacity_ in zip(attendance, capacity)]
+
+
+def _present(names: List[str], codes: array) -> List[Tuple[int, str]]:
+    """(code, name) of the names some row still uses"""
+    rows = _group_sum(codes, None, len(names))
+    return [(code, name) for code, name in enumerate(names) if rows[code]]
+
+
+def attendance_report(columns: AttendanceColumns, total_events: int) -> Dict:
+    """Fill rates and attendance grouped by organizer, location, weekday, month and role"""
+    def by(names: List[str], codes: array) -> Dict[str, int]:
+        totals = _group_sum(codes, columns.attendance, len(names))
+        return {name: totals[code] for code, name in _present(names, codes)}
+
+    by_weekday = _group_sum(columns.weekday, columns.attendance, len(WEEKDAYS) + 1)
+
+    return {
+        "backend": "numpy" if np is not None else "array",
+        "total_events": total_events,
+        "total_registrations": sum(columns.role_registrations),
+        "fill_rate": dict(zip(columns.event_ids, _fill_rates(columns.attendance, columns.capacity))),
+        "by_organizer": by(columns.organizer_names, columns.organizer),
+        "by_location": by(columns.location_names, columns.location),
+        "by_weekday": {WEEKDAYS[day]: total for day, total in enumerate(by_weekday[:7])},
+        "by_month": dict(sorted(by(columns.month_names, columns.month).items())),
+        "by_role": {role: total for role, total in zip(columns.role_names, columns.role_registrations) if total}
+    }
@@ -0,0 +1,116 @@
+"""
+Cold storage for past events
+
+Archiving moves events out of events.json (and users' event lists) into
+append-only, gzip-compressed JSONL segments, one per archive run:
+
+    data/archive/events-000001.jsonl.gz   # One event dict per line, attendees included
+    data/archive/index.json               # event_id -> segment, name, date and organizer
+
+Only the index is read to answer "is this event archived?" or to find its
+segment; a lookup then decompresses that one segment, and a search streams
+through the segments one at a time. Nothing here is loaded with the active
+data, so archived events cost the hot path nothing.
+
+A segment is written before the index that points at it, and both before
+the active data is saved without the archived events. A crash in between
+leaves an event in both places, never in neither; archiving it again simply
+points the index at the newer segment.
+"""
+
+import gzip
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+INDEX_FILE = "index.json"
+SEGMENT_PREFIX = "events-"
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+class EventArchive:
+    """Append-only compressed segments of archived event dicts, with an index"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._index: Optional[Dict[str, Dict]] = None  # Read on first use
+
+    @property
+    def index(self) -> Dict[str, Dict]:
+        """event_id -> {"segment", "name", "date", "organizer_id"} of every archived event"""
+        if self._index is None:
+            path = os.path.join(self.directory, INDEX_FILE)
+            self._index = {}
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+        return self._index
+
+    def reset(self):
+        """Forget the cached index, e.g. after another process archived events"""
+        self._index = None
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _segments(self) -> List[str]:
+        """Segment file names, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory)
+                      if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX))
+
+    def add(self, records: Iterable[Dict]) -> Optional[str]:
+        """Write event dicts to a new segment and index them; returns the segment name"""
+        records = list(records)
+        if not records:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self._segments()
+        number = int(segments[-1][len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) + 1 if segments else 1
+        segment = f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+        path = os.path.join(self.directory, segment)
+        with gzip.open(f"{path}.tmp", 'wt', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+        os.replace(f"{path}.tmp", path)
+
+        index = self.index
+        for record in records:
+            index[record["event_id"]] = {"segment": segment, "name": record["name"],
+                                         "date": record["date"], "organizer_id": record["organizer_id"]}
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        with open(f"{index_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(f"{index_path}.tmp", index_path)
+        return segment
+
+    def _read_segment(self, segment: str) -> Iterator[Dict]:
+        """Stream the event dicts of one segment"""
+        with gzip.open(os.path.join(self.directory, segment), 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def get(self, event_id: str) -> Optional[Dict]:
+        """An archived event dict, reading only the segment that holds it"""
+        entry = self.index.get(event_id)
+        if entry is None:
+            return None
+        for record in self._read_segment(entry["segment"]):
+            if record["event_id"] == event_id:
+                return record
+        return None
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Every archived event dict, one segment at a time; superseded copies are skipped"""
+        index = self.index
+        for segment in self._segments():
+            for record in self._read_segment(segment):
+                entry = index.get(record["event_id"])
+                if entry is not None and entry["segment"] == segment:
+                    yield record
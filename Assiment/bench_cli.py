@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the batch CLI
+
+Runs events_cli.py commands as fresh processes, the way shell scripts and
+cron jobs do, and reports wall-clock milliseconds per command next to a bare
+interpreter start for reference.
+
+Usage:
+    python bench_cli.py --users 10000 --events 2000 --runs 10
+"""
+
+import argparse
+import compileall
+import io
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from bench_load import generate_data
+from event_management_system import EventManagementSystem, UserRole
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def time_process(command, runs: int):
+    """Median and best wall-clock milliseconds of running command"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold-start latency")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--registrations", type=int, default=20, help="Attendees per event")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    # Measure with up-to-date bytecode, as an installed copy would run
+    compileall.compile_dir(HERE, maxlevels=0, quiet=1)
+
+    data_dir = tempfile.mkdtemp(prefix="ems_cli_bench_")
+    generate_data(data_dir, args.users, args.events, args.registrations)
+    with redirect_stdout(io.StringIO()):
+        EventManagementSystem(data_dir=data_dir).register_user("admin", UserRole.ADMIN)
+
+    cli = [sys.executable, "events_cli.py", "--data-dir", data_dir]
+    commands = [
+        ("python -c pass", [sys.executable, "-c", "pass"]),
+        ("events --help", cli + ["--help"]),
+        ("events search", cli + ["search", "Event 42", "--limit", "5"]),
+        ("events stats", cli + ["--as", "admin", "stats"]),
+        ("events export events", cli + ["--as", "admin", "export", "events"]),
+    ]
+
+    print(f"📦 {args.users} users, {args.events} events in {data_dir}, {args.runs} runs each")
+    for name, command in commands:
+        median, best = time_process(command, args.runs)
+        print(f"   {name:<22} median {median:8.1f} ms   best {best:8.1f} ms")
+    shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
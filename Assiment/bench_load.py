@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the Campus Event Management System
+
+Generates a synthetic data directory and times each stage of startup:
+JSON parsing, record deserialization (per-record constructor path versus the
+bulk path) and a full EventManagementSystem load including index building.
+
+Usage:
+    python bench_load.py --users 100000 --events 20000 --registrations 20
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from event_management_system import Event, EventManagementSystem, User, UserRole
+
+
+def generate_data(data_dir: str, num_users: int, num_events: int, registrations: int):
+    """Write synthetic users.json and events.json files"""
+    rng = random.Random(42)
+    roles = [UserRole.STUDENT.value, UserRole.VISITOR.value]
+    users = {}
+    for i in range(1, num_users + 1):
+        user_id = f"user_{i}"
+        users[user_id] = {"user_id": user_id, "username": f"user{i}", "role": rng.choice(roles),
+                          "email": f"user{i}@campus.edu", "created_events": [],
+                          "registered_events": [], "version": i}
+
+    events = {}
+    user_ids = list(users)
+    for i in range(1, num_events + 1):
+        event_id = f"event_{i}"
+        attendees = rng.sample(user_ids, min(registrations, len(user_ids)))
+        for user_id in attendees:
+            users[user_id]["registered_events"].append(event_id)
+        events[event_id] = {"event_id": event_id, "name": f"Event {i}",
+                            "description": f"Description of event {i}",
+                            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                            "time": "10:00", "location": f"Room {rng.randint(1, 200)}",
+                            "max_capacity": registrations * 2, "organizer_id": "user_1",
+                            "attendees": attendees, "created_at": "2024-01-01T00:00:00",
+                            "version": num_users + i}
+
+    with open(os.path.join(data_dir, "users.json"), 'w', encoding='utf-8') as f:
+        json.dump(users, f)
+    with open(os.path.join(data_dir, "events.json"), 'w', encoding='utf-8') as f:
+        json.dump(events, f)
+
+
+def constructor_users(users_data):
+    """Per-record path the loader used before: constructor, kwargs and UserRole(value)"""
+    users = {}
+    for user_id, data in users_data.items():
+        user = User(user_id=data["user_id"], username=data["username"],
+                    role=UserRole(data["role"]), email=data.get("email", ""))
+        user.created_events = data.get("created_events", [])
+        user.registered_events = data.get("registered_events", [])
+        users[user_id] = user
+    return users
+
+
+def constructor_events(events_data):
+    """Per-record path the loader used before: constructor (with datetime.now()) then overwrite"""
+    events = {}
+    for event_id, data in events_data.items():
+        event = Event(event_id=data["event_id"], name=data["name"],
+                      description=data["description"], date=data["date"], time=data["time"],
+                      location=data["location"], max_capacity=data["max_capacity"],
+                      organizer_id=data["organizer_id"])
+        event.attendees = data.get("attendees", [])
+        event.created_at = data.get("created_at")
+        events[event_id] = event
+    return events
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Best wall-clock time of func(*args) in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data loading")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--registrations", type=int, default=20, help="Attendees per event")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="ems_bench_")
+    generate_data(data_dir, args.users, args.events, args.registrations)
+
+    def parse(name):
+        with open(os.path.join(data_dir, name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    users_data = parse("users.json")
+    events_data = parse("events.json")
+
+    print(f"📦 {args.users} users, {args.events} events, "
+          f"{args.events * args.registrations} registrations in {data_dir}")
+    print(f"   json.load (both files):      {best_of(args.repeat, lambda: (parse('users.json'), parse('events.json'))):9.1f} ms")
+    print(f"   users via constructor:       {best_of(args.repeat, constructor_users, users_data):9.1f} ms")
+    print(f"   users via bulk_from_dicts:   {best_of(args.repeat, User.bulk_from_dicts, users_data):9.1f} ms")
+    print(f"   events via constructor:      {best_of(args.repeat, constructor_events, events_data):9.1f} ms")
+    print(f"   events via bulk_from_dicts:  {best_of(args.repeat, Event.bulk_from_dicts, events_data):9.1f} ms")
+    print(f"   full EventManagementSystem:  {best_of(args.repeat, EventManagementSystem, data_dir):9.1f} ms")
+    shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Rotating JSONL changelog (change-data-capture feed) for the Campus Event Management System
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SEGMENT_PREFIX = "changes-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class OffsetExpiredError(Exception):
+    """Raised when a consumer's saved offset points into a segment removed by retention"""
+
+
+class ChangeFeed:
+    """Append-only changelog split into numbered segment files.
+
+    Offsets are "segment:byte" strings. Every record read is returned with the
+    offset just after it, so a consumer can save that offset and resume later.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 1024 * 1024,
+                 max_segments: int = 50):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+
+    def _segment_path(self, segment: int) -> str:
+        """Path of a numbered segment file"""
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{segment:08d}{SEGMENT_SUFFIX}")
+
+    def segments(self) -> List[int]:
+        """Numbers of the segments currently on disk, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                      for name in os.listdir(self.directory)
+                      if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX))
+
+    def append(self, change_type: str, seq: int, data: Dict) -> str:
+        """Append one typed change record; returns the offset after it"""
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self.segments()
+        segment = segments[-1] if segments else 1
+
+        path = self._segment_path(segment)
+        if os.path.exists(path) and os.path.getsize(path) >= self.max_segment_bytes:
+            segment += 1
+            path = self._segment_path(segment)
+            segments.append(segment)
+            # Retention: drop the oldest segments beyond the limit
+            for old_segment in segments[:-self.max_segments]:
+                os.remove(self._segment_path(old_segment))
+
+        record = {"seq": seq, "type": change_type, "at": datetime.now().isoformat(), "data": data}
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(path, "ab") as f:
+            f.write(line)
+            return f"{segment}:{f.tell()}"
+
+    def end_offset(self) -> str:
+        """Offset just past the last record, for consumers that only want new changes"""
+        segments = self.segments()
+        if not segments:
+            return "1:0"
+        return f"{segments[-1]}:{os.path.getsize(self._segment_path(segments[-1]))}"
+
+    @staticmethod
+    def _parse_offset(offset: str) -> Tuple[int, int]:
+        """Split a "segment:byte" offset"""
+        segment, position = offset.split(":")
+        return int(segment), int(position)
+
+    def read(self, offset: Optional[str] = None, follow: bool = False,
+             poll_interval: float = 0.2,
+             idle_timeout: Optional[float] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield (offset_after, record) pairs starting at offset (or the oldest record).
+
+        Records are read one line at a time as the consumer asks for them, so
+        memory stays flat and a slow consumer simply reads behind the writer.
+        With follow=True the generator waits for new records; idle_timeout
+        ends it after that many seconds without one.
+        """
+        segments = self.segments()
+        if offset is None:
+            segment, position = (segments[0] if segments else 1), 0
+        else:
+            segment, position = self._parse_offset(offset)
+            if segments and segment < segments[0]:
+                raise OffsetExpiredError(
+                    f"Offset {offset} is older than the oldest retained segment {segments[0]}")
+
+        idle_since = time.monotonic()
+        while True:
+            path = self._segment_path(segment)
+            if not os.path.exists(path):
+                retained = self.segments()
+                if retained and segment < retained[0]:
+                    raise OffsetExpiredError(
+                        f"Segment {segment} was removed before it was read")
+            else:
+                with open(path, "rb") as f:
+                    f.seek(position)
+                    while True:
+                        line = f.readline()
+                        if not line.endswith(b"\n"):
+                            # End of segment, or a record still being written
+                            break
+                        position = f.tell()
+                        idle_since = time.monotonic()
+                        yield f"{segment}:{position}", json.loads(line)
+
+            if any(later > segment for later in self.segments()):
+                segment, position = segment + 1, 0
+                continue
+
+            if not follow:
+                return
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,35 @@
+"""
+Organizer dashboards: running totals of an organizer's events, kept current by the mutations
+"""
+
+from typing import Dict, Optional, Tuple
+
+
+class OrganizerDashboard:
+    """Running totals of one organizer's events; a series counts once, with the
+    seats of the dates anyone registered for"""
+
+    __slots__ = ("events", "seats", "filled", "fastest")
+
+    def __init__(self):
+        self.events = 0
+        self.seats = 0
+        self.filled = 0
+        self.fastest: Optional[Tuple[int, str]] = None  # (seconds to sell out, event or date ID)
+
+    def sold_out(self, seconds: int, event_id: str):
+        """Record that an event (or a date of a series) filled up, keeping the fastest"""
+        if self.fastest is None or (seconds, event_id) < self.fastest:
+            self.fastest = (seconds, event_id)
+
+    @property
+    def fill_rate(self) -> float:
+        """Share of the seats offered that are filled"""
+        return self.filled / self.seats if self.seats else 0.0
+
+    def to_dict(self) -> Dict:
+        """The figures, as shown on the dashboard"""
+        return {"total_events": self.events, "total_seats": self.seats, "seats_filled": self.filled,
+                "fill_rate": self.fill_rate,
+                "fastest_filling": None if self.fastest is None else
+                {"event_id": self.fastest[1], "seconds_to_sell_out": self.fastest[0]}}
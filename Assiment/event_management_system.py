@@ -1,9 +1,51 @@
 import json
 import csv
-from datetime import datetime, date
-from typing import List, Dict, Optional
+import functools
+import heapq
+import time as time_module
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, date, timedelta, timezone
+from itertools import islice, repeat, starmap
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import os
+from contextlib import contextmanager
 from enum import Enum
+from search_index import CompletionIndex, TrigramIndex
+from query_cache import QueryCache
+from change_feed import ChangeFeed
+import recurrence
+from rosters import RosterList, RosterStore, can_store
+from recommendations import CoAttendanceMatrix, recommendation_key
+import schedule
+from archive import EventArchive
+from timeline import RESOLUTIONS, RegistrationTimeline
+from notifications import Outbox
+import projections
+from dashboards import OrganizerDashboard
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; the store is then single-process only
+    fcntl = None
+
+# Pagination limits for the *_page listing APIs
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Event page cursors encode a sort key: (date, time, created_at, event_id)
+EVENT_SORT_KEY_LENGTH = 4
+
+# How long a reserved seat is kept before it is reclaimed
+HOLD_TTL_SECONDS = 300
+
+# Attendee lists at least this long are saved as memory-mapped binary rosters
+ROSTER_THRESHOLD = 1000
+
+# Length of events created without one, used for schedule clashes
+DEFAULT_DURATION_MINUTES = 60
+
+# Events that ended longer ago than this are moved to the archive by default
+ARCHIVE_AFTER_DAYS = 180
 
 class UserRole(Enum):
     """Enum for user roles"""
@@ -12,6 +54,9 @@ class UserRole(Enum):
     STUDENT = "student"
     VISITOR = "visitor"
 
+# Role lookup by stored value, cheaper than UserRole(value) for every record
+_ROLE_BY_VALUE = {role.value: role for role in UserRole}
+
 class User:
     """User class to represent different types of users"""
     
@@ -22,6 +67,7 @@ class User:
         self.email = email
         self.created_events = []  # For event organizers
         self.registered_events = []  # For students/visitors
+        self.version = 0  # Change version of the last mutation touching this user
     
     def to_dict(self) -> Dict:
         """Convert user to dictionary for JSON serialization"""
@@ -31,90 +77,274 @@ class User:
             "role": self.role.value,
             "email": self.email,
             "created_events": self.created_events,
-            "registered_events": self.registered_events
+            "registered_events": self.registered_events,
+            "version": self.version
         }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'User':
         """Create user from dictionary"""
-        user = cls(
-            user_id=data["user_id"],
-            username=data["username"],
-            role=UserRole(data["role"]),
-            email=data.get("email", "")
-        )
-        user.created_events = data.get("created_events", [])
-        user.registered_events = data.get("registered_events", [])
-        return user
+        return next(iter(cls.bulk_from_dicts({data["user_id"]: data}).values()))
+    
+    @classmethod
+    def bulk_from_dicts(cls, records: Dict[str, Dict]) -> Dict[str, 'User']:
+        """Create many users from a {key: user dict} mapping with minimal per-record work"""
+        users = dict.fromkeys(records)  # Pre-sized with the final keys
+        new = object.__new__
+        roles = _ROLE_BY_VALUE
+        for key, data in records.items():
+            # Bypass __init__ and keyword passing; set attributes directly
+            user = new(cls)
+            user.user_id = data["user_id"]
+            user.username = data["username"]
+            user.role = roles[data["role"]]
+            user.email = data.get("email", "")
+            user.created_events = data.get("created_events", [])
+            user.registered_events = data.get("registered_events", [])
+            user.version = data.get("version", 0)
+            users[key] = user
+        return users
 
 class Event:
     """Event class to represent campus events"""
     
     def __init__(self, event_id: str, name: str, description: str, date: str, 
-                 time: str, location: str, max_capacity: int, organizer_id: str):
+                 time: str, location: str, max_capacity: int, organizer_id: str,
+                 recurrence_rule: Optional[Dict] = None,
+                 duration_minutes: int = DEFAULT_DURATION_MINUTES):
         self.event_id = event_id
         self.name = name
         self.description = description
         self.date = date
         self.time = time
+        self.duration_minutes = duration_minutes
         self.location = location
         self.max_capacity = max_capacity
         self.organizer_id = organizer_id
         self.attendees = []
         self.created_at = datetime.now().isoformat()
+        self.version = 0  # Change version of the last mutation touching this event
+        self.held_seats = 0  # Seats reserved by unexpired holds (not serialized)
+        # Recurring series: the rule, and attendees of only those dates that have any
+        self.recurrence = recurrence_rule
+        self.occurrence_attendees: Dict[str, List[str]] = {}
+        self.occurrence_held_seats: Dict[str, int] = {}  # Per-date holds (not serialized)
+        # When registrations happened, for the event and for each date of a series
+        self.registration_timeline: Optional[RegistrationTimeline] = None
+        self.occurrence_timelines: Dict[str, RegistrationTimeline] = {}
     
-    def to_dict(self) -> Dict:
+    def to_dict(self, with_attendees: bool = True) -> Dict:
         """Convert event to dictionary for JSON serialization"""
+        attendees = self.attendees
+        if not with_attendees:
+            attendees = []
+        elif not isinstance(attendees, list):
+            attendees = list(attendees)  # Binary roster
         return {
             "event_id": self.event_id,
             "name": self.name,
             "description": self.description,
             "date": self.date,
             "time": self.time,
+            "duration_minutes": self.duration_minutes,
             "location": self.location,
             "max_capacity": self.max_capacity,
             "organizer_id": self.organizer_id,
-            "attendees": self.attendees,
-            "created_at": self.created_at
+            "attendees": attendees,
+            "created_at": self.created_at,
+            "version": self.version,
+            "recurrence": self.recurrence,
+            "occurrence_attendees": self.occurrence_attendees,
+            "registrations": self.registration_timeline.to_dict() if self.registration_timeline else None,
+            "occurrence_registrations": {day: timeline.to_dict()
+                                         for day, timeline in self.occurrence_timelines.items()}
         }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Event':
         """Create event from dictionary"""
-        event = cls(
-            event_id=data["event_id"],
-            name=data["name"],
-            description=data["description"],
-            date=data["date"],
-            time=data["time"],
-            location=data["location"],
-            max_capacity=data["max_capacity"],
-            organizer_id=data["organizer_id"]
-        )
-        event.attendees = data.get("attendees", [])
-        event.created_at = data.get("created_at", datetime.now().isoformat())
-        return event
+        return next(iter(cls.bulk_from_dicts({data["event_id"]: data}).values()))
+    
+    @classmethod
+    def bulk_from_dicts(cls, records: Dict[str, Dict]) -> Dict[str, 'Event']:
+        """Create many events from a {key: event dict} mapping with minimal per-record work"""
+        events = dict.fromkeys(records)  # Pre-sized with the final keys
+        new = object.__new__
+        now = None
+        for key, data in records.items():
+            # Bypass __init__ so no timestamp is generated just to be overwritten
+            event = new(cls)
+            event.event_id = data["event_id"]
+            event.name = data["name"]
+            event.description = data["description"]
+            event.date = data["date"]
+            event.time = data["time"]
+            event.duration_minutes = data.get("duration_minutes", DEFAULT_DURATION_MINUTES)
+            event.location = data["location"]
+            event.max_capacity = data["max_capacity"]
+            event.organizer_id = data["organizer_id"]
+            event.attendees = data.get("attendees", [])
+            created_at = data.get("created_at")
+            if created_at is None:
+                if now is None:
+                    now = datetime.now().isoformat()
+                created_at = now
+            event.created_at = created_at
+            event.version = data.get("version", 0)
+            event.held_seats = 0
+            event.recurrence = data.get("recurrence")
+            event.occurrence_attendees = data.get("occurrence_attendees", {})
+            event.occurrence_held_seats = {}
+            registrations = data.get("registrations")
+            event.registration_timeline = RegistrationTimeline.from_dict(registrations) if registrations else None
+            event.occurrence_timelines = {day: RegistrationTimeline.from_dict(timeline) for day, timeline
+                                          in data.get("occurrence_registrations", {}).items()}
+            events[key] = event
+        return events
+    
+    def get_attendance_count(self) -> int:
+        """Get current number of attendees (across all dates for a series)"""
+        return len(self.attendees) + sum(len(attendees) for attendees in self.occurrence_attendees.values())
+    
+    def is_full(self) -> bool:
+        """Check if event is at full capacity (held seats count as taken)"""
+        return len(self.attendees) + self.held_seats >= self.max_capacity
+    
+    def can_register(self, user_id: str) -> bool:
+        """Check if user can register for this event"""
+        return not self.is_full() and user_id not in self.attendees
+
+class EventOccurrence:
+    """One date of a recurring series, created on demand; everything except
+    the date, attendees and held seats is read from the series"""
+    
+    __slots__ = ("series", "date")
+    
+    recurrence = None  # An occurrence does not repeat itself
+    
+    def __init__(self, series: Event, date: str):
+        self.series = series
+        self.date = date
+    
+    def __getattr__(self, name):
+        return getattr(self.series, name)
+    
+    @property
+    def event_id(self) -> str:
+        return recurrence.occurrence_id(self.series.event_id, self.date)
+    
+    @property
+    def attendees(self) -> List[str]:
+        # Dates nobody registered for have no stored list
+        return self.series.occurrence_attendees.get(self.date, [])
+    
+    @property
+    def held_seats(self) -> int:
+        return self.series.occurrence_held_seats.get(self.date, 0)
+    
+    @held_seats.setter
+    def held_seats(self, value: int):
+        if value:
+            self.series.occurrence_held_seats[self.date] = value
+        else:
+            self.series.occurrence_held_seats.pop(self.date, None)
+    
+    @property
+    def registration_timeline(self) -> Optional[RegistrationTimeline]:
+        return self.series.occurrence_timelines.get(self.date)
+    
+    def to_dict(self) -> Dict:
+        """Convert occurrence to dictionary, shaped like an event"""
+        data = self.series.to_dict()
+        del data["recurrence"], data["occurrence_attendees"], data["occurrence_registrations"]
+        timeline = self.registration_timeline
+        data.update(event_id=self.event_id, date=self.date, attendees=self.attendees,
+                    registrations=timeline.to_dict() if timeline else None,
+                    series_id=self.series.event_id)
+        return data
     
     def get_attendance_count(self) -> int:
         """Get current number of attendees"""
         return len(self.attendees)
     
     def is_full(self) -> bool:
-        """Check if event is at full capacity"""
-        return len(self.attendees) >= self.max_capacity
+        """Check if occurrence is at full capacity (held seats count as taken)"""
+        return len(self.attendees) + self.held_seats >= self.max_capacity
     
     def can_register(self, user_id: str) -> bool:
-        """Check if user can register for this event"""
+        """Check if user can register for this occurrence"""
         return not self.is_full() and user_id not in self.attendees
 
+def _transactional(method):
+    """Run a mutating method as one transaction on the shared data directory"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._transaction():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class EventManagementSystem:
     """Main system class for managing events and users"""
     
-    def __init__(self):
+    def __init__(self, data_dir: str = "data"):
         self.users: Dict[str, User] = {}
         self.events: Dict[str, Event] = {}
         self.current_user: Optional[User] = None
-        self.data_dir = "data"
+        self.data_dir = data_dir
+        # Normalized username/email -> user_id, kept in sync with self.users
+        self._username_index: Dict[str, str] = {}
+        self._email_index: Dict[str, str] = {}
+        # Sorted (date, time, created_at, event_id) keys used for stable event pagination
+        self._event_sort_keys: List[Tuple[str, str, str, str]] = []
+        # Event names and locations ranked by attendance for autocomplete, and a
+        # trigram index over name, description and location for fuzzy search; built on
+        # first use so loading (and one-shot CLI commands) does not pay for them
+        self._name_index = CompletionIndex()
+        self._location_index = CompletionIndex()
+        self._text_index = TrigramIndex()
+        self._search_indexes_built = False
+        # IDs of recurring series, expanded into occurrences for date-range queries
+        self._series_ids = set()
+        # Event x event co-registration counts for recommendations; built on first use
+        self._co_attendance: Optional[CoAttendanceMatrix] = None
+        # user_id -> sorted (start, end, event_id) of their registrations, built per user
+        # on their first registration and used to reject clashing ones
+        self._schedules: Dict[str, schedule.Schedule] = {}
+        # organizer_id -> running totals of their events, built on their first dashboard
+        # view and kept current by the mutations
+        self._dashboards: Dict[str, OrganizerDashboard] = {}
+        # Attendance report columns (analytics.AttendanceColumns), built on the first
+        # report and kept current by the mutations
+        self._attendance_columns = None
+        # Query results are cached per data generation; every mutation bumps it
+        self._generation = 0
+        self._query_cache = QueryCache()
+        # Change tracking: high-water mark of record versions and deleted records
+        self._version = 0
+        self._tombstones: Dict[str, Dict] = {}
+        # Change-data-capture feed of every mutation, for downstream consumers
+        self.change_feed = ChangeFeed(os.path.join(data_dir, "changelog"))
+        # Large attendee lists live in memory-mapped sidecar files
+        self.roster_threshold = ROSTER_THRESHOLD
+        self._rosters = RosterStore(os.path.join(data_dir, "rosters"))
+        # Past events moved out of the active data, read only when asked for
+        self._archive = EventArchive(os.path.join(data_dir, "archive"))
+        # Number of the next event ID; never reused, even after deletes and archiving
+        self._next_event_number = 1
+        # Cross-process concurrency: store version seen on disk and open transaction state
+        self._disk_version: Optional[int] = None
+        self._transaction_depth = 0
+        self._pending_changes: List[Tuple[str, int, Dict]] = []
+        # Attendee notification jobs, saved to the outbox with the mutation that queued them
+        self.outbox = Outbox(os.path.join(data_dir, "outbox"))
+        self._pending_notifications: List[Dict] = []
+        # Seat holds: token -> hold, (user_id, event_id) -> token, and an expiry min-heap
+        self.clock = time_module.time
+        self._holds: Dict[str, Dict] = {}
+        self._hold_tokens: Dict[Tuple[str, str], str] = {}
+        self._hold_expiry_heap: List[Tuple[float, str]] = []
+        # Records calls to a trace file while tracing is on
+        self._trace_recorder = None
         self._ensure_data_directory()
         self._load_data()
     
@@ -123,44 +353,432 @@ class EventManagementSystem:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
-    def _load_data(self):
+    @contextmanager
+    def _store_lock(self, exclusive: bool):
+        """Hold the data directory's advisory file lock (shared or exclusive).
+        The lock file also records the store version of the last commit."""
+        with open(os.path.join(self.data_dir, ".lock"), 'a+', encoding='utf-8') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield lock_file
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _read_store_version(lock_file) -> int:
+        """Store version recorded in the lock file (0 if none yet)"""
+        lock_file.seek(0)
+        content = lock_file.read().strip()
+        return int(content) if content else 0
+    
+    @staticmethod
+    def _write_store_version(lock_file, version: int):
+        """Record a new store version in the lock file"""
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(version))
+        lock_file.flush()
+    
+    @contextmanager
+    def _transaction(self):
+        """Lock the store, catch up with other processes' commits, and save once at the end.
+        
+        If another process committed since our last load, the data is reloaded
+        before the mutation runs, so the mutation is applied on top of the
+        latest state instead of overwriting it.
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            return
+        
+        with self._store_lock(exclusive=True) as lock_file:
+            store_version = self._read_store_version(lock_file)
+            if store_version != self._disk_version:
+                self._load_data(lock_file)
+            
+            self._transaction_depth = 1
+            try:
+                yield
+                if self._pending_changes:
+                    self._save_data()
+            except BaseException:
+                # In-memory state may be half-mutated or unsaved; reload on the next transaction
+                self._pending_changes = []
+                self._pending_notifications = []
+                self._disk_version = None
+                raise
+            finally:
+                self._transaction_depth = 0
+            
+            if self._pending_changes:
+                self._write_store_version(lock_file, self._version)
+                self._disk_version = self._version
+                self._publish_pending_changes()
+    
+    def transaction(self):
+        """Group several mutations into one locked transaction with a single save.
+        
+        Usage:
+            with system.transaction():
+                system.login(user_id)
+                system.register_for_event(event_id)
+                ...
+        """
+        return self._transaction()
+    
+    def refresh(self) -> bool:
+        """Reload the data if another process has committed changes; returns True if reloaded"""
+        with self._store_lock(exclusive=False) as lock_file:
+            if self._read_store_version(lock_file) == self._disk_version:
+                return False
+            self._load_data(lock_file)
+            return True
+    
+    def _load_data(self, lock_file=None):
         """Load users and events from JSON files"""
+        if lock_file is None:
+            with self._store_lock(exclusive=False) as shared_lock:
+                self._load_data(shared_lock)
+            return
+        
+        current_user_id = self.current_user.user_id if self.current_user else None
+        self.users = {}
+        self.events = {}
+        self._version = 0
+        self._tombstones = {}
+        self._next_event_number = 1
+        holds = []
+        self._disk_version = self._read_store_version(lock_file)
+        
         try:
             if os.path.exists(f"{self.data_dir}/users.json"):
                 with open(f"{self.data_dir}/users.json", 'r', encoding='utf-8') as f:
-                    users_data = json.load(f)
-                    self.users = {user_id: User.from_dict(user_data) 
-                                for user_id, user_data in users_data.items()}
+                    self.users = User.bulk_from_dicts(json.load(f))
             
             if os.path.exists(f"{self.data_dir}/events.json"):
                 with open(f"{self.data_dir}/events.json", 'r', encoding='utf-8') as f:
                     events_data = json.load(f)
-                    self.events = {event_id: Event.from_dict(event_data) 
-                                 for event_id, event_data in events_data.items()}
+                self.events = Event.bulk_from_dicts(events_data)
+                for event_id, data in events_data.items():
+                    if data.get("roster"):
+                        self.events[event_id].attendees = self._rosters.open(event_id)
+            
+            if os.path.exists(f"{self.data_dir}/meta.json"):
+                with open(f"{self.data_dir}/meta.json", 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                    self._version = meta.get("version", 0)
+                    self._next_event_number = meta.get("next_event_number", 1)
+                    self._tombstones = {f"{t['type']}:{t['id']}": t for t in meta.get("tombstones", [])}
+            
+            if os.path.exists(f"{self.data_dir}/holds.json"):
+                with open(f"{self.data_dir}/holds.json", 'r', encoding='utf-8') as f:
+                    holds = json.load(f)
         except Exception as e:
             print(f"Error loading data: {e}")
+        
+        # Never hand out a version lower than one already stored
+        self._version = max([self._version]
+                            + [user.version for user in self.users.values()]
+                            + [event.version for event in self.events.values()]
+                            + [tombstone["version"] for tombstone in self._tombstones.values()])
+        # Data saved before the counter existed: continue after the highest event ID
+        for event_id in self.events:
+            number = event_id[len("event_"):]
+            if event_id.startswith("event_") and number.isdigit():
+                self._next_event_number = max(self._next_event_number, int(number) + 1)
+        
+        self._rebuild_user_indexes()
+        self._rebuild_event_indexes()
+        self._co_attendance = None
+        self._schedules = {}
+        self._dashboards = {}
+        self._attendance_columns = None
+        self._archive.reset()
+        self._rebuild_holds(holds)
+        self._bump_generation()
+        
+        # Keep the session pointing at the freshly loaded user object
+        self.current_user = self.users.get(current_user_id) if current_user_id else None
+    
+    @staticmethod
+    def _normalize_username(username: str) -> str:
+        """Normalize a username for case-insensitive lookups"""
+        return username.strip().casefold()
+    
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        """Normalize an email address for case-insensitive lookups"""
+        return email.strip().lower()
+    
+    def _rebuild_user_indexes(self):
+        """Rebuild the username and email indexes from self.users"""
+        self._username_index = {}
+        self._email_index = {}
+        for user in self.users.values():
+            # Keep the first user for any duplicates already present on disk
+            self._username_index.setdefault(self._normalize_username(user.username), user.user_id)
+            if user.email:
+                self._email_index.setdefault(self._normalize_email(user.email), user.user_id)
+    
+    @staticmethod
+    def _event_sort_key(event: Event) -> Tuple[str, str, str, str]:
+        """Stable sort key for event listings: date, time, creation order, then event ID"""
+        return (event.date, event.time, event.created_at, event.event_id)
+    
+    def _rebuild_event_indexes(self):
+        """Rebuild the event indexes from self.events (search indexes lazily)"""
+        self._event_sort_keys = sorted(self._event_sort_key(event) for event in self.events.values())
+        self._series_ids = {event.event_id for event in self.events.values() if event.recurrence}
+        self._name_index = CompletionIndex()
+        self._location_index = CompletionIndex()
+        self._text_index = TrigramIndex()
+        self._search_indexes_built = False
+    
+    def _ensure_search_indexes(self):
+        """Build the autocomplete and fuzzy search indexes if not built yet"""
+        if self._search_indexes_built:
+            return
+        for event in self.events.values():
+            self._add_completions(event)
+            self._text_index.add(event.event_id, self._event_text(event))
+        self._search_indexes_built = True
+    
+    def _add_completions(self, event: Event):
+        """Offer an event's name and location as completions, weighted by its attendance"""
+        attendance = event.get_attendance_count()
+        self._name_index.add(event.name, attendance)
+        self._location_index.add(event.location, attendance)
+    
+    def _change_completions(self, event: Event, delta: int):
+        """Follow a change in an event's attendance in the autocomplete ranking"""
+        if self._search_indexes_built:
+            self._name_index.change(event.name, delta)
+            self._location_index.change(event.location, delta)
+    
+    @staticmethod
+    def _event_text(event: Event) -> str:
+        """Searchable text of an event"""
+        return f"{event.name} {event.description} {event.location}"
+    
+    def _index_event(self, event: Event):
+        """Add an event to the event indexes"""
+        insort(self._event_sort_keys, self._event_sort_key(event))
+        if self._search_indexes_built:
+            self._add_completions(event)
+            self._text_index.add(event.event_id, self._event_text(event))
+        if event.recurrence:
+            self._series_ids.add(event.event_id)
+        if self._attendance_columns is not None:
+            self._attendance_columns.add_event(event)
+    
+    def _unindex_event(self, event: Event):
+        """Remove an event from the event indexes"""
+        key = self._event_sort_key(event)
+        position = bisect_left(self._event_sort_keys, key)
+        if position < len(self._event_sort_keys) and self._event_sort_keys[position] == key:
+            del self._event_sort_keys[position]
+        if self._search_indexes_built:
+            attendance = event.get_attendance_count()
+            self._name_index.remove(event.name, attendance)
+            self._location_index.remove(event.location, attendance)
+            self._text_index.remove(event.event_id, self._event_text(event))
+        self._series_ids.discard(event.event_id)
+        if self._attendance_columns is not None:
+            self._attendance_columns.remove_event(event)
+    
+    def _stamp(self, *records, deleted=()):
+        """Give the users/events touched by one mutation the next change version"""
+        self._version += 1
+        for record in records:
+            record.version = self._version
+            # A record that exists again is no longer deleted
+            self._tombstones.pop(f"{self._record_type(record)}:{self._record_id(record)}", None)
+        
+        # Remember deleted records so delta exports can report them
+        for record in deleted:
+            record_type = self._record_type(record)
+            record_id = self._record_id(record)
+            self._tombstones[f"{record_type}:{record_id}"] = {
+                "type": record_type, "id": record_id, "version": self._version}
+    
+    @staticmethod
+    def _record_type(record) -> str:
+        """Change-tracking type name of a user or event"""
+        return "event" if isinstance(record, Event) else "user"
+    
+    @staticmethod
+    def _record_id(record) -> str:
+        """ID of a user or event"""
+        return record.event_id if isinstance(record, Event) else record.user_id
+    
+    def _commit(self, change_type: str, change_data: Dict, *records, deleted=()):
+        """Finish a mutation: stamp versions and invalidate caches. The enclosing
+        transaction saves the data and then publishes the change."""
+        self._stamp(*records, deleted=deleted)
+        self._bump_generation()
+        self._pending_changes.append((change_type, self._version, change_data))
+        if not self._transaction_depth:
+            try:
+                self._save_data()
+            except Exception as e:
+                self._pending_changes = []
+                print(f"Error saving data: {e}")
+                return
+            self._publish_pending_changes()
+    
+    def _notify_attendees(self, kind: str, event: Union[Event, EventOccurrence], attendees):
+        """Queue a notification job for attendees; it is saved with the current transaction"""
+        recipients = list(dict.fromkeys(attendees))
+        if not recipients:
+            return
+        self._pending_notifications.append({
+            "kind": kind,
+            "event_id": event.event_id,
+            "event": {"name": event.name, "date": event.date, "time": event.time, "location": event.location},
+            "recipients": recipients,
+            "queued_at": self.clock()
+        })
+    
+    def _publish_pending_changes(self):
+        """Append saved changes to the change feed"""
+        for change_type, version, change_data in self._pending_changes:
+            self.change_feed.append(change_type, version, change_data)
+        self._pending_changes = []
+    
+    def _bump_generation(self):
+        """Invalidate cached query results after a mutation"""
+        self._generation += 1
+    
+    def invalidate_cache(self):
+        """Invalidate cached query results after changing users or events directly"""
+        self._bump_generation()
+    
+    def _cached(self, key: Tuple, compute):
+        """Return the cached result for key, computing it on a miss"""
+        found, result = self._query_cache.get(key, self._generation)
+        if not found:
+            result = compute()
+            self._query_cache.put(key, self._generation, result)
+        
+        # Hand out copies so callers cannot modify the cached containers
+        if isinstance(result, list):
+            return list(result)
+        if isinstance(result, dict):
+            return {k: list(v) if isinstance(v, list) else v for k, v in result.items()}
+        return result
+    
+    def cache_stats(self) -> Dict:
+        """Query cache hit/miss counters"""
+        stats = self._query_cache.stats()
+        stats["generation"] = self._generation
+        return stats
+    
+    def _write_json(self, filename: str, data) -> str:
+        """Write a JSON file next to its final path; returns the temporary path to move into place"""
+        temp_path = f"{self.data_dir}/{filename}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return temp_path
     
     def _save_data(self):
-        """Save users and events to JSON files"""
+        """Save users and events to JSON files; raises if any file cannot be written"""
+        # Notification jobs are staged before the data files and published once
+        # those are saved, so no job is delivered for a change that was not saved
+        job_ids = [f"{self._version:012d}-{number:04d}" for number in range(len(self._pending_notifications))]
+        notifications, self._pending_notifications = self._pending_notifications, []
+        written = []
         try:
-            users_data = {user_id: user.to_dict() for user_id, user in self.users.items()}
-            with open(f"{self.data_dir}/users.json", 'w', encoding='utf-8') as f:
-                json.dump(users_data, f, indent=2, ensure_ascii=False)
+            for job_id, job in zip(job_ids, notifications):
+                job["id"] = job_id
+                self.outbox.stage(job)
+            # Every file is written before any replaces its old copy, so a failed
+            # write leaves the previous users, events and meta files together
+            for filename, data in (
+                    ("users.json", {user_id: user.to_dict() for user_id, user in self.users.items()}),
+                    ("events.json", self._event_records()),
+                    ("meta.json", {"version": self._version,
+                                   "next_event_number": self._next_event_number,
+                                   "tombstones": list(self._tombstones.values())}),
+                    ("holds.json", list(self._holds.values()))):
+                written.append((self._write_json(filename, data), f"{self.data_dir}/{filename}"))
+        except Exception:
+            for temp_path, _ in written:
+                os.remove(temp_path)
+            for job_id in job_ids:
+                self.outbox.discard(job_id)
+            raise
+        
+        for temp_path, filepath in written:
+            os.replace(temp_path, filepath)
+        for job_id in job_ids:
+            self.outbox.publish(job_id)
+    
+    def _event_records(self) -> Dict[str, Dict]:
+        """Event dicts for events.json; large attendee lists are written to roster files instead"""
+        records = {}
+        roster_ids = set()
+        for event_id, event in self.events.items():
+            attendees = event.attendees
+            if isinstance(attendees, list) and not (
+                    len(attendees) >= self.roster_threshold and can_store(attendees)):
+                records[event_id] = event.to_dict()
+                continue
             
-            events_data = {event_id: event.to_dict() for event_id, event in self.events.items()}
-            with open(f"{self.data_dir}/events.json", 'w', encoding='utf-8') as f:
-                json.dump(events_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving data: {e}")
+            if not isinstance(attendees, RosterList) or attendees.dirty:
+                event.attendees = self._rosters.write(event_id, attendees)
+            record = event.to_dict(with_attendees=False)
+            record["roster"] = self._rosters.file_name(event_id)
+            records[event_id] = record
+            roster_ids.add(event_id)
+        
+        self._rosters.remove_unreferenced(roster_ids)
+        return records
     
-    def register_user(self, username: str, role: UserRole, email: str = "") -> str:
-        """Register a new user"""
+    @_transactional
+    def register_user(self, username: str, role: UserRole, email: str = "") -> Optional[str]:
+        """Register a new user (usernames and emails must be unique)"""
+        username_key = self._normalize_username(username)
+        email_key = self._normalize_email(email)
+        
+        if not username_key:
+            print("❌ Username is required.")
+            return None
+        
+        if username_key in self._username_index:
+            print(f"❌ Username '{username}' is already taken.")
+            return None
+        
+        if email_key and email_key in self._email_index:
+            print(f"❌ Email '{email}' is already registered.")
+            return None
+        
         user_id = f"user_{len(self.users) + 1}"
         user = User(user_id, username, role, email)
         self.users[user_id] = user
-        self._save_data()
+        self._username_index[username_key] = user_id
+        if email_key:
+            self._email_index[email_key] = user_id
+        self._commit("user.registered",
+                     {"user_id": user_id, "username": username, "role": role.value}, user)
         return user_id
     
+    def find_user(self, identifier: str) -> Optional[User]:
+        """Find a user by user ID, username or email"""
+        if identifier in self.users:
+            return self.users[identifier]
+        
+        user_id = self._username_index.get(self._normalize_username(identifier))
+        if user_id is None:
+            user_id = self._email_index.get(self._normalize_email(identifier))
+        
+        return self.users.get(user_id) if user_id is not None else None
+    
     def login(self, user_id: str) -> bool:
         """Login a user"""
         if user_id in self.users:
@@ -168,13 +786,23 @@ class EventManagementSystem:
             return True
         return False
     
+    def login_by_username(self, username: str) -> bool:
+        """Login a user by username (case-insensitive)"""
+        user_id = self._username_index.get(self._normalize_username(username))
+        if user_id is None:
+            return False
+        return self.login(user_id)
+    
     def logout(self):
         """Logout current user"""
         self.current_user = None
     
+    @_transactional
     def create_event(self, name: str, description: str, date: str, time: str, 
-                    location: str, max_capacity: int) -> Optional[str]:
-        """Create a new event (Admin and Event Organizer only)"""
+                    location: str, max_capacity: int,
+                    recurrence_rule: Optional[Dict] = None,
+                    duration_minutes: int = DEFAULT_DURATION_MINUTES) -> Optional[str]:
+        """Create a new event, or a recurring series starting on date (Admin and Event Organizer only)"""
         if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
             print("❌ Access denied. Only Admins and Event Organizers can create events.")
             return None
@@ -188,6 +816,10 @@ class EventManagementSystem:
             print("❌ Maximum capacity must be greater than 0.")
             return None
         
+        if duration_minutes <= 0:
+            print("❌ Duration must be greater than 0 minutes.")
+            return None
+        
         try:
             # Validate date format
             datetime.strptime(date, "%Y-%m-%d")
@@ -195,17 +827,31 @@ class EventManagementSystem:
             print("❌ Invalid date format. Use YYYY-MM-DD.")
             return None
         
-        event_id = f"event_{len(self.events) + 1}"
+        if recurrence_rule is not None:
+            try:
+                recurrence_rule = recurrence.normalize_rule(recurrence_rule, date)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return None
+        
+        event_id = f"event_{self._next_event_number}"
+        self._next_event_number += 1
         event = Event(event_id, name, description, date, time, location, 
-                     max_capacity, self.current_user.user_id)
+                     max_capacity, self.current_user.user_id, recurrence_rule, duration_minutes)
         
         self.events[event_id] = event
+        self._index_event(event)
         self.current_user.created_events.append(event_id)
-        self._save_data()
+        dashboard = self._dashboards.get(event.organizer_id)
+        if dashboard is not None:
+            dashboard.events += 1
+            dashboard.seats += self._offered_seats(event)
+        self._commit("event.created", event.to_dict(), event, self.current_user)
         
         print(f"✅ Event '{name}' created successfully!")
         return event_id
     
+    @_transactional
     def update_event(self, event_id: str, **kwargs) -> bool:
         """Update an existing event"""
         if not self.current_user or self.current_user.role != UserRole.ADMIN:
@@ -219,15 +865,46 @@ class EventManagementSystem:
         event = self.events[event_id]
         
         # Update allowed fields
-        allowed_fields = ['name', 'description', 'date', 'time', 'location', 'max_capacity']
-        for field, value in kwargs.items():
-            if field in allowed_fields and value is not None:
-                setattr(event, field, value)
-        
-        self._save_data()
+        allowed_fields = ['name', 'description', 'date', 'time', 'duration_minutes', 'location', 'max_capacity']
+        changes = {field: value for field, value in kwargs.items()
+                   if field in allowed_fields and value is not None}
+        if 'duration_minutes' in changes and changes['duration_minutes'] <= 0:
+            print("❌ Duration must be greater than 0 minutes.")
+            return False
+        if event.recurrence and 'date' in changes:
+            try:
+                recurrence.normalize_rule(event.recurrence, changes['date'])
+            except ValueError as e:
+                print(f"❌ {e}")
+                return False
+        
+        offered_seats = self._offered_seats(event)
+        self._unindex_event(event)
+        for field, value in changes.items():
+            setattr(event, field, value)
+        self._index_event(event)
+        
+        # Moving a series can leave dates people registered for (or hold seats
+        # on) off the new schedule; those dates are cancelled
+        changed_users = []
+        if event.recurrence and 'date' in changes:
+            in_use = (set(event.occurrence_attendees) | set(event.occurrence_held_seats)
+                      | set(event.occurrence_timelines))
+            for day in sorted(in_use):
+                if not recurrence.is_occurrence(event.date, event.recurrence, day):
+                    changed_users += self._cancel_date(EventOccurrence(event, day))
+        if event.organizer_id in self._dashboards:
+            self._dashboards[event.organizer_id].seats += self._offered_seats(event) - offered_seats
+        if changes.keys() & {'date', 'time', 'duration_minutes'}:
+            self._schedules = {}  # Attendees' schedules hold the old times
+        if changes.keys() & {'date', 'time', 'location'}:
+            self._notify_attendees("event.updated", event, self._all_attendees(event))
+        
+        self._commit("event.updated", {"event_id": event_id, "changes": changes}, event, *changed_users)
         print(f"✅ Event '{event.name}' updated successfully!")
         return True
     
+    @_transactional
     def delete_event(self, event_id: str) -> bool:
         """Delete an event (Admin only)"""
         if not self.current_user or self.current_user.role != UserRole.ADMIN:
@@ -238,80 +915,611 @@ class EventManagementSystem:
             print("❌ Event not found.")
             return False
         
-        event_name = self.events[event_id].name
+        event = self.events[event_id]
+        event_name = event.name
+        self._notify_attendees("event.deleted", event, self._all_attendees(event))
+        occurrence_prefix = recurrence.occurrence_id(event_id, "")
+        for token in [token for token, hold in self._holds.items()
+                      if hold["event_id"] == event_id or hold["event_id"].startswith(occurrence_prefix)]:
+            self._drop_hold(token)
+        self._unindex_event(event)
         del self.events[event_id]
+        if self._co_attendance is not None:
+            self._co_attendance.remove_event(event_id)
+        self._dashboards.pop(event.organizer_id, None)  # Rebuilt on the next view
         
         # Remove from users' lists
+        changed_users = []
         for user in self.users.values():
             if event_id in user.created_events:
                 user.created_events.remove(event_id)
+                changed_users.append(user)
             if event_id in user.registered_events:
                 user.registered_events.remove(event_id)
-        
-        self._save_data()
+                changed_users.append(user)
+            if event.occurrence_attendees and any(
+                    registered.startswith(occurrence_prefix) for registered in user.registered_events):
+                user.registered_events = [registered for registered in user.registered_events
+                                          if not registered.startswith(occurrence_prefix)]
+                changed_users.append(user)
+        for user in changed_users:
+            self._schedules.pop(user.user_id, None)
+        
+        self._commit("event.deleted",
+                     {"event_id": event_id, "name": event_name, "attendees": list(event.attendees)},
+                     *changed_users, deleted=[event])
         print(f"✅ Event '{event_name}' deleted successfully!")
         return True
     
+    @staticmethod
+    def _all_attendees(event: Event) -> List[str]:
+        """Attendees of an event, or of every date of a series"""
+        attendees = list(event.attendees)
+        for occurrence_attendees in event.occurrence_attendees.values():
+            attendees.extend(occurrence_attendees)
+        return attendees
+    
+    @staticmethod
+    def _ended_before(event: Event, cutoff: str) -> bool:
+        """Whether an event (or every date of a series) is before cutoff"""
+        if not event.recurrence:
+            return event.date < cutoff
+        return next(recurrence.occurrence_dates(event.date, event.recurrence, cutoff), None) is None
+    
+    @_transactional
+    def archive_events(self, older_than_days: int = ARCHIVE_AFTER_DAYS) -> Optional[int]:
+        """Move events that ended more than older_than_days ago, with their registrations,
+        from the active data to the compressed archive (Admin only); returns how many"""
+        if not self.current_user or self.current_user.role != UserRole.ADMIN:
+            print("❌ Access denied. Only Admins can archive events.")
+            return None
+    
+        if older_than_days < 0:
+            print("❌ Days must not be negative.")
+            return None
+    
+        cutoff = (date.fromtimestamp(self.clock()) - timedelta(days=older_than_days)).isoformat()
+        past = [event for event in self.events.values() if self._ended_before(event, cutoff)]
+        if not past:
+            print("✅ No events to archive.")
+            return 0
+    
+        # Written first: if saving the active data fails, the events are in both places
+        self._archive.add(event.to_dict() for event in past)
+    
+        archived_ids = {event.event_id for event in past}
+    
+        def is_archived(event_id: str) -> bool:
+            # Dates of a series go with the series
+            return event_id.partition(recurrence.OCCURRENCE_SEPARATOR)[0] in archived_ids
+    
+        for token in [token for token, hold in self._holds.items() if is_archived(hold["event_id"])]:
+            self._drop_hold(token)
+        for event in past:
+            self._unindex_event(event)
+            del self.events[event.event_id]
+            if self._co_attendance is not None:
+                self._co_attendance.remove_event(event.event_id)
+            self._dashboards.pop(event.organizer_id, None)
+    
+        # Registrations and created events move with the events
+        changed_users = []
+        for user in self.users.values():
+            registered = [event_id for event_id in user.registered_events if not is_archived(event_id)]
+            created = [event_id for event_id in user.created_events if event_id not in archived_ids]
+            if len(registered) != len(user.registered_events) or len(created) != len(user.created_events):
+                user.registered_events = registered
+                user.created_events = created
+                self._schedules.pop(user.user_id, None)
+                changed_users.append(user)
+    
+        self._commit("events.archived", {"event_ids": sorted(archived_ids), "cutoff": cutoff},
+                     *changed_users, deleted=past)
+        print(f"✅ {len(past)} events before {cutoff} archived.")
+        return len(past)
+    
+    def get_archived_event(self, event_id: str) -> Optional[Event]:
+        """Read one archived event, with its attendees, from cold storage"""
+        record = self._archive.get(event_id)
+        if record is None:
+            print("❌ Archived event not found.")
+            return None
+        return Event.from_dict(record)
+    
+    def search_archived_events(self, keyword: str = "", user_id: Optional[str] = None) -> List[Event]:
+        """Scan the archive for events matching a keyword in name, description or
+        location, optionally only those user_id attended (any date) or organized"""
+        keyword = keyword.lower()
+        matching_events = []
+        for record in self._archive:
+            if keyword and not (keyword in record["name"].lower() or
+                                keyword in record["description"].lower() or
+                                keyword in record["location"].lower()):
+                continue
+            if user_id is not None and not (
+                    record["organizer_id"] == user_id or user_id in record["attendees"] or
+                    any(user_id in attendees for attendees in record["occurrence_attendees"].values())):
+                continue
+            matching_events.append(Event.from_dict(record))
+        return matching_events
+    
+    @_transactional
     def register_for_event(self, event_id: str) -> bool:
         """Register current user for an event"""
         if not self.current_user:
             print("❌ Please login first.")
             return False
         
-        if self.current_user.role not in [UserRole.STUDENT, UserRole.VISITOR]:
+        return self._register(self.current_user, event_id)
+    
+    @_transactional
+    def _register_user_for_event(self, user_id: str, event_id: str) -> bool:
+        """Register a user for an event on their behalf, leaving the session as it is.
+        Only for admission control, which serves many users at once; there is no
+        login behind it, so it is not part of the public interface."""
+        user = self.users.get(user_id)
+        if user is None:
+            print("❌ User not found.")
+            return False
+        
+        return self._register(user, event_id)
+    
+    def _register(self, user: User, event_id: str) -> bool:
+        """Register user for an event, with the checks every registration goes through"""
+        if user.role not in [UserRole.STUDENT, UserRole.VISITOR]:
             print("❌ Only students and visitors can register for events.")
             return False
         
-        if event_id not in self.events:
+        event = self.get_event(event_id)
+        if event is None:
             print("❌ Event not found.")
             return False
         
-        event = self.events[event_id]
+        if event.recurrence:
+            self._print_series_hint(event)
+            return False
+        
+        self._reclaim_expired_holds()
         
-        if not event.can_register(self.current_user.user_id):
+        # Registering directly uses up the user's own hold, if any; like
+        # confirming it, the held seat is theirs already
+        own_hold = self._hold_tokens.get((user.user_id, event_id))
+        if own_hold is None and not event.can_register(user.user_id):
             if event.is_full():
                 print("❌ Event is at full capacity.")
             else:
                 print("❌ You are already registered for this event.")
             return False
         
-        event.attendees.append(self.current_user.user_id)
-        self.current_user.registered_events.append(event_id)
-        self._save_data()
+        if not self._check_schedule(event, user):
+            return False
+        
+        if own_hold is not None:
+            self._drop_hold(own_hold)
+        self._add_registration(event, user)
         
         print(f"✅ Successfully registered for '{event.name}'!")
         return True
     
+    def _add_registration(self, event: Union[Event, EventOccurrence], user: User):
+        """Record that user attends event (or one date of a series)"""
+        if isinstance(event, EventOccurrence):
+            event.series.occurrence_attendees.setdefault(event.date, []).append(user.user_id)
+            timeline = event.series.occurrence_timelines.get(event.date)
+            if timeline is None:
+                timeline = event.series.occurrence_timelines[event.date] = RegistrationTimeline()
+            record = event.series
+        else:
+            event.attendees.append(user.user_id)
+            timeline = event.registration_timeline
+            if timeline is None:
+                timeline = event.registration_timeline = RegistrationTimeline()
+            record = event
+        sold_out_at = timeline.sold_out_at
+        timeline.add(int(self.clock()), sold_out=len(event.attendees) >= event.max_capacity)
+        dashboard = self._dashboards.get(record.organizer_id)
+        if dashboard is not None:
+            dashboard.filled += 1
+            if record is not event and len(event.attendees) == 1:
+                dashboard.seats += event.max_capacity  # The first registration for a date offers its seats
+            if timeline.sold_out_at != sold_out_at:
+                dashboard.sold_out(self._seconds_to_sell_out(record, timeline), event.event_id)
+        self._change_completions(record, 1)
+        if self._attendance_columns is not None:
+            self._attendance_columns.register(event, user.user_id)
+        if self._co_attendance is not None:
+            self._co_attendance.add_registration(user.registered_events, event.event_id)
+        user.registered_events.append(event.event_id)
+        if user.user_id in self._schedules:
+            interval = schedule.event_interval(event)
+            if interval is not None:
+                schedule.add_interval(self._schedules[user.user_id], interval)
+        self._commit("registration.created",
+                     {"event_id": event.event_id, "user_id": user.user_id}, record, user)
+    
+    def _build_schedule(self, user: User) -> schedule.Schedule:
+        """Sorted intervals of a user's registrations"""
+        return schedule.build_schedule(
+            event for event in map(self.get_event, user.registered_events) if event is not None)
+    
+    def _user_schedule(self, user: User) -> schedule.Schedule:
+        """Cached schedule of a user, built on their first registration check"""
+        intervals = self._schedules.get(user.user_id)
+        if intervals is None:
+            intervals = self._schedules[user.user_id] = self._build_schedule(user)
+        return intervals
+    
+    def _check_schedule(self, event: Union[Event, EventOccurrence], user: User) -> bool:
+        """Whether event fits the user's schedule; prints the clash if not"""
+        interval = schedule.event_interval(event)
+        if interval is None:
+            return True
+        clash_id = schedule.find_clash(self._user_schedule(user), interval)
+        if clash_id is None:
+            return True
+        clash = self.get_event(clash_id)
+        print(f"❌ This clashes with '{clash.name}' ({clash.date} {clash.time}), "
+              f"which you are registered for.")
+        return False
+    
+    def _print_series_hint(self, series: Event):
+        """Explain that a series is registered for one date at a time"""
+        upcoming = self.upcoming_occurrences(series.event_id, limit=1)
+        example = f", e.g. {upcoming[0].event_id}" if upcoming else ""
+        print(f"❌ '{series.name}' is a recurring series. Register for one of its dates{example}.")
+    
+    def _rebuild_holds(self, holds: List[Dict]):
+        """Rebuild the hold lookups, expiry heap and per-event held seat counts"""
+        self._holds = {}
+        self._hold_tokens = {}
+        self._hold_expiry_heap = []
+        for hold in holds:
+            event = self.get_event(hold["event_id"])
+            if event is None:
+                continue
+            self._holds[hold["token"]] = hold
+            self._hold_tokens[(hold["user_id"], hold["event_id"])] = hold["token"]
+            self._hold_expiry_heap.append((hold["expires_at"], hold["token"]))
+            event.held_seats += 1
+        heapq.heapify(self._hold_expiry_heap)
+    
+    def _drop_hold(self, token: str) -> Dict:
+        """Forget a hold and give its seat back"""
+        hold = self._holds.pop(token)
+        del self._hold_tokens[(hold["user_id"], hold["event_id"])]
+        event = self.get_event(hold["event_id"])
+        if event is not None:
+            event.held_seats -= 1
+        # Its heap entry is skipped lazily when it reaches the top
+        return hold
+    
+    def _reclaim_expired_holds(self) -> int:
+        """Release holds whose TTL has passed; only expired heap entries are visited"""
+        now = self.clock()
+        reclaimed = []
+        while self._hold_expiry_heap and self._hold_expiry_heap[0][0] <= now:
+            _, token = heapq.heappop(self._hold_expiry_heap)
+            hold = self._holds.get(token)
+            if hold is not None and hold["expires_at"] <= now:
+                self._drop_hold(token)
+                reclaimed.append(token)
+        
+        if reclaimed:
+            self._commit("hold.expired", {"tokens": reclaimed})
+        return len(reclaimed)
+    
+    @_transactional
+    def reclaim_expired_holds(self) -> int:
+        """Release every expired seat hold; returns how many were released"""
+        return self._reclaim_expired_holds()
+    
+    @_transactional
+    def hold_seat(self, event_id: str, ttl_seconds: float = HOLD_TTL_SECONDS) -> Optional[str]:
+        """Reserve a seat for the current user; returns a hold token to confirm later"""
+        if not self.current_user:
+            print("❌ Please login first.")
+            return None
+        
+        if self.current_user.role not in [UserRole.STUDENT, UserRole.VISITOR]:
+            print("❌ Only students and visitors can register for events.")
+            return None
+        
+        event = self.get_event(event_id)
+        if event is None:
+            print("❌ Event not found.")
+            return None
+        
+        if event.recurrence:
+            self._print_series_hint(event)
+            return None
+        
+        self._reclaim_expired_holds()
+        user_id = self.current_user.user_id
+        
+        if (user_id, event_id) in self._hold_tokens:
+            print("❌ You already hold a seat for this event.")
+            return None
+        
+        if not event.can_register(user_id):
+            if event.is_full():
+                print("❌ Event is at full capacity.")
+            else:
+                print("❌ You are already registered for this event.")
+            return None
+        
+        if not self._check_schedule(event, self.current_user):
+            return None
+        
+        import secrets  # Only needed for holds; keeps startup imports small
+        token = secrets.token_urlsafe(16)
+        hold = {"token": token, "event_id": event_id, "user_id": user_id,
+                "expires_at": self.clock() + ttl_seconds}
+        self._holds[token] = hold
+        self._hold_tokens[(user_id, event_id)] = token
+        heapq.heappush(self._hold_expiry_heap, (hold["expires_at"], token))
+        event.held_seats += 1
+        self._commit("hold.created", {"event_id": event_id, "user_id": user_id,
+                                      "expires_at": hold["expires_at"]})
+        
+        print(f"✅ Seat held for '{event.name}' for {ttl_seconds:g} seconds. Confirm to register.")
+        return token
+    
+    @_transactional
+    def confirm_hold(self, token: str) -> bool:
+        """Turn the current user's seat hold into a registration"""
+        if not self.current_user:
+            print("❌ Please login first.")
+            return False
+        
+        self._reclaim_expired_holds()
+        hold = self._holds.get(token)
+        if hold is None or hold["user_id"] != self.current_user.user_id:
+            print("❌ Hold not found or expired.")
+            return False
+        
+        # Something clashing may have been registered for since the seat was held
+        event = self.get_event(hold["event_id"])
+        if not self._check_schedule(event, self.current_user):
+            return False
+        
+        self._drop_hold(token)
+        self._add_registration(event, self.current_user)
+        
+        print(f"✅ Successfully registered for '{event.name}'!")
+        return True
+    
+    @_transactional
+    def release_hold(self, token: str) -> bool:
+        """Give up the current user's seat hold"""
+        hold = self._holds.get(token)
+        if not self.current_user or hold is None or hold["user_id"] != self.current_user.user_id:
+            print("❌ Hold not found or expired.")
+            return False
+        
+        self._drop_hold(token)
+        self._commit("hold.released", {"event_id": hold["event_id"], "user_id": hold["user_id"]})
+        print("✅ Seat hold released.")
+        return True
+    
+    @_transactional
     def unregister_from_event(self, event_id: str) -> bool:
         """Unregister current user from an event"""
         if not self.current_user:
             print("❌ Please login first.")
             return False
         
-        if event_id not in self.events:
+        event = self.get_event(event_id)
+        if event is None:
             print("❌ Event not found.")
             return False
         
-        event = self.events[event_id]
-        
         if self.current_user.user_id not in event.attendees:
             print("❌ You are not registered for this event.")
             return False
         
-        event.attendees.remove(self.current_user.user_id)
-        self.current_user.registered_events.remove(event_id)
-        self._save_data()
+        self._remove_registration(event, self.current_user)
         
         print(f"✅ Successfully unregistered from '{event.name}'!")
         return True
     
+    def _remove_registration(self, event: Union[Event, EventOccurrence], user: User):
+        """Record that user no longer attends event (or one date of a series)"""
+        if isinstance(event, EventOccurrence):
+            attendees = event.series.occurrence_attendees[event.date]
+            attendees.remove(user.user_id)
+            if not attendees:
+                del event.series.occurrence_attendees[event.date]
+            record = event.series
+        else:
+            event.attendees.remove(user.user_id)
+            record = event
+        if event.registration_timeline is not None:  # None for registrations older than timelines
+            event.registration_timeline.cancel(int(self.clock()))
+        dashboard = self._dashboards.get(record.organizer_id)
+        if dashboard is not None:
+            dashboard.filled -= 1
+            if record is not event and not event.attendees:
+                dashboard.seats -= event.max_capacity
+        self._change_completions(record, -1)
+        if self._attendance_columns is not None:
+            self._attendance_columns.unregister(event, user.user_id, isinstance(event, EventOccurrence))
+        user.registered_events.remove(event.event_id)
+        if self._co_attendance is not None:
+            self._co_attendance.remove_registration(user.registered_events, event.event_id)
+        if user.user_id in self._schedules:
+            schedule.remove_event(self._schedules[user.user_id], event.event_id)
+        self._commit("registration.cancelled",
+                     {"event_id": event.event_id, "user_id": user.user_id}, record, user)
+    
+    @_transactional
+    def cancel_occurrence(self, occurrence_id: str) -> bool:
+        """Cancel one date of a recurring series and its registrations (Admin only)"""
+        if not self.current_user or self.current_user.role != UserRole.ADMIN:
+            print("❌ Access denied. Only Admins can cancel occurrences.")
+            return False
+        
+        occurrence = self.get_event(occurrence_id)
+        if not isinstance(occurrence, EventOccurrence):
+            print("❌ Occurrence not found.")
+            return False
+        
+        series = occurrence.series
+        changed_users = self._cancel_date(occurrence)
+        series.recurrence["exceptions"] = sorted(series.recurrence["exceptions"] + [occurrence.date])
+        
+        self._commit("occurrence.cancelled",
+                     {"event_id": occurrence_id, "series_id": series.event_id,
+                      "attendees": [user.user_id for user in changed_users]},
+                     series, *changed_users)
+        print(f"✅ '{series.name}' on {occurrence.date} cancelled.")
+        return True
+    
+    def _cancel_date(self, occurrence: EventOccurrence) -> List[User]:
+        """Drop the registrations and holds for one date of a series, notifying
+        its attendees; returns the users whose registrations changed"""
+        series, occurrence_id = occurrence.series, occurrence.event_id
+        self._notify_attendees("occurrence.cancelled", occurrence, occurrence.attendees)
+        for token in [token for token, hold in self._holds.items() if hold["event_id"] == occurrence_id]:
+            self._drop_hold(token)
+        series.occurrence_held_seats.pop(occurrence.date, None)  # In case the date is no longer an occurrence
+        
+        changed_users = []
+        series.occurrence_timelines.pop(occurrence.date, None)
+        self._dashboards.pop(series.organizer_id, None)  # Its sell-out may have been the fastest
+        self._change_completions(series, -len(occurrence.attendees))
+        if self._attendance_columns is not None:
+            self._attendance_columns.remove_date(occurrence)
+        for user_id in series.occurrence_attendees.pop(occurrence.date, []):
+            user = self.users.get(user_id)
+            if user is not None and occurrence_id in user.registered_events:
+                user.registered_events.remove(occurrence_id)
+                if self._co_attendance is not None:
+                    self._co_attendance.remove_registration(user.registered_events, occurrence_id)
+                self._schedules.pop(user_id, None)
+                changed_users.append(user)
+        return changed_users
+    
+    def get_event(self, event_id: str) -> Optional[Union[Event, EventOccurrence]]:
+        """Look up an event, or one date of a series by its "event_N@YYYY-MM-DD" ID"""
+        event = self.events.get(event_id)
+        if event is not None:
+            return event
+        
+        parts = recurrence.split_occurrence_id(event_id)
+        if parts is None:
+            return None
+        series = self.events.get(parts[0])
+        if series is None or not series.recurrence or \
+                not recurrence.is_occurrence(series.date, series.recurrence, parts[1]):
+            return None
+        return EventOccurrence(series, parts[1])
+    
+    def upcoming_occurrences(self, event_id: str, after: Optional[str] = None,
+                             limit: int = 5) -> List[EventOccurrence]:
+        """Next dates of a series on or after a date (default: today)"""
+        series = self.events.get(event_id)
+        if series is None or not series.recurrence:
+            return []
+        
+        after = after or date.today().isoformat()
+        dates = recurrence.occurrence_dates(series.date, series.recurrence, max(after, series.date))
+        return [EventOccurrence(series, day) for day in islice(dates, limit)]
+    
+    def view_events_between(self, start_date: str, end_date: str) -> List[Union[Event, EventOccurrence]]:
+        """Events and series dates from start_date to end_date (inclusive), in date order"""
+        try:
+            datetime.strptime(start_date, "%Y-%m-%d")
+            datetime.strptime(end_date, "%Y-%m-%d")
+        except ValueError:
+            print("❌ Invalid date format. Use YYYY-MM-DD.")
+            return []
+        
+        return self._cached(("view_events_between", start_date, end_date),
+                            lambda: self._events_between(start_date, end_date))
+    
+    def _events_between(self, start_date: str, end_date: str) -> List[Union[Event, EventOccurrence]]:
+        """Range-scan single events and expand only the series dates inside the range"""
+        start = bisect_left(self._event_sort_keys, (start_date,))
+        stop = bisect_left(self._event_sort_keys, (end_date + "\0",))
+        keyed = [(key, self.events[key[-1]]) for key in self._event_sort_keys[start:stop]
+                 if key[-1] not in self._series_ids]
+        
+        for series_id in self._series_ids:
+            series = self.events[series_id]
+            for day in recurrence.occurrence_dates(series.date, series.recurrence, start_date, end_date):
+                occurrence = EventOccurrence(series, day)
+                keyed.append((self._event_sort_key(occurrence), occurrence))
+        
+        keyed.sort(key=lambda pair: pair[0])
+        return [event for _, event in keyed]
+    
+    def query_events(self, fields: Iterable[str] = projections.DEFAULT_EVENT_FIELDS,
+                     organizer_id: Optional[str] = None, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None, location: Optional[str] = None,
+                     has_seats: Optional[bool] = None) -> Iterator[tuple]:
+        """Named tuples of only the given fields (see projections.EVENT_FIELDS) for events
+        matching every given filter, in date order, without building Event objects.
+        Within a date range with an end, each date of a series is a row of its own;
+        otherwise a series is one row, dated by its first date."""
+        try:
+            project = projections.event_projection(fields)
+            for day in (start_date, end_date):
+                if day:
+                    datetime.strptime(day, "%Y-%m-%d")
+        except ValueError as e:
+            print(f"❌ Invalid query: {e}")
+            return iter(())
+        
+        return self._query_events(project, organizer_id, start_date, end_date,
+                                  location.strip().casefold() if location else None, has_seats)
+    
+    def _query_events(self, project, organizer_id: Optional[str], start_date: Optional[str],
+                      end_date: Optional[str], location: Optional[str],
+                      has_seats: Optional[bool]) -> Iterator[tuple]:
+        """Range-scan the sorted event keys (or one organizer's events), merging in the series
+        dates inside the range, and project the matches lazily"""
+        if organizer_id is None:
+            keys = self._event_sort_keys
+            series_ids = self._series_ids
+        else:
+            organizer = self.users.get(organizer_id)
+            event_ids = [event_id for event_id in (organizer.created_events if organizer else [])
+                         if event_id in self.events]
+            keys = sorted(self._event_sort_key(self.events[event_id]) for event_id in event_ids)
+            series_ids = {event_id for event_id in event_ids if event_id in self._series_ids}
+        
+        start = bisect_left(keys, (start_date,)) if start_date else 0
+        stop = bisect_left(keys, (end_date + "\0",)) if end_date else len(keys)
+        # A copy of the range, so changes made while the rows are consumed do not shift it
+        keys = keys[start:stop]
+        
+        events = self.events
+        if end_date and series_ids:
+            dates = []
+            for series_id in series_ids:
+                series = events[series_id]
+                for day in recurrence.occurrence_dates(series.date, series.recurrence, start_date, end_date):
+                    key = (day, series.time, series.created_at, recurrence.occurrence_id(series_id, day))
+                    dates.append((key, series, day))
+            dates.sort()  # Keys are unique, so the events themselves are never compared
+            single = ((key, events[key[-1]], None) for key in keys if key[-1] not in series_ids)
+            matches = ((event, day) for _, event, day in heapq.merge(single, dates))
+        else:
+            matches = zip(map(events.__getitem__, map(itemgetter(-1), keys)), repeat(None))
+        
+        if location is not None or has_seats is not None:
+            matches = ((event, day) for event, day in matches
+                       if (location is None or event.location.casefold() == location) and
+                       (has_seats is None or (projections.seats_left(event, day) > 0) == has_seats))
+        return starmap(project, matches)
+    
     def view_all_events(self) -> List[Event]:
         """View all events (Admin and Event Organizer)"""
         if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
             print("❌ Access denied. Only Admins and Event Organizers can view all events.")
             return []
         
-        return list(self.events.values())
+        return self._cached(("view_all_events",), lambda: list(self.events.values()))
     
     def view_my_events(self) -> List[Event]:
         """View events created by current user (Event Organizer)"""
@@ -319,12 +1527,9 @@ class EventManagementSystem:
             print("❌ Access denied. Only Event Organizers can view their events.")
             return []
         
-        my_events = []
-        for event_id in self.current_user.created_events:
-            if event_id in self.events:
-                my_events.append(self.events[event_id])
-        
-        return my_events
+        created_events = self.current_user.created_events
+        return self._cached(("view_my_events", self.current_user.user_id), lambda: [
+            self.events[event_id] for event_id in created_events if event_id in self.events])
     
     def view_registered_events(self) -> List[Event]:
         """View events registered by current user (Student/Visitor)"""
@@ -332,15 +1537,16 @@ class EventManagementSystem:
             print("❌ Access denied. Only students and visitors can view registered events.")
             return []
         
-        registered_events = []
-        for event_id in self.current_user.registered_events:
-            if event_id in self.events:
-                registered_events.append(self.events[event_id])
-        
-        return registered_events
+        registered_events = self.current_user.registered_events
+        return self._cached(("view_registered_events", self.current_user.user_id), lambda: [
+            event for event in map(self.get_event, registered_events) if event is not None])
     
     def search_events(self, keyword: str) -> List[Event]:
         """Search events by keyword"""
+        return self._cached(("search_events", keyword.lower()), lambda: self._scan_events(keyword))
+    
+    def _scan_events(self, keyword: str) -> List[Event]:
+        """Scan all events for a keyword in name, description or location"""
         if not keyword:
             return list(self.events.values())
         
@@ -355,24 +1561,312 @@ class EventManagementSystem:
         
         return matching_events
     
+    def fuzzy_search_events(self, query: str, limit: int = DEFAULT_PAGE_SIZE) -> List[Event]:
+        """Search events allowing typos in each word, best matches first"""
+        if not query.strip():
+            return []
+        
+        self._ensure_search_indexes()
+        # Equal text scores are broken by attendance
+        ranked = heapq.nsmallest(
+            self._clamp_page_size(limit), self._text_index.search(query),
+            key=lambda item: (-item[1], -len(self.events[item[0]].attendees), item[0]))
+        return [self.events[event_id] for event_id, _ in ranked]
+    
+    def recommend_events(self, event_id: str, limit: int = 5) -> List[Event]:
+        """Events most often registered for by people registered for event_id,
+        leaving out the current user's own registrations"""
+        if self.get_event(event_id) is None:
+            print("❌ Event not found.")
+            return []
+        
+        if self._co_attendance is None:
+            self._co_attendance = CoAttendanceMatrix.build(
+                user.registered_events for user in self.users.values())
+        
+        exclude = set()
+        if self.current_user:
+            exclude = {recommendation_key(registered) for registered in self.current_user.registered_events}
+        ranked = self._co_attendance.top(event_id, self._clamp_page_size(limit), exclude)
+        return [self.events[key] for key, _ in ranked if key in self.events]
+    
+    @staticmethod
+    def _encode_cursor(key: Tuple) -> str:
+        """Encode a sort key as an opaque page cursor"""
+        import base64
+        return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str, length: int) -> Optional[Tuple]:
+        """Decode a page cursor back into a sort key of length strings (None if invalid)"""
+        import base64
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (ValueError, TypeError):
+            return None
+        if not isinstance(key, list) or len(key) != length or not all(isinstance(part, str) for part in key):
+            return None
+        return tuple(key)
+    
+    @staticmethod
+    def _clamp_page_size(limit: int) -> int:
+        """Keep a requested page size within 1..MAX_PAGE_SIZE"""
+        return max(1, min(limit, MAX_PAGE_SIZE))
+    
+    def _make_page(self, keyed_items: List[Tuple[Tuple, object]], limit: int) -> Dict:
+        """Build a page from up to limit + 1 (key, item) pairs in sort order"""
+        has_more = len(keyed_items) > limit
+        keyed_items = keyed_items[:limit]
+        next_cursor = self._encode_cursor(keyed_items[-1][0]) if has_more else None
+        return {"items": [item for _, item in keyed_items], "next_cursor": next_cursor}
+    
+    def _page_events(self, cursor: Optional[str], limit: int, predicate=None) -> Dict:
+        """Walk the sorted event index from cursor, collecting one page"""
+        limit = self._clamp_page_size(limit)
+        start = 0
+        if cursor:
+            after = self._decode_cursor(cursor, EVENT_SORT_KEY_LENGTH)
+            if after is None:
+                print("❌ Invalid page cursor.")
+                return {"items": [], "next_cursor": None}
+            start = bisect_right(self._event_sort_keys, after)
+        
+        keyed_items = []
+        for position in range(start, len(self._event_sort_keys)):
+            key = self._event_sort_keys[position]
+            event = self.events[key[-1]]
+            if predicate is None or predicate(event):
+                keyed_items.append((key, event))
+                if len(keyed_items) > limit:
+                    break
+        return self._make_page(keyed_items, limit)
+    
+    def _page_by_key(self, items, sort_key, key_length: int, cursor: Optional[str], limit: int) -> Dict:
+        """Page through an unsorted iterable, keeping only limit + 1 items in memory"""
+        limit = self._clamp_page_size(limit)
+        keyed = ((sort_key(item), item) for item in items)
+        if cursor:
+            after = self._decode_cursor(cursor, key_length)
+            if after is None:
+                print("❌ Invalid page cursor.")
+                return {"items": [], "next_cursor": None}
+            keyed = (pair for pair in keyed if pair[0] > after)
+        keyed_items = heapq.nsmallest(limit + 1, keyed, key=lambda pair: pair[0])
+        return self._make_page(keyed_items, limit)
+    
+    def view_all_events_page(self, cursor: Optional[str] = None,
+                             limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """View one page of all events ordered by date, time and ID"""
+        if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
+            print("❌ Access denied. Only Admins and Event Organizers can view all events.")
+            return {"items": [], "next_cursor": None}
+        
+        return self._cached(("view_all_events_page", cursor, limit),
+                            lambda: self._page_events(cursor, limit))
+    
+    def view_registered_events_page(self, cursor: Optional[str] = None,
+                                    limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """View one page of the current user's registered events"""
+        if not self.current_user or self.current_user.role not in [UserRole.STUDENT, UserRole.VISITOR]:
+            print("❌ Access denied. Only students and visitors can view registered events.")
+            return {"items": [], "next_cursor": None}
+        
+        events = (event for event in map(self.get_event, self.current_user.registered_events)
+                  if event is not None)
+        return self._page_by_key(events, self._event_sort_key, EVENT_SORT_KEY_LENGTH, cursor, limit)
+    
+    def search_events_page(self, keyword: str, cursor: Optional[str] = None,
+                           limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """Search events by keyword, one page at a time"""
+        keyword = keyword.lower()
+        if not keyword:
+            predicate = None
+        else:
+            def predicate(event):
+                return (keyword in event.name.lower() or
+                        keyword in event.description.lower() or
+                        keyword in event.location.lower())
+        
+        return self._cached(("search_events_page", keyword, cursor, limit),
+                            lambda: self._page_events(cursor, limit, predicate))
+    
+    def get_event_attendees_page(self, event_id: str, cursor: Optional[str] = None,
+                                 limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """Get one page of attendees for an event, ordered by username"""
+        if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
+            print("❌ Access denied. Only Admins and Event Organizers can view attendees.")
+            return {"items": [], "next_cursor": None}
+        
+        event = self.get_event(event_id)
+        if event is None:
+            print("❌ Event not found.")
+            return {"items": [], "next_cursor": None}
+        
+        attendees = (self.users[user_id] for user_id in event.attendees if user_id in self.users)
+        return self._page_by_key(attendees, lambda user: (user.username.casefold(), user.user_id), 2,
+                                 cursor, limit)
+    
+    def autocomplete_events(self, prefix: str, field: str = "name", limit: int = 10) -> List[str]:
+        """Suggest event names or locations for a typed prefix, most attended first"""
+        self._ensure_search_indexes()
+        if field == "name":
+            index = self._name_index
+        elif field == "location":
+            index = self._location_index
+        else:
+            print("❌ Autocomplete field must be 'name' or 'location'.")
+            return []
+        
+        # Several events can share a name or location; each completion is
+        # ranked by the combined attendance of its events
+        return index.top(prefix, limit)
+    
     def get_event_attendees(self, event_id: str) -> List[User]:
         """Get list of attendees for an event"""
         if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
             print("❌ Access denied. Only Admins and Event Organizers can view attendees.")
             return []
         
-        if event_id not in self.events:
+        event = self.get_event(event_id)
+        if event is None:
             print("❌ Event not found.")
             return []
         
-        event = self.events[event_id]
-        attendees = []
+        return self._cached(("get_event_attendees", event_id), lambda: [
+            self.users[user_id] for user_id in event.attendees if user_id in self.users])
+    
+    def query_users(self, fields: Iterable[str] = projections.DEFAULT_USER_FIELDS,
+                    role: Optional[UserRole] = None,
+                    user_ids: Optional[Iterable[str]] = None) -> Iterator[tuple]:
+        """Named tuples of only the given fields (see projections.USER_FIELDS) for every user,
+        or those of user_ids, with the given role (Admins and Event Organizers only)"""
+        if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
+            print("❌ Access denied. Only Admins and Event Organizers can query users.")
+            return iter(())
         
-        for user_id in event.attendees:
-            if user_id in self.users:
-                attendees.append(self.users[user_id])
+        try:
+            project = projections.user_projection(fields)
+        except ValueError as e:
+            print(f"❌ Invalid query: {e}")
+            return iter(())
+        
+        users = self.users
+        if user_ids is None:
+            candidates = users.values()
+        else:
+            # Streamed; a binary roster is read straight from its mapped file
+            candidates = (users[user_id] for user_id in user_ids if user_id in users)
+        return (project(user) for user in candidates if role is None or user.role == role)
+    
+    def get_registration_curve(self, event_id: str, resolution: str = "hour") -> List[Tuple[str, int, int]]:
+        """Registrations over time as (UTC bucket start, net registrations, running total),
+        per "minute", "hour" or "day" (Admins and Event Organizers only)"""
+        if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
+            print("❌ Access denied. Only Admins and Event Organizers can view registrations.")
+            return []
         
-        return attendees
+        if resolution not in RESOLUTIONS:
+            print(f"❌ Resolution must be one of: {', '.join(RESOLUTIONS)}.")
+            return []
+        
+        event = self.get_event(event_id)
+        if event is None:
+            print("❌ Event not found.")
+            return []
+        
+        if event.registration_timeline is None:
+            return []
+        return [(datetime.fromtimestamp(bucket, timezone.utc).strftime("%Y-%m-%d %H:%M"), count, total)
+                for bucket, count, total in event.registration_timeline.curve(resolution)]
+    
+    def get_sell_out_report(self) -> List[Dict]:
+        """Events and series dates that filled up, fastest first, with how long
+        they took from creation (Admin only)"""
+        if not self.current_user or self.current_user.role != UserRole.ADMIN:
+            print("❌ Access denied. Only Admins can view sell-out reports.")
+            return []
+        
+        return self._cached(("get_sell_out_report",), self._compute_sell_out_report)
+    
+    @staticmethod
+    def _sold_out_timelines(event: Event) -> List[Tuple[str, str, RegistrationTimeline]]:
+        """(event or date ID, date, timeline) of an event and its series dates that sold out"""
+        timelines = [(event.event_id, event.date, event.registration_timeline)]
+        timelines += [(recurrence.occurrence_id(event.event_id, day), day, timeline)
+                      for day, timeline in event.occurrence_timelines.items()]
+        return [(event_id, day, timeline) for event_id, day, timeline in timelines
+                if timeline is not None and timeline.sold_out_at is not None]
+    
+    @staticmethod
+    def _seconds_to_sell_out(event: Event, timeline: RegistrationTimeline) -> int:
+        """Seconds from an event's creation (or first registration) until it filled up"""
+        try:
+            opened_at = datetime.fromisoformat(event.created_at).timestamp()
+        except (TypeError, ValueError):
+            opened_at = timeline.first_registration_at
+        return max(0, int(timeline.sold_out_at - opened_at))
+    
+    def _compute_sell_out_report(self) -> List[Dict]:
+        """Time to sell out of every event or date with a recorded sell-out"""
+        report = []
+        for event in self.events.values():
+            for event_id, day, timeline in self._sold_out_timelines(event):
+                report.append({
+                    "event_id": event_id,
+                    "name": event.name,
+                    "date": day,
+                    "sold_out_at": datetime.fromtimestamp(timeline.sold_out_at).isoformat(),
+                    "seconds_to_sell_out": self._seconds_to_sell_out(event, timeline)
+                })
+        report.sort(key=lambda row: (row["seconds_to_sell_out"], row["event_id"]))
+        return report
+    
+    @staticmethod
+    def _offered_seats(event: Event) -> int:
+        """Seats of an event, or of the dates of a series anyone registered for"""
+        return event.max_capacity * (len(event.occurrence_attendees) if event.recurrence else 1)
+    
+    def _build_dashboard(self, organizer: User) -> OrganizerDashboard:
+        """Totals of an organizer's events, computed from scratch"""
+        dashboard = OrganizerDashboard()
+        for event_id in organizer.created_events:
+            event = self.events.get(event_id)
+            if event is None:
+                continue
+            dashboard.events += 1
+            dashboard.seats += self._offered_seats(event)
+            dashboard.filled += event.get_attendance_count()
+            for sold_out_id, _, timeline in self._sold_out_timelines(event):
+                dashboard.sold_out(self._seconds_to_sell_out(event, timeline), sold_out_id)
+        return dashboard
+    
+    def get_organizer_dashboard(self, organizer_id: Optional[str] = None) -> Dict:
+        """Totals of an organizer's events: how many, seats offered and filled, fill rate and
+        the fastest-filling event. Kept current by every change, so reading it is O(1).
+        Event Organizers see their own; Admins anyone's (their own by default)."""
+        if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
+            print("❌ Access denied. Only Admins and Event Organizers can view dashboards.")
+            return {}
+        
+        organizer_id = organizer_id or self.current_user.user_id
+        if organizer_id != self.current_user.user_id and self.current_user.role != UserRole.ADMIN:
+            print("❌ Access denied. Event Organizers can only view their own dashboard.")
+            return {}
+        
+        organizer = self.users.get(organizer_id)
+        if organizer is None:
+            print("❌ User not found.")
+            return {}
+        
+        dashboard = self._dashboards.get(organizer_id)
+        if dashboard is None:
+            dashboard = self._dashboards[organizer_id] = self._build_dashboard(organizer)
+        report = dashboard.to_dict()
+        fastest = report["fastest_filling"]
+        if fastest is not None:
+            event = self.get_event(fastest["event_id"])
+            fastest["name"] = event.name if event is not None else ""
+        return report
     
     def get_statistics(self) -> Dict:
         """Get system statistics"""
@@ -380,7 +1874,11 @@ class EventManagementSystem:
             print("❌ Access denied. Only Admins can view statistics.")
             return {}
         
-        total_attendees = sum(len(event.attendees) for event in self.events.values())
+        return self._cached(("get_statistics",), self._compute_statistics)
+    
+    def _compute_statistics(self) -> Dict:
+        """Compute system statistics from all events"""
+        total_attendees = sum(event.get_attendance_count() for event in self.events.values())
         
         if not self.events:
             return {
@@ -391,7 +1889,7 @@ class EventManagementSystem:
             }
         
         # Find events with highest and lowest attendance
-        event_attendance = [(event, len(event.attendees)) for event in self.events.values()]
+        event_attendance = [(event, event.get_attendance_count()) for event in self.events.values()]
         event_attendance.sort(key=lambda x: x[1], reverse=True)
         
         highest_attendance_event = event_attendance[0][0] if event_attendance else None
@@ -404,6 +1902,29 @@ class EventManagementSystem:
             "lowest_attendance_event": lowest_attendance_event
         }
     
+    def get_attendance_report(self) -> Dict:
+        """Get attendance analytics: fill rates and attendance group-bys (Admin only)"""
+        if not self.current_user or self.current_user.role != UserRole.ADMIN:
+            print("❌ Access denied. Only Admins can view analytics.")
+            return {}
+        
+        import analytics  # Imported on first use; NumPy is slow to import
+        if self._attendance_columns is None:
+            self._attendance_columns = analytics.project(self.users, self.events)
+        return self._cached(("get_attendance_report",),
+                            lambda: analytics.attendance_report(self._attendance_columns, len(self.events)))
+    
+    def audit_schedule_conflicts(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Every user's pairs of overlapping registrations, e.g. from before clashes
+        were checked or from events moved since (Admin only)"""
+        if not self.current_user or self.current_user.role != UserRole.ADMIN:
+            print("❌ Access denied. Only Admins can audit schedules.")
+            return {}
+        
+        return self._cached(("audit_schedule_conflicts",), lambda: schedule.audit({
+            user.user_id: self._build_schedule(user)
+            for user in self.users.values() if len(user.registered_events) > 1}))
+    
     def export_events_to_csv(self, filename: str = "events_report.csv"):
         """Export events data to CSV"""
         if not self.current_user or self.current_user.role != UserRole.ADMIN:
@@ -413,24 +1934,15 @@ class EventManagementSystem:
         try:
             filepath = f"{self.data_dir}/{filename}"
             with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['Event ID', 'Name', 'Description', 'Date', 'Time', 'Location', 
-                             'Max Capacity', 'Current Attendees', 'Organizer']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for event in self.events.values():
-                    organizer = self.users.get(event.organizer_id, User("", "", UserRole.STUDENT))
-                    writer.writerow({
-                        'Event ID': event.event_id,
-                        'Name': event.name,
-                        'Description': event.description,
-                        'Date': event.date,
-                        'Time': event.time,
-                        'Location': event.location,
-                        'Max Capacity': event.max_capacity,
-                        'Current Attendees': len(event.attendees),
-                        'Organizer': organizer.username
-                    })
+                writer = csv.writer(csvfile)
+                writer.writerow(['Event ID', 'Name', 'Description', 'Date', 'Time', 'Location',
+                                 'Max Capacity', 'Current Attendees', 'Organizer'])
+                rows = self.query_events(("event_id", "name", "description", "date", "time", "location",
+                                          "max_capacity", "attendance", "organizer_id"))
+                users = self.users
+                for row in rows:
+                    organizer = users.get(row.organizer_id)
+                    writer.writerow(row[:-1] + (organizer.username if organizer else "",))
             
             print(f"✅ Events data exported to {filepath}")
             return True
@@ -438,48 +1950,146 @@ class EventManagementSystem:
             print(f"❌ Error exporting data: {e}")
             return False
     
+    def follow_changes(self, offset: Optional[str] = None, follow: bool = False,
+                       idle_timeout: Optional[float] = None):
+        """Yield (offset, change) pairs from the changelog, resuming after a saved offset"""
+        return self.change_feed.read(offset, follow=follow, idle_timeout=idle_timeout)
+    
+    def get_change_version(self) -> int:
+        """Current change high-water mark"""
+        return self._version
+    
+    def export_changes_since(self, since_version: int, filename: str = None,
+                             fmt: str = "csv") -> Optional[int]:
+        """Export users/events changed or deleted after since_version (CSV or JSONL).
+        Returns the new high-water mark to pass as since_version next time."""
+        if not self.current_user or self.current_user.role != UserRole.ADMIN:
+            print("❌ Access denied. Only Admins can export data.")
+            return None
+        
+        if fmt not in ("csv", "jsonl"):
+            print("❌ Export format must be 'csv' or 'jsonl'.")
+            return None
+        
+        if not filename:
+            filename = f"changes_since_{since_version}.{fmt}"
+        
+        high_water_mark = self._version
+        changes = []
+        for record in list(self.events.values()) + list(self.users.values()):
+            if record.version > since_version:
+                changes.append((record.version, self._record_type(record),
+                                self._record_id(record), "upsert", record.to_dict()))
+        for tombstone in self._tombstones.values():
+            if tombstone["version"] > since_version:
+                changes.append((tombstone["version"], tombstone["type"], tombstone["id"],
+                                "delete", None))
+        changes.sort(key=lambda change: change[:3])
+        
+        try:
+            filepath = f"{self.data_dir}/{filename}"
+            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                if fmt == "csv":
+                    writer = csv.writer(f)
+                    writer.writerow(['Version', 'Record Type', 'Record ID', 'Change', 'Data'])
+                    for version, record_type, record_id, change, data in changes:
+                        writer.writerow([version, record_type, record_id, change,
+                                         json.dumps(data, ensure_ascii=False) if data else ""])
+                else:
+                    for version, record_type, record_id, change, data in changes:
+                        f.write(json.dumps({"version": version, "type": record_type, "id": record_id,
+                                            "change": change, "data": data}, ensure_ascii=False))
+                        f.write("\n")
+            
+            print(f"✅ {len(changes)} change(s) exported to {filepath} (version {high_water_mark})")
+            return high_water_mark
+        except Exception as e:
+            print(f"❌ Error exporting data: {e}")
+            return None
+    
     def export_attendees_to_csv(self, event_id: str, filename: str = None):
         """Export attendees data for a specific event to CSV"""
         if not self.current_user or self.current_user.role not in [UserRole.ADMIN, UserRole.EVENT_ORGANIZER]:
             print("❌ Access denied. Only Admins and Event Organizers can export attendee data.")
             return False
         
-        if event_id not in self.events:
+        event = self.get_event(event_id)
+        if event is None:
             print("❌ Event not found.")
             return False
         
         if not filename:
-            event = self.events[event_id]
             filename = f"attendees_{event.name.replace(' ', '_')}_{event_id}.csv"
         
         try:
             filepath = f"{self.data_dir}/{filename}"
-            attendees = self.get_event_attendees(event_id)
+            attendees = self.query_users(("user_id", "username", "role", "email"), user_ids=event.attendees)
             
             with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['User ID', 'Username', 'Role', 'Email']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for attendee in attendees:
-                    writer.writerow({
-                        'User ID': attendee.user_id,
-                        'Username': attendee.username,
-                        'Role': attendee.role.value,
-                        'Email': attendee.email
-                    })
+                writer = csv.writer(csvfile)
+                writer.writerow(['User ID', 'Username', 'Role', 'Email'])
+                writer.writerows(attendees)
             
             print(f"✅ Attendees data exported to {filepath}")
             return True
         except Exception as e:
             print(f"❌ Error exporting data: {e}")
             return False
+    
+    def export_calendar(self) -> Optional[str]:
+        """Export the current user's registered and created events as an iCalendar (.ics) feed"""
+        if not self.current_user:
+            print("❌ Please login first.")
+            return None
+        
+        import ical_export
+        try:
+            filepath = ical_export.write_feed(
+                self, self.current_user, os.path.join(self.data_dir, ical_export.FEED_DIRECTORY))
+        except Exception as e:
+            print(f"❌ Error exporting calendar: {e}")
+            return None
+        
+        print(f"✅ Calendar exported to {filepath}")
+        return filepath
+    
+    def export_all_calendars(self, force: bool = False) -> Optional[Dict]:
+        """Regenerate every user's iCalendar feed, skipping unchanged ones (Admin only)"""
+        if not self.current_user or self.current_user.role != UserRole.ADMIN:
+            print("❌ Access denied. Only Admins can export all calendars.")
+            return None
+        
+        import ical_export
+        directory = os.path.join(self.data_dir, ical_export.FEED_DIRECTORY)
+        try:
+            counts = ical_export.export_feeds(self, directory, force=force)
+        except Exception as e:
+            print(f"❌ Error exporting calendars: {e}")
+            return None
+        
+        print(f"✅ Calendars in {directory}: {counts['written']} written, "
+              f"{counts['skipped']} unchanged, {counts['removed']} removed")
+        return counts
+    
+    def start_trace(self, path: str):
+        """Append every public call from now on, with its arguments and the acting user,
+        to a JSONL trace that tracing.py can replay"""
+        import tracing  # Only needed while recording
+        self.stop_trace()
+        self._trace_recorder = tracing.TraceRecorder(self, path)
+        self._trace_recorder.start()
+    
+    def stop_trace(self):
+        """Stop recording calls"""
+        if self._trace_recorder is not None:
+            self._trace_recorder.stop()
+            self._trace_recorder = None
 
 class EventManagementUI:
     """User interface for the Event Management System"""
     
-    def __init__(self):
-        self.system = EventManagementSystem()
+    def __init__(self, data_dir: str = "data"):
+        self.system = EventManagementSystem(data_dir=data_dir)
         self.setup_demo_data()
     
     def setup_demo_data(self):
@@ -563,9 +2173,9 @@ class EventManagementUI:
     def login_user(self):
         """Handle user login"""
         print("\n--- LOGIN ---")
-        user_id = input("Enter User ID: ").strip()
+        identifier = input("Enter User ID or username: ").strip()
         
-        if self.system.login(user_id):
+        if self.system.login(identifier) or self.system.login_by_username(identifier):
             print(f"✅ Welcome back, {self.system.current_user.username}!")
         else:
             print("❌ Invalid User ID. Please try again.")
@@ -596,7 +2206,8 @@ class EventManagementUI:
         email = input("Enter email (optional): ").strip()
         
         user_id = self.system.register_user(username, role_map[role_choice], email)
-        print(f"✅ User registered successfully! Your User ID is: {user_id}")
+        if user_id:
+            print(f"✅ User registered successfully! Your User ID is: {user_id}")
     
     def display_admin_menu(self):
         """Display admin menu"""
@@ -609,9 +2220,13 @@ class EventManagementUI:
         print("6. View Statistics")
         print("7. Export Events to CSV")
         print("8. Export Attendees to CSV")
-        print("9. Logout")
+        print("9. Attendance Analytics")
+        print("10. Schedule Conflicts")
+        print("11. Archive Past Events")
+        print("12. Search Archived Events")
+        print("13. Logout")
         
-        choice = input("\nEnter your choice (1-9): ").strip()
+        choice = input("\nEnter your choice (1-13): ").strip()
         
         if choice == "1":
             self.create_event_ui()
@@ -630,6 +2245,14 @@ class EventManagementUI:
         elif choice == "8":
             self.export_attendees_ui()
         elif choice == "9":
+            self.view_analytics_ui()
+        elif choice == "10":
+            self.view_schedule_conflicts_ui()
+        elif choice == "11":
+            self.archive_events_ui()
+        elif choice == "12":
+            self.search_archived_events_ui()
+        elif choice == "13":
             self.system.logout()
             print("✅ Logged out successfully!")
         else:
@@ -642,9 +2265,11 @@ class EventManagementUI:
         print("2. View My Events")
         print("3. View Event Attendees")
         print("4. Export Attendees to CSV")
-        print("5. Logout")
+        print("5. Export My Calendar (.ics)")
+        print("6. My Dashboard")
+        print("7. Logout")
         
-        choice = input("\nEnter your choice (1-5): ").strip()
+        choice = input("\nEnter your choice (1-7): ").strip()
         
         if choice == "1":
             self.create_event_ui()
@@ -655,6 +2280,10 @@ class EventManagementUI:
         elif choice == "4":
             self.export_attendees_ui()
         elif choice == "5":
+            self.system.export_calendar()
+        elif choice == "6":
+            self.view_dashboard_ui()
+        elif choice == "7":
             self.system.logout()
             print("✅ Logged out successfully!")
         else:
@@ -667,9 +2296,10 @@ class EventManagementUI:
         print("2. View Registered Events")
         print("3. Register for Event")
         print("4. Unregister from Event")
-        print("5. Logout")
+        print("5. Export My Calendar (.ics)")
+        print("6. Logout")
         
-        choice = input("\nEnter your choice (1-5): ").strip()
+        choice = input("\nEnter your choice (1-6): ").strip()
         
         if choice == "1":
             self.search_events_ui()
@@ -680,6 +2310,8 @@ class EventManagementUI:
         elif choice == "4":
             self.unregister_from_event_ui()
         elif choice == "5":
+            self.system.export_calendar()
+        elif choice == "6":
             self.system.logout()
             print("✅ Logged out successfully!")
         else:
@@ -700,7 +2332,23 @@ class EventManagementUI:
             print("❌ Invalid capacity. Please enter a number.")
             return
         
-        self.system.create_event(name, description, date, time, location, max_capacity)
+        try:
+            duration_minutes = int(input(f"Duration in minutes (default: {DEFAULT_DURATION_MINUTES}): ").strip()
+                                   or DEFAULT_DURATION_MINUTES)
+        except ValueError:
+            print("❌ Invalid duration. Please enter a number.")
+            return
+        
+        recurrence_rule = None
+        repeat = input("Repeat (none/weekly/monthly, default: none): ").strip().lower()
+        if repeat and repeat != "none":
+            until = input("Repeat until (YYYY-MM-DD): ").strip()
+            skipped = input("Skip dates (YYYY-MM-DD, comma-separated, optional): ").strip()
+            recurrence_rule = {"freq": repeat, "until": until or None,
+                               "exceptions": [day.strip() for day in skipped.split(",") if day.strip()]}
+        
+        self.system.create_event(name, description, date, time, location, max_capacity, recurrence_rule,
+                                 duration_minutes)
     
     def update_event_ui(self):
         """UI for updating events"""
@@ -728,6 +2376,15 @@ class EventManagementUI:
                 print("❌ Invalid capacity. Update cancelled.")
                 return
         
+        duration_minutes = None
+        duration_input = input("New duration in minutes: ").strip()
+        if duration_input:
+            try:
+                duration_minutes = int(duration_input)
+            except ValueError:
+                print("❌ Invalid duration. Update cancelled.")
+                return
+        
         updates = {}
         if name: updates['name'] = name
         if description: updates['description'] = description
@@ -735,6 +2392,7 @@ class EventManagementUI:
         if time: updates['time'] = time
         if location: updates['location'] = location
         if max_capacity is not None: updates['max_capacity'] = max_capacity
+        if duration_minutes is not None: updates['duration_minutes'] = duration_minutes
         
         if updates:
             self.system.update_event(event_id, **updates)
@@ -754,16 +2412,39 @@ class EventManagementUI:
         else:
             print("❌ Deletion cancelled.")
     
+    def browse_pages(self, fetch_page, show_item) -> int:
+        """Show items one page at a time; returns how many were shown"""
+        cursor = None
+        shown = 0
+        
+        while True:
+            page = fetch_page(cursor)
+            for item in page["items"]:
+                show_item(item)
+                shown += 1
+            
+            cursor = page["next_cursor"]
+            if not cursor:
+                return shown
+            
+            more = input("\nPress Enter for more, or 'q' to stop: ").strip().lower()
+            if more == "q":
+                return shown
+    
+    def show_series_dates(self, event):
+        """Show how a series repeats and the IDs of its next dates"""
+        if not event.recurrence:
+            return
+        print(f"   Repeats: {recurrence.describe(event.recurrence)}")
+        upcoming = self.system.upcoming_occurrences(event.event_id)
+        if upcoming:
+            print(f"   Next dates: {', '.join(occurrence.event_id for occurrence in upcoming)}")
+    
     def view_all_events_ui(self):
         """UI for viewing all events"""
         print("\n--- ALL EVENTS ---")
-        events = self.system.view_all_events()
         
-        if not events:
-            print("No events found.")
-            return
-        
-        for event in events:
+        def show_event(event):
             print(f"\n📅 Event ID: {event.event_id}")
             print(f"   Name: {event.name}")
             print(f"   Description: {event.description}")
@@ -771,6 +2452,10 @@ class EventManagementUI:
             print(f"   Location: {event.location}")
             print(f"   Capacity: {len(event.attendees)}/{event.max_capacity}")
             print(f"   Organizer: {self.system.users[event.organizer_id].username}")
+            self.show_series_dates(event)
+        
+        if not self.browse_pages(self.system.view_all_events_page, show_event):
+            print("No events found.")
     
     def view_my_events_ui(self):
         """UI for viewing organizer's events"""
@@ -792,33 +2477,24 @@ class EventManagementUI:
     def view_registered_events_ui(self):
         """UI for viewing registered events"""
         print("\n--- MY REGISTERED EVENTS ---")
-        events = self.system.view_registered_events()
         
-        if not events:
-            print("No registered events found.")
-            return
-        
-        for event in events:
+        def show_event(event):
             print(f"\n📅 Event ID: {event.event_id}")
             print(f"   Name: {event.name}")
             print(f"   Description: {event.description}")
             print(f"   Date: {event.date} at {event.time}")
             print(f"   Location: {event.location}")
             print(f"   Capacity: {len(event.attendees)}/{event.max_capacity}")
+        
+        if not self.browse_pages(self.system.view_registered_events_page, show_event):
+            print("No registered events found.")
     
     def search_events_ui(self):
         """UI for searching events"""
         print("\n--- SEARCH EVENTS ---")
         keyword = input("Enter search keyword: ").strip()
         
-        events = self.system.search_events(keyword)
-        
-        if not events:
-            print("No events found matching your search.")
-            return
-        
-        print(f"\nFound {len(events)} event(s):")
-        for event in events:
+        def show_event(event):
             print(f"\n📅 Event ID: {event.event_id}")
             print(f"   Name: {event.name}")
             print(f"   Description: {event.description}")
@@ -826,6 +2502,21 @@ class EventManagementUI:
             print(f"   Location: {event.location}")
             print(f"   Capacity: {len(event.attendees)}/{event.max_capacity}")
             print(f"   Status: {'🟢 Available' if not event.is_full() else '🔴 Full'}")
+            self.show_series_dates(event)
+        
+        shown = self.browse_pages(
+            lambda cursor: self.system.search_events_page(keyword, cursor), show_event)
+        
+        if not shown:
+            print("No events found matching your search.")
+            suggestions = self.system.fuzzy_search_events(keyword, limit=5)
+            if suggestions:
+                print("\nDid you mean:")
+                for event in suggestions:
+                    show_event(event)
+            return
+        
+        print(f"\nShowed {shown} matching event(s).")
     
     def register_for_event_ui(self):
         """UI for registering for events"""
@@ -833,7 +2524,14 @@ class EventManagementUI:
         self.search_events_ui()
         
         event_id = input("\nEnter Event ID to register: ").strip()
-        self.system.register_for_event(event_id)
+        if not self.system.register_for_event(event_id):
+            return
+        
+        recommendations = self.system.recommend_events(event_id)
+        if recommendations:
+            print("\n💡 People who registered for this also registered for:")
+            for event in recommendations:
+                print(f"   📅 {event.event_id}: {event.name} ({event.date} at {event.location})")
     
     def unregister_from_event_ui(self):
         """UI for unregistering from events"""
@@ -853,15 +2551,23 @@ class EventManagementUI:
             self.view_my_events_ui()
         
         event_id = input("\nEnter Event ID to view attendees: ").strip()
-        attendees = self.system.get_event_attendees(event_id)
+        print(f"\nAttendees for Event ID {event_id}:")
         
-        if not attendees:
+        def show_attendee(attendee):
+            print(f"   👤 {attendee.username} ({attendee.role.value}) - {attendee.email}")
+        
+        shown = self.browse_pages(
+            lambda cursor: self.system.get_event_attendees_page(event_id, cursor), show_attendee)
+        
+        if not shown:
             print("No attendees found for this event.")
             return
-        
-        print(f"\nAttendees for Event ID {event_id}:")
-        for attendee in attendees:
-            print(f"   👤 {attendee.username} ({attendee.role.value}) - {attendee.email}")
+    
+        curve = self.system.get_registration_curve(event_id, "day")
+        if curve:
+            print("\n📈 Registrations per day (UTC):")
+            for day, count, total in curve:
+                print(f"   {day[:10]}: {count:+d} (total {total})")
     
     def view_statistics_ui(self):
         """UI for viewing statistics"""
@@ -876,11 +2582,105 @@ class EventManagementUI:
         
         if stats['highest_attendance_event']:
             event = stats['highest_attendance_event']
-            print(f"🏆 Highest Attendance: '{event.name}' with {len(event.attendees)} attendees")
+            print(f"🏆 Highest Attendance: '{event.name}' with {event.get_attendance_count()} attendees")
         
         if stats['lowest_attendance_event']:
             event = stats['lowest_attendance_event']
-            print(f"📉 Lowest Attendance: '{event.name}' with {len(event.attendees)} attendees")
+            print(f"📉 Lowest Attendance: '{event.name}' with {event.get_attendance_count()} attendees")
+        
+        sold_out = self.system.get_sell_out_report()
+        if sold_out:
+            print("\n⚡ Fastest sell-outs:")
+            for row in sold_out[:5]:
+                print(f"   {row['name']} ({row['date']}): full after {timedelta(seconds=row['seconds_to_sell_out'])}")
+    
+    def view_dashboard_ui(self):
+        """UI for viewing the organizer dashboard"""
+        print("\n--- MY DASHBOARD ---")
+        dashboard = self.system.get_organizer_dashboard()
+        
+        if not dashboard:
+            return
+        
+        print(f"📅 Total Events: {dashboard['total_events']}")
+        print(f"💺 Total Seats: {dashboard['total_seats']}")
+        print(f"👥 Seats Filled: {dashboard['seats_filled']}")
+        print(f"🎯 Fill Rate: {dashboard['fill_rate']:.0%}")
+        
+        fastest = dashboard['fastest_filling']
+        if fastest:
+            print(f"⚡ Fastest Filling: '{fastest['name']}' ({fastest['event_id']}), "
+                  f"full after {timedelta(seconds=fastest['seconds_to_sell_out'])}")
+        else:
+            print("⚡ Fastest Filling: no event has filled up yet")
+    
+    def view_analytics_ui(self):
+        """UI for viewing attendance analytics"""
+        print("\n--- ATTENDANCE ANALYTICS ---")
+        report = self.system.get_attendance_report()
+        
+        if not report:
+            return
+        
+        print(f"📊 {report['total_events']} events, {report['total_registrations']} registrations")
+        
+        print("\n🎯 Fill rate per event:")
+        for event_id, rate in sorted(report['fill_rate'].items(), key=lambda item: -item[1])[:10]:
+            print(f"   {self.system.get_event(event_id).name}: {rate:.0%}")
+        
+        for title, key in [("👤 By organizer", "by_organizer"), ("📍 By location", "by_location"),
+                           ("📅 By weekday", "by_weekday"), ("🗓️ By month", "by_month"),
+                           ("🎓 By role", "by_role")]:
+            print(f"\n{title}:")
+            for group, total in report[key].items():
+                print(f"   {group}: {total}")
+    
+    def view_schedule_conflicts_ui(self):
+        """UI for auditing users' overlapping registrations"""
+        print("\n--- SCHEDULE CONFLICTS ---")
+        report = self.system.audit_schedule_conflicts()
+    
+        if not report:
+            print("✅ No user is registered for overlapping events.")
+            return
+    
+        for user_id, conflicts in report.items():
+            user = self.system.users[user_id]
+            print(f"\n👤 {user.username} ({user_id}):")
+            for first_id, second_id in conflicts:
+                first, second = self.system.get_event(first_id), self.system.get_event(second_id)
+                print(f"   {first.name} ({first.date} {first.time}) overlaps "
+                      f"{second.name} ({second.date} {second.time})")
+    
+    def archive_events_ui(self):
+        """UI for moving past events to the archive"""
+        print("\n--- ARCHIVE PAST EVENTS ---")
+        days_input = input(f"Archive events that ended more than how many days ago "
+                           f"(default: {ARCHIVE_AFTER_DAYS}): ").strip()
+        try:
+            days = int(days_input) if days_input else ARCHIVE_AFTER_DAYS
+        except ValueError:
+            print("❌ Invalid number of days.")
+            return
+        
+        self.system.archive_events(days)
+    
+    def search_archived_events_ui(self):
+        """UI for searching archived events"""
+        print("\n--- SEARCH ARCHIVED EVENTS ---")
+        keyword = input("Enter search keyword (or press Enter for all): ").strip()
+        events = self.system.search_archived_events(keyword)
+        
+        if not events:
+            print("No archived events found.")
+            return
+        
+        for event in events:
+            print(f"\n🗄️ Event ID: {event.event_id}")
+            print(f"   Name: {event.name}")
+            print(f"   Date: {event.date} at {event.time}")
+            print(f"   Location: {event.location}")
+            print(f"   Attendance: {event.get_attendance_count()}/{event.max_capacity}")
     
     def export_events_ui(self):
         """UI for exporting events"""
@@ -919,5 +2719,20 @@ class EventManagementUI:
                 print(f"❌ An error occurred: {e}")
 
 if __name__ == "__main__":
-    ui = EventManagementUI()
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(description="Campus Event Management System")
+    location = parser.add_mutually_exclusive_group()
+    location.add_argument("--data-dir", default="data", help="Data directory (default: data)")
+    location.add_argument("--campus", help="Use campuses/<CAMPUS> as the data directory")
+    args = parser.parse_args()
+    
+    if args.campus:
+        import tenancy
+        try:
+            args.data_dir = tenancy.tenant_directory("campuses", args.campus)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+    ui = EventManagementUI(args.data_dir)
     ui.run() 
\ No newline at end of file
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Non-interactive command-line interface for the Campus Event Management System
+
+Every command calls EventManagementSystem directly: no menus, no prompts and
+no demo data. Results go to stdout as tab-separated lines (or JSON with
+--json); the system's own messages go to stderr, so the output can be piped.
+The exit code is 0 on success and 1 on failure.
+
+Examples:
+    python events_cli.py search python --limit 5
+    python events_cli.py list --from 2025-03-01 --to 2025-03-31 --has-seats --fields event_id,name,seats_left
+    python events_cli.py --as student1 register event_3 event_7
+    python events_cli.py --as admin export events --output events.csv
+    python events_cli.py --as admin --json stats
+    python events_cli.py --as organizer1 import events new_events.csv
+    python events_cli.py --as admin export-changes --since 42 --format jsonl
+    python events_cli.py --as admin export-calendars
+    python events_cli.py --as admin archive --days 180
+    python events_cli.py search python --archived
+    python events_cli.py --as admin send-notifications --file notifications.jsonl
+"""
+
+import time
+
+_STARTED = time.perf_counter()  # Before the other imports, so --timing can report them
+
+import argparse
+import csv
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+
+import projections
+from event_management_system import ARCHIVE_AFTER_DAYS, EventManagementSystem, UserRole
+
+EVENT_IMPORT_COLUMNS = ['Name', 'Description', 'Date', 'Time', 'Location', 'Max Capacity']
+USER_IMPORT_COLUMNS = ['Username', 'Role', 'Email']
+
+
+def login_as(system: EventManagementSystem, identifier: str) -> bool:
+    """Login by user ID, username or email"""
+    user = system.find_user(identifier)
+    if user is None:
+        print(f"❌ Unknown user '{identifier}'.", file=sys.stderr)
+        return False
+    return system.login(user.user_id)
+
+
+def write_event(args, event):
+    """Write one event as a tab-separated line"""
+    print("\t".join([event.event_id, event.date, event.time,
+                     f"{len(event.attendees)}/{event.max_capacity}", event.name, event.location]),
+          file=args.out)
+
+
+def cmd_search(system: EventManagementSystem, args) -> int:
+    """Print one page of events matching a keyword"""
+    if args.archived:
+        # The archive is scanned in full, so it has no cursor
+        events = system.search_archived_events(args.keyword)[:args.limit]
+        page = {"items": events, "next_cursor": None}
+    else:
+        page = system.search_events_page(args.keyword, args.cursor, args.limit)
+    if args.json:
+        json.dump({"items": [event.to_dict() for event in page["items"]],
+                   "next_cursor": page["next_cursor"]}, args.out, ensure_ascii=False)
+        print(file=args.out)
+    else:
+        for event in page["items"]:
+            write_event(args, event)
+        if page["next_cursor"]:
+            print(f"More results: --cursor {page['next_cursor']}", file=sys.stderr)
+    return 0
+
+
+def cmd_list(system: EventManagementSystem, args) -> int:
+    """Print the chosen fields of the events matching the filters, in date order"""
+    fields = [field.strip() for field in args.fields.split(",")]
+    try:
+        projections.event_projection(fields)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    organizer_id = None
+    if args.organizer:
+        organizer = system.find_user(args.organizer)
+        if organizer is None:
+            print(f"❌ Unknown user '{args.organizer}'.")
+            return 1
+        organizer_id = organizer.user_id
+
+    rows = system.query_events(fields, organizer_id, args.start, args.end, args.location, args.has_seats)
+    if args.json:
+        json.dump([row._asdict() for row in rows], args.out, ensure_ascii=False)
+        print(file=args.out)
+    else:
+        for row in rows:
+            print("\t".join("" if value is None else str(value) for value in row), file=args.out)
+    return 0
+
+
+def cmd_register(system: EventManagementSystem, args) -> int:
+    """Register the --as user for one or more events, saved as one transaction"""
+    failed = 0
+    with system.transaction():
+        for event_id in args.event_ids:
+            registered = system.register_for_event(event_id)
+            failed += not registered
+            print(f"{event_id}\t{'registered' if registered else 'failed'}", file=args.out)
+    return 1 if failed else 0
+
+
+def cmd_export(system: EventManagementSystem, args) -> int:
+    """Export events or one event's attendees to CSV in the data directory"""
+    if args.what == "events":
+        exported = system.export_events_to_csv(args.output or "events_report.csv")
+    elif not args.event_id:
+        print("❌ Exporting attendees needs an event ID.")
+        return 1
+    else:
+        exported = system.export_attendees_to_csv(args.event_id, args.output)
+    return 0 if exported else 1
+
+
+def cmd_stats(system: EventManagementSystem, args) -> int:
+    """Print system statistics (Admin only)"""
+    stats = system.get_statistics()
+    if not stats:
+        return 1
+
+    # Events are reported by ID
+    for key in ("highest_attendance_event", "lowest_attendance_event"):
+        stats[key] = stats[key].event_id if stats[key] else None
+    if args.json:
+        json.dump(stats, args.out)
+        print(file=args.out)
+    else:
+        for key, value in stats.items():
+            print(f"{key}\t{'' if value is None else value}", file=args.out)
+    return 0
+
+
+def _read_rows(path: str, columns: list):
+    """Yield CSV rows as dicts after checking the header has the required columns"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in columns if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"missing column(s): {', '.join(missing)}")
+        yield from reader
+
+
+def _import_event(system: EventManagementSystem, row: dict):
+    """Create an event from an import row; returns its ID or None"""
+    try:
+        capacity = int(row['Max Capacity'])
+    except ValueError:
+        print(f"❌ Invalid capacity '{row['Max Capacity']}'.")
+        return None
+    return system.create_event(row['Name'], row['Description'], row['Date'], row['Time'],
+                               row['Location'], capacity)
+
+
+def _import_user(system: EventManagementSystem, row: dict):
+    """Register a user from an import row; returns its ID or None"""
+    try:
+        role = UserRole(row['Role'].strip().lower())
+    except ValueError:
+        print(f"❌ Unknown role '{row['Role']}'.")
+        return None
+    return system.register_user(row['Username'], role, row['Email'] or "")
+
+
+def cmd_import(system: EventManagementSystem, args) -> int:
+    """Create events or users from a CSV file, saved as one transaction.
+    Prints the ID of every created record; rejected rows are reported on stderr."""
+    columns, import_row = ((EVENT_IMPORT_COLUMNS, _import_event) if args.what == "events"
+                           else (USER_IMPORT_COLUMNS, _import_user))
+    created = rejected = 0
+    try:
+        with system.transaction():
+            # Line 1 is the header
+            for line, row in enumerate(_read_rows(args.file, columns), start=2):
+                new_id = import_row(system, row)
+                if new_id:
+                    created += 1
+                    print(new_id, file=args.out)
+                else:
+                    rejected += 1
+                    print(f"❌ Line {line} not imported.")
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"❌ Cannot import {args.file}: {e}")
+        return 1
+
+    print(f"✅ {created} {args.what} imported, {rejected} rejected.")
+    return 1 if rejected else 0
+
+
+def cmd_export_changes(system: EventManagementSystem, args) -> int:
+    """Export records changed since a version and print the new high-water mark"""
+    high_water_mark = system.export_changes_since(args.since, args.output, args.format)
+    if high_water_mark is None:
+        return 1
+    print(high_water_mark, file=args.out)
+    return 0
+
+
+def cmd_export_calendars(system: EventManagementSystem, args) -> int:
+    """Regenerate users' iCalendar feeds; unchanged feeds are skipped unless --force"""
+    if system.current_user and system.current_user.role == UserRole.ADMIN:
+        return 0 if system.export_all_calendars(force=args.force) is not None else 1
+    # Anyone else gets just their own feed
+    return 0 if system.export_calendar() else 1
+
+
+def cmd_archive(system: EventManagementSystem, args) -> int:
+    """Move past events to the archive and print how many were moved (Admin only)"""
+    archived = system.archive_events(args.days)
+    if archived is None:
+        return 1
+    print(archived, file=args.out)
+    return 0
+
+
+def cmd_send_notifications(system: EventManagementSystem, args) -> int:
+    """Deliver queued attendee notifications once and print the counts (Admin only)"""
+    if not system.current_user or system.current_user.role != UserRole.ADMIN:
+        print("❌ Access denied. Only Admins can send notifications.")
+        return 1
+
+    from notifications import FileSender, NotificationDispatcher, SMTPSender
+    if args.file:
+        sender = FileSender(os.path.join(system.data_dir, args.file))
+    else:
+        sender = SMTPSender(args.smtp_host, args.smtp_port)
+    dispatcher = NotificationDispatcher(system, sender, workers=args.workers, batch_size=args.batch_size)
+    try:
+        system.outbox.release_stale_claims()
+        totals = dispatcher.run_once()
+    finally:
+        dispatcher.stop()
+
+    if args.json:
+        json.dump(totals, args.out)
+        print(file=args.out)
+    else:
+        for key, value in totals.items():
+            print(f"{key}\t{value}", file=args.out)
+    return 1 if totals["failed"] else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one subcommand per operation"""
+    parser = argparse.ArgumentParser(prog="events", description="Campus Event Management System")
+    location = parser.add_mutually_exclusive_group()
+    location.add_argument("--data-dir", default="data", help="Data directory (default: data)")
+    location.add_argument("--campus", help="Use campuses/<CAMPUS> as the data directory")
+    parser.add_argument("--as", dest="actor", help="User ID, username or email to act as")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--timing", action="store_true",
+                        help="Report import, load and command time in milliseconds on stderr")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Append the system calls this command makes to a trace file (see tracing.py)")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    search = subparsers.add_parser("search", help="Search events by keyword, one page at a time")
+    search.add_argument("keyword", nargs="?", default="", help="Keyword (default: all events)")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--cursor", help="Cursor printed after the previous page")
+    search.add_argument("--archived", action="store_true", help="Search archived past events instead")
+    search.set_defaults(handler=cmd_search)
+
+    list_events = subparsers.add_parser("list", help="List chosen fields of events matching filters")
+    list_events.add_argument("--fields", default=",".join(projections.DEFAULT_EVENT_FIELDS),
+                             help=f"Comma-separated fields of: {', '.join(projections.EVENT_FIELDS)}")
+    list_events.add_argument("--organizer", help="User ID, username or email of the organizer")
+    list_events.add_argument("--from", dest="start", metavar="YYYY-MM-DD", help="First date")
+    list_events.add_argument("--to", dest="end", metavar="YYYY-MM-DD",
+                             help="Last date; series are then listed date by date")
+    list_events.add_argument("--location", help="Exact location, ignoring case")
+    seats = list_events.add_mutually_exclusive_group()
+    seats.add_argument("--has-seats", dest="has_seats", action="store_const", const=True,
+                       help="Only events with seats left")
+    seats.add_argument("--full", dest="has_seats", action="store_const", const=False,
+                       help="Only full events")
+    list_events.set_defaults(handler=cmd_list)
+
+    register = subparsers.add_parser("register", help="Register the --as user for events")
+    register.add_argument("event_ids", nargs="+", metavar="EVENT_ID")
+    register.set_defaults(handler=cmd_register)
+
+    export = subparsers.add_parser("export", help="Export events or attendees to CSV")
+    export.add_argument("what", choices=["events", "attendees"])
+    export.add_argument("event_id", nargs="?", help="Event whose attendees to export")
+    export.add_argument("--output", help="File name inside the data directory")
+    export.set_defaults(handler=cmd_export)
+
+    stats = subparsers.add_parser("stats", help="Show system statistics (admin)")
+    stats.set_defaults(handler=cmd_stats)
+
+    import_csv = subparsers.add_parser("import", help="Create events or users from a CSV file")
+    import_csv.add_argument("what", choices=["events", "users"])
+    import_csv.add_argument("file", help=f"CSV with columns {', '.join(EVENT_IMPORT_COLUMNS)} "
+                                         f"(events) or {', '.join(USER_IMPORT_COLUMNS)} (users)")
+    import_csv.set_defaults(handler=cmd_import)
+
+    export_changes = subparsers.add_parser(
+        "export-changes", help="Export users/events changed or deleted since a version")
+    export_changes.add_argument("--since", type=int, default=0,
+                                help="High-water mark returned by the previous export")
+    export_changes.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    export_changes.add_argument("--output", help="File name inside the data directory")
+    export_changes.set_defaults(handler=cmd_export_changes)
+
+    export_calendars = subparsers.add_parser(
+        "export-calendars", help="Write .ics feeds (all users as admin, else your own)")
+    export_calendars.add_argument("--force", action="store_true",
+                                  help="Rewrite feeds even if their content is unchanged")
+    export_calendars.set_defaults(handler=cmd_export_calendars)
+
+    archive = subparsers.add_parser("archive", help="Move past events to compressed cold storage (admin)")
+    archive.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS,
+                         help=f"Archive events that ended more than this many days ago "
+                              f"(default: {ARCHIVE_AFTER_DAYS})")
+    archive.set_defaults(handler=cmd_archive)
+
+    send = subparsers.add_parser("send-notifications", help="Deliver queued attendee notifications (admin)")
+    target = send.add_mutually_exclusive_group()
+    target.add_argument("--file", help="Append messages as JSON lines to this file in the data directory "
+                                       "instead of sending email")
+    target.add_argument("--smtp-host", default="localhost")
+    send.add_argument("--smtp-port", type=int, default=25)
+    send.add_argument("--workers", type=int, default=4)
+    send.add_argument("--batch-size", type=int, default=500)
+    send.set_defaults(handler=cmd_send_notifications)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Run one CLI command and return the process exit code"""
+    imported = time.perf_counter()
+    args = build_parser().parse_args(argv)
+    args.out = sys.stdout
+    if args.campus:
+        import tenancy
+        try:
+            args.data_dir = tenancy.tenant_directory("campuses", args.campus)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+
+    # System messages go to stderr; stdout carries only command results
+    with redirect_stdout(sys.stderr):
+        system = EventManagementSystem(data_dir=args.data_dir)
+        loaded = time.perf_counter()
+        if args.trace:
+            system.start_trace(args.trace)
+
+        if args.actor and not login_as(system, args.actor):
+            return 1
+
+        try:
+            status = args.handler(system, args)
+        finally:
+            system.stop_trace()
+
+    if args.timing:
+        finished = time.perf_counter()
+        print(f"⏱️ imports {(imported - _STARTED) * 1000:.1f} ms, "
+              f"load {(loaded - imported) * 1000:.1f} ms, "
+              f"command {(finished - loaded) * 1000:.1f} ms", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+iCalendar (.ics) feeds for the Campus Event Management System
+
+Every user gets one feed: the events they registered for (single dates of a
+series included) plus the events they created, with a series written once as
+an RRULE. Feeds are produced line by line by generators and streamed to disk,
+so memory does not grow with the size of a feed or the number of users.
+
+A bulk export keeps a signature per user, a hash of exactly the fields that
+end up in that user's feed. Feeds whose signature did not change since the
+last run are not regenerated, which keeps a nightly run over many users cheap.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+FEED_DIRECTORY = "calendars"
+SIGNATURES_FILE = "signatures.json"
+PRODUCT_ID = "-//Campus Event Management System//Events//EN"
+UID_DOMAIN = "campus-events"
+FORMAT_VERSION = "2"  # Bump when the feed layout changes to regenerate every feed
+
+MAX_LINE_OCTETS = 75
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value"""
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold(line: str) -> str:
+    """Fold a content line into 75-octet pieces, never splitting a UTF-8 character"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+
+    pieces = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # Back off to the start of a multi-byte character
+        pieces.append(encoded[start:end].decode("utf-8"))
+        start = end
+        limit = MAX_LINE_OCTETS - 1  # Continuation lines start with a space
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def _date_time(day: str, time: str) -> str:
+    """Floating local DATE-TIME value, or a DATE if the time is not HH:MM"""
+    compact_day = day.replace("-", "")
+    try:
+        return compact_day + datetime.strptime(time, "%H:%M").strftime("T%H%M%S")
+    except ValueError:
+        return compact_day
+
+
+def _start_property(name: str, value: str) -> str:
+    """DTSTART/EXDATE line with the value type the value needs"""
+    return f"{name}:{value}" if "T" in value else f"{name};VALUE=DATE:{value}"
+
+
+def _rrule(rule: Dict, time: str) -> str:
+    """RRULE line for a series' recurrence rule"""
+    parts = [f"FREQ={rule['freq'].upper()}", f"INTERVAL={rule['interval']}"]
+    if rule.get("count"):
+        parts.append(f"COUNT={rule['count']}")
+    if rule.get("until"):
+        # UNTIL takes the same value type as DTSTART
+        until = _date_time(rule["until"], time)
+        parts.append(f"UNTIL={until[:8]}T235959" if "T" in until else f"UNTIL={until}")
+    return "RRULE:" + ";".join(parts)
+
+
+def _stamp(created_at: str) -> str:
+    """DTSTAMP value; derived from the record so unchanged feeds stay byte-identical"""
+    try:
+        return datetime.fromisoformat(created_at).strftime("%Y%m%dT%H%M%S")
+    except (TypeError, ValueError):
+        return "19700101T000000"
+
+
+def iter_vevent(event) -> Iterator[str]:
+    """Content lines of one VEVENT for an event, a series or one series date"""
+    start = _date_time(event.date, event.time)
+    yield "BEGIN:VEVENT"
+    yield f"UID:{event.event_id}@{UID_DOMAIN}"
+    yield f"DTSTAMP:{_stamp(event.created_at)}"
+    yield _start_property("DTSTART", start)
+    if "T" in start:
+        yield f"DURATION:PT{event.duration_minutes}M"
+    if event.recurrence:
+        yield _rrule(event.recurrence, event.time)
+        for day in event.recurrence.get("exceptions", []):
+            yield _start_property("EXDATE", _date_time(day, event.time))
+    yield f"SUMMARY:{escape_text(event.name)}"
+    yield f"DESCRIPTION:{escape_text(event.description)}"
+    yield f"LOCATION:{escape_text(event.location)}"
+    yield "END:VEVENT"
+
+
+def iter_calendar(name: str, events: Iterable) -> Iterator[str]:
+    """Folded, CRLF-terminated lines of a VCALENDAR holding events"""
+    header = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODUCT_ID}", "CALSCALE:GREGORIAN",
+              f"X-WR-CALNAME:{escape_text(name)}"]
+    for line in header:
+        yield fold(line)
+    for event in events:
+        for line in iter_vevent(event):
+            yield fold(line)
+    yield fold("END:VCALENDAR")
+
+
+def feed_event_ids(user) -> List[str]:
+    """Events in a user's feed: registrations first, then created events"""
+    return list(dict.fromkeys(user.registered_events + user.created_events))
+
+
+def _feed_events(system, user) -> Iterator:
+    """Resolve a user's feed events, skipping any that no longer exist"""
+    for event_id in feed_event_ids(user):
+        event = system.get_event(event_id)
+        if event is not None:
+            yield event
+
+
+def _event_digest(event) -> bytes:
+    """Digest of the fields an event contributes to a feed"""
+    fields = [event.event_id, event.name, event.description, event.date, event.time,
+              event.duration_minutes, event.location, event.created_at, event.recurrence]
+    return hashlib.sha1(json.dumps(fields, sort_keys=True).encode("utf-8")).digest()
+
+
+def feed_signature(system, user, digests: Dict[str, bytes] = None) -> str:
+    """Hash of everything that ends up in a user's feed.
+
+    Event digests are memoized in digests, so a bulk export hashes each event
+    once no matter how many feeds contain it.
+    """
+    if digests is None:
+        digests = {}
+    signature = hashlib.sha1(f"{FORMAT_VERSION}\0{user.username}".encode("utf-8"))
+    for event in _feed_events(system, user):
+        digest = digests.get(event.event_id)
+        if digest is None:
+            digest = digests[event.event_id] = _event_digest(event)
+        signature.update(digest)
+    return signature.hexdigest()
+
+
+def feed_path(directory: str, user_id: str) -> str:
+    """Path of a user's .ics file"""
+    return os.path.join(directory, f"{user_id}.ics")
+
+
+def write_feed(system, user, directory: str) -> str:
+    """Stream one user's feed to <directory>/<user_id>.ics atomically; returns the path"""
+    os.makedirs(directory, exist_ok=True)
+    path = feed_path(directory, user.user_id)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(iter_calendar(f"{user.username} - Campus Events", _feed_events(system, user)))
+    os.replace(temp_path, path)
+    return path
+
+
+def _load_signatures(directory: str) -> Dict[str, str]:
+    """Signatures saved by the previous bulk export"""
+    try:
+        with open(os.path.join(directory, SIGNATURES_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_signatures(directory: str, signatures: Dict[str, str]):
+    """Save signatures atomically"""
+    path = os.path.join(directory, SIGNATURES_FILE)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(signatures, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def export_feeds(system, directory: str, users: Iterable = None, force: bool = False) -> Dict[str, int]:
+    """Write the feeds of users (default: everyone) whose content changed since the last run.
+    Returns counts of written, skipped (unchanged) and removed feeds."""
+    os.makedirs(directory, exist_ok=True)
+    previous = _load_signatures(directory)
+    full_run = users is None
+    signatures = {} if full_run else dict(previous)
+    digests: Dict[str, bytes] = {}
+    written = skipped = removed = 0
+
+    for user in (system.users.values() if full_run else users):
+        signature = feed_signature(system, user, digests)
+        signatures[user.user_id] = signature
+        if not force and previous.get(user.user_id) == signature \
+                and os.path.exists(feed_path(directory, user.user_id)):
+            skipped += 1
+            continue
+        write_feed(system, user, directory)
+        written += 1
+
+    if full_run:
+        # Feeds of users that no longer exist
+        for user_id in previous.keys() - signatures.keys():
+            if os.path.exists(feed_path(directory, user_id)):
+                os.remove(feed_path(directory, user_id))
+                removed += 1
+
+    _save_signatures(directory, signatures)
+    return {"written": written, "skipped": skipped, "removed": removed}
@@ -0,0 +1,242 @@
+"""
+Attendee notifications through a transactional outbox: jobs are saved with
+the change that queued them and delivered in batches by a NotificationDispatcher
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+JOB_SUFFIX = ".json"
+STAGED_SUFFIX = ".staged"
+CLAIMED_SUFFIX = ".claimed"
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_WORKERS = 4
+MAX_ATTEMPTS = 5
+STALE_CLAIM_SECONDS = 600  # A claim this old belonged to a worker that died
+
+
+class Outbox:
+    """Directory of queued notification jobs, one JSON file each"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, job_id: str, suffix: str = JOB_SUFFIX) -> str:
+        return os.path.join(self.directory, f"{job_id}{suffix}")
+
+    def _write(self, path: str, job: Dict):
+        """Write a job file atomically"""
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+
+    def stage(self, job: Dict):
+        """Write a job that is not delivered until it is published"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._write(self._path(job["id"], JOB_SUFFIX + STAGED_SUFFIX), job)
+
+    def publish(self, job_id: str):
+        """Queue a staged job for delivery"""
+        os.replace(self._path(job_id, JOB_SUFFIX + STAGED_SUFFIX), self._path(job_id))
+
+    def discard(self, job_id: str):
+        """Forget a staged job"""
+        try:
+            os.remove(self._path(job_id, JOB_SUFFIX + STAGED_SUFFIX))
+        except FileNotFoundError:
+            pass
+
+    def pending(self) -> List[str]:
+        """IDs of queued, unclaimed jobs, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(JOB_SUFFIX)] for name in os.listdir(self.directory)
+                      if name.endswith(JOB_SUFFIX))
+
+    def claim(self, job_id: str) -> Optional[Dict]:
+        """Take a job for delivery; None if another worker took it first"""
+        claimed = self._path(job_id, JOB_SUFFIX + CLAIMED_SUFFIX)
+        try:
+            os.rename(self._path(job_id), claimed)
+        except FileNotFoundError:
+            return None
+        os.utime(claimed)  # The claim's age is measured from now
+        with open(claimed, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def complete(self, job: Dict):
+        """Forget a delivered job"""
+        os.remove(self._path(job["id"], JOB_SUFFIX + CLAIMED_SUFFIX))
+
+    def release(self, job: Dict):
+        """Put a claimed job back, with its remaining recipients, for another attempt"""
+        self._write(self._path(job["id"]), job)
+        os.remove(self._path(job["id"], JOB_SUFFIX + CLAIMED_SUFFIX))
+
+    def fail(self, job: Dict):
+        """Set a job aside after too many attempts"""
+        failed_directory = os.path.join(self.directory, "failed")
+        os.makedirs(failed_directory, exist_ok=True)
+        self._write(os.path.join(failed_directory, f"{job['id']}{JOB_SUFFIX}"), job)
+        os.remove(self._path(job["id"], JOB_SUFFIX + CLAIMED_SUFFIX))
+
+    def release_stale_claims(self, max_age: float = STALE_CLAIM_SECONDS) -> int:
+        """Requeue jobs claimed by workers that stopped before finishing them"""
+        if not os.path.isdir(self.directory):
+            return 0
+        released = 0
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(JOB_SUFFIX + CLAIMED_SUFFIX) and now - os.path.getmtime(path) > max_age:
+                try:
+                    os.rename(path, path[:-len(CLAIMED_SUFFIX)])
+                    released += 1
+                except FileNotFoundError:
+                    pass
+        return released
+
+
+def render(job: Dict, email: str, user_id: str) -> Dict:
+    """The message one recipient gets for a job"""
+    event = job["event"]
+    if job["kind"] == "event.updated":
+        subject = f"Update: {event['name']}"
+        body = (f"'{event['name']}' has changed. It now takes place on {event['date']} "
+                f"at {event['time']} in {event['location']}.")
+    else:
+        subject = f"Cancelled: {event['name']}"
+        body = f"'{event['name']}' on {event['date']} at {event['time']} has been cancelled."
+    return {"to": email, "user_id": user_id, "event_id": job["event_id"], "kind": job["kind"],
+            "subject": subject, "body": body}
+
+
+class FileSender:
+    """Append messages as JSON lines to a local file, for development and tests"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send_batch(self, messages: List[Dict]):
+        lines = "".join(json.dumps(message, ensure_ascii=False) + "\n" for message in messages)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+
+class SMTPSender:
+    """Send messages as email, one SMTP connection per batch"""
+
+    def __init__(self, host: str = "localhost", port: int = 25,
+                 sender: str = "events@campus.example", smtp_factory=None):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.smtp_factory = smtp_factory  # smtplib.SMTP unless a stub is given
+
+    def send_batch(self, messages: List[Dict]):
+        from email.message import EmailMessage
+        factory = self.smtp_factory
+        if factory is None:
+            import smtplib  # Only needed when mail is actually sent
+            factory = smtplib.SMTP
+        with factory(self.host, self.port) as smtp:
+            for message in messages:
+                email = EmailMessage()
+                email["From"] = self.sender
+                email["To"] = message["to"]
+                email["Subject"] = message["subject"]
+                email.set_content(message["body"])
+                smtp.send_message(email)
+
+
+class NotificationDispatcher:
+    """Deliver queued jobs in batches on a thread pool"""
+
+    def __init__(self, system, sender, workers: int = DEFAULT_WORKERS,
+                 batch_size: int = DEFAULT_BATCH_SIZE, executor=None):
+        self.system = system
+        self.sender = sender
+        self.batch_size = batch_size
+        self._owns_executor = executor is None
+        if executor is None:
+            # Imported here: the system imports this module for Outbox on every start
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notifications")
+        self._executor = executor
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _batches(self, recipients: List[str]) -> Iterable[List[str]]:
+        for start in range(0, len(recipients), self.batch_size):
+            yield recipients[start:start + self.batch_size]
+
+    def _deliver(self, job: Dict, user_ids: List[str]) -> Dict[str, int]:
+        """Render and send one batch; recipients without an email address are skipped"""
+        users = self.system.users
+        messages = []
+        for user_id in user_ids:
+            user = users.get(user_id)
+            if user is not None and user.email:
+                messages.append(render(job, user.email, user_id))
+        if messages:
+            self.sender.send_batch(messages)
+        return {"sent": len(messages), "skipped": len(user_ids) - len(messages)}
+
+    def run_once(self) -> Dict[str, int]:
+        """Deliver every queued job; returns counts of jobs, sent, skipped and failed messages"""
+        outbox = self.system.outbox
+        totals = {"jobs": 0, "sent": 0, "skipped": 0, "failed": 0}
+        for job_id in outbox.pending():
+            job = outbox.claim(job_id)
+            if job is None:
+                continue
+            totals["jobs"] += 1
+
+            futures = [(batch, self._executor.submit(self._deliver, job, batch))
+                       for batch in self._batches(job["recipients"])]
+            remaining = []
+            for batch, future in futures:
+                try:
+                    counts = future.result()
+                except Exception as e:
+                    remaining.extend(batch)
+                    job["last_error"] = str(e)
+                    continue
+                totals["sent"] += counts["sent"]
+                totals["skipped"] += counts["skipped"]
+
+            if not remaining:
+                outbox.complete(job)
+                continue
+            totals["failed"] += len(remaining)
+            job["recipients"] = remaining
+            job["attempts"] = job.get("attempts", 0) + 1
+            if job["attempts"] >= MAX_ATTEMPTS:
+                outbox.fail(job)
+            else:
+                outbox.release(job)
+        return totals
+
+    def start(self, interval: float = 1.0):
+        """Drain the outbox every interval seconds on a background thread"""
+        def loop():
+            while not self._stop.is_set():
+                self.run_once()
+                self._stop.wait(interval)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="notification-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and, if it is our own, the thread pool"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,122 @@
+"""
+Projected rows (named tuples of just the fields asked for) for listing screens and exports
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import recurrence
+
+DEFAULT_EVENT_FIELDS = ("event_id", "name", "date", "attendance")
+DEFAULT_USER_FIELDS = ("user_id", "username", "role", "email")
+
+Getter = Union[str, Callable]
+
+
+def seats_left(event, day: Optional[str] = None) -> int:
+    """Seats neither registered for nor held"""
+    if day is None:
+        taken = len(event.attendees) + event.held_seats
+    else:
+        taken = len(event.occurrence_attendees.get(day, ())) + event.occurrence_held_seats.get(day, 0)
+    return max(0, event.max_capacity - taken)
+
+
+def _attendance(event) -> int:
+    return event.get_attendance_count() if event.occurrence_attendees else len(event.attendees)
+
+
+def _date_attendance(event, day: str) -> int:
+    return len(event.occurrence_attendees.get(day, ()))
+
+
+# Field name -> (getter of an event, getter of the date day of a series event).
+# A string names a stored attribute; a projection reads all of those with one attrgetter.
+EVENT_FIELDS: Dict[str, Tuple[Getter, Getter]] = {
+    "event_id": ("event_id", lambda event, day: recurrence.occurrence_id(event.event_id, day)),
+    "series_id": (lambda event: None, "event_id"),
+    "name": ("name", "name"),
+    "description": ("description", "description"),
+    "date": ("date", lambda event, day: day),
+    "time": ("time", "time"),
+    "duration_minutes": ("duration_minutes", "duration_minutes"),
+    "location": ("location", "location"),
+    "max_capacity": ("max_capacity", "max_capacity"),
+    "organizer_id": ("organizer_id", "organizer_id"),
+    "created_at": ("created_at", "created_at"),
+    "version": ("version", "version"),
+    "attendance": (_attendance, _date_attendance),
+    "seats_left": (seats_left, seats_left),
+}
+
+# Field name -> getter of a user
+USER_FIELDS: Dict[str, Getter] = {
+    "user_id": "user_id",
+    "username": "username",
+    "role": "role.value",
+    "email": "email",
+    "created_count": lambda user: len(user.created_events),
+    "registered_count": lambda user: len(user.registered_events),
+}
+
+
+def _check_fields(fields: Tuple[str, ...], known: Dict):
+    if not fields:
+        raise ValueError("No fields requested")
+    unknown = [field for field in fields if field not in known]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(known)}")
+    if len(set(fields)) != len(fields):
+        raise ValueError("A field is requested more than once")
+
+
+def _builder(row_type, getters: List[Getter]) -> Callable:
+    """build(record, *args) returning a row_type: stored attributes are read
+    with one attrgetter, computed fields with getter(record, *args)"""
+    new = tuple.__new__
+    names = [getter for getter in getters if isinstance(getter, str)]
+    computed = [(index, getter) for index, getter in enumerate(getters) if not isinstance(getter, str)]
+    if len(names) == 1:
+        stored = lambda record, get=attrgetter(names[0]): (get(record),)
+    else:
+        stored = attrgetter(*names) if names else lambda record: ()
+
+    if not computed:
+        return lambda record, *args: new(row_type, stored(record))
+    if len(computed) == 1 and computed[0][0] == len(names):  # One computed field, last
+        last = computed[0][1]
+        return lambda record, *args: new(row_type, stored(record) + (last(record, *args),))
+
+    def build(record, *args):
+        values = list(stored(record))
+        for index, getter in computed:
+            values.insert(index, getter(record, *args))
+        return new(row_type, values)
+    return build
+
+
+@lru_cache(maxsize=None)
+def _event_projection(fields: Tuple[str, ...]) -> Callable:
+    _check_fields(fields, EVENT_FIELDS)
+    row_type = namedtuple("EventRow", fields)
+    plain = _builder(row_type, [EVENT_FIELDS[field][0] for field in fields])
+    dated = _builder(row_type, [EVENT_FIELDS[field][1] for field in fields])
+    return lambda event, day=None: plain(event) if day is None else dated(event, day)
+
+
+@lru_cache(maxsize=None)
+def _user_projection(fields: Tuple[str, ...]) -> Callable:
+    _check_fields(fields, USER_FIELDS)
+    return _builder(namedtuple("UserRow", fields), [USER_FIELDS[field] for field in fields])
+
+
+def event_projection(fields: Iterable[str]) -> Callable:
+    """project(event, day=None) returning a named tuple of fields; ValueError for unknown fields"""
+    return _event_projection(tuple(fields))
+
+
+def user_projection(fields: Iterable[str]) -> Callable:
+    """project(user) returning a named tuple of fields; ValueError for unknown fields"""
+    return _user_projection(tuple(fields))
@@ -0,0 +1,54 @@
+"""
+Bounded LRU cache for query results of the Campus Event Management System
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+
+class QueryCache:
+    """LRU cache whose entries are only valid for the data generation they were computed at"""
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, object]]" = OrderedDict()
+
+    def get(self, key: Hashable, generation: int) -> Tuple[bool, object]:
+        """Return (found, value) for key if it was cached at this generation"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == generation:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+        if entry is not None:
+            # Computed before the last mutation; drop it
+            del self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key: Hashable, generation: int, value: object):
+        """Cache value for key, evicting the least recently used entry if full"""
+        if self.capacity <= 0:
+            return
+        self._entries[key] = (generation, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "capacity": self.capacity
+        }
@@ -0,0 +1,111 @@
+"""
+"Also registered for" recommendations from co-attendance
+
+A sparse, symmetric event x event matrix counts how many users registered
+for both events of every pair. Only non-zero cells are stored, as one dict
+per event. Dates of a recurring series count as the series itself.
+
+The matrix is built once from users' registered_events; each user with k
+registrations contributes k * (k - 1) cells, so the cost grows with the
+registrations per user, not with the number of events squared. After that it
+is kept current one registration at a time: registering for an event touches
+only the row pairs between that event and the user's other events.
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from recurrence import split_occurrence_id
+
+
+def recommendation_key(event_id: str) -> str:
+    """Matrix key of an event ID: dates of a series map to the series"""
+    parts = split_occurrence_id(event_id)
+    return parts[0] if parts else event_id
+
+
+def _keys(event_ids: Iterable[str]) -> Set[str]:
+    """Distinct matrix keys of a user's registrations"""
+    return {recommendation_key(event_id) for event_id in event_ids}
+
+
+class CoAttendanceMatrix:
+    """Sparse co-registration counts between events"""
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def build(cls, registrations: Iterable[Iterable[str]]) -> 'CoAttendanceMatrix':
+        """Build from every user's registered event IDs"""
+        matrix = cls()
+        rows = matrix._rows
+        for event_ids in registrations:
+            keys = _keys(event_ids)
+            if len(keys) < 2:
+                continue
+            for key in keys:
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = {}
+                for other in keys:
+                    if other != key:
+                        row[other] = row.get(other, 0) + 1
+        return matrix
+
+    def _bump(self, key: str, others: Set[str], delta: int):
+        """Add delta to the cells between key and every other key, both directions"""
+        row = self._rows.setdefault(key, {})
+        for other in others:
+            other_row = self._rows.setdefault(other, {})
+            count = row.get(other, 0) + delta
+            if count > 0:
+                row[other] = other_row[key] = count
+            else:
+                row.pop(other, None)
+                other_row.pop(key, None)
+                if not other_row:
+                    del self._rows[other]
+        if not row:
+            del self._rows[key]
+
+    def add_registration(self, other_event_ids: Iterable[str], event_id: str):
+        """A user registered for event_id; other_event_ids are their registrations before it"""
+        key = recommendation_key(event_id)
+        others = _keys(other_event_ids)
+        if key in others:
+            return  # Another date of the same series already counted
+        self._bump(key, others, 1)
+
+    def remove_registration(self, other_event_ids: Iterable[str], event_id: str):
+        """A user unregistered from event_id; other_event_ids are their remaining registrations"""
+        key = recommendation_key(event_id)
+        others = _keys(other_event_ids)
+        if key in others:
+            return  # Still registered for another date of the series
+        self._bump(key, others, -1)
+
+    def remove_event(self, event_id: str):
+        """Drop an event's row and column"""
+        key = recommendation_key(event_id)
+        for other in self._rows.pop(key, {}):
+            other_row = self._rows[other]
+            other_row.pop(key, None)
+            if not other_row:
+                del self._rows[other]
+
+    def count(self, event_id: str, other_event_id: str) -> int:
+        """Number of users registered for both events"""
+        return self._rows.get(recommendation_key(event_id), {}).get(
+            recommendation_key(other_event_id), 0)
+
+    def top(self, event_id: str, limit: int, exclude: Optional[Set[str]] = None) -> List[Tuple[str, int]]:
+        """Most co-registered events for event_id as (event key, shared users), best first"""
+        row = self._rows.get(recommendation_key(event_id), {})
+        candidates = row.items() if not exclude else (
+            (other, count) for other, count in row.items() if other not in exclude)
+        return heapq.nsmallest(limit, candidates, key=lambda item: (-item[1], item[0]))
+
+    def __len__(self) -> int:
+        """Number of non-zero cells"""
+        return sum(len(row) for row in self._rows.values())
@@ -0,0 +1,138 @@
+"""
+Recurrence rules for event series in the Campus Event Management System
+
+A series is stored once, as an Event with a rule such as
+
+    {"freq": "weekly", "interval": 1, "until": "2026-06-30", "exceptions": ["2025-12-25"]}
+
+and its occurrences are computed from the rule when they are asked for.
+Occurrence dates are ISO strings (YYYY-MM-DD), and an occurrence is addressed
+as "<series event ID>@<date>", e.g. "event_7@2025-03-04".
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+
+FREQUENCIES = ("weekly", "monthly")
+OCCURRENCE_SEPARATOR = "@"
+
+
+def occurrence_id(series_id: str, day: str) -> str:
+    """ID of one occurrence of a series"""
+    return f"{series_id}{OCCURRENCE_SEPARATOR}{day}"
+
+
+def split_occurrence_id(event_id: str) -> Optional[Tuple[str, str]]:
+    """Split an occurrence ID into (series ID, date); None for a plain event ID"""
+    series_id, separator, day = event_id.partition(OCCURRENCE_SEPARATOR)
+    if not separator or not series_id or not day:
+        return None
+    return series_id, day
+
+
+def _parse(day: str, field: str) -> date:
+    """Parse an ISO date, naming the rule field in the error"""
+    try:
+        return date.fromisoformat(day)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field} date '{day}'. Use YYYY-MM-DD.")
+
+
+def normalize_rule(rule: Dict, start: str) -> Dict:
+    """Validate a recurrence rule for a series starting on start; raises ValueError"""
+    freq = rule.get("freq")
+    if freq not in FREQUENCIES:
+        raise ValueError("Recurrence must be 'weekly' or 'monthly'.")
+
+    interval = rule.get("interval", 1)
+    if not isinstance(interval, int) or interval < 1:
+        raise ValueError("Recurrence interval must be a whole number of at least 1.")
+
+    count = rule.get("count")
+    if count is not None and (not isinstance(count, int) or count < 1):
+        raise ValueError("Recurrence count must be a whole number of at least 1.")
+
+    until = rule.get("until")
+    if until is not None and _parse(until, "until") < _parse(start, "start"):
+        raise ValueError("Recurrence end date is before the first occurrence.")
+
+    exceptions = sorted({_parse(day, "exception").isoformat() for day in rule.get("exceptions", [])})
+    return {"freq": freq, "interval": interval, "count": count, "until": until,
+            "exceptions": exceptions}
+
+
+def _nth(start: date, rule: Dict, n: int) -> Optional[date]:
+    """Date of the n-th period of a series, or None if that month lacks the day"""
+    if rule["freq"] == "weekly":
+        return start + timedelta(weeks=n * rule["interval"])
+
+    months = start.month - 1 + n * rule["interval"]
+    try:
+        return start.replace(year=start.year + months // 12, month=months % 12 + 1)
+    except ValueError:  # e.g. the 31st in a 30-day month; that month is skipped
+        return None
+
+
+def _first_period_on_or_after(start: date, rule: Dict, day: date) -> int:
+    """Index of the first period whose date is on or after day, computed directly"""
+    if day <= start:
+        return 0
+    if rule["freq"] == "weekly":
+        step = 7 * rule["interval"]
+        return -(-(day - start).days // step)
+
+    # The period in day's month may still fall before day; the caller skips it
+    months = (day.year - start.year) * 12 + day.month - start.month
+    return months // rule["interval"]
+
+
+def occurrence_dates(start: str, rule: Dict, window_start: Optional[str] = None,
+                     window_end: Optional[str] = None) -> Iterator[str]:
+    """Yield the series' occurrence dates within [window_start, window_end], in order.
+
+    Periods before the window are skipped arithmetically, so asking for one
+    month of a multi-year series only generates that month's dates. A rule's
+    count limits the number of periods (a skipped month still counts).
+    """
+    first = _parse(start, "start")
+    lower = _parse(window_start, "window") if window_start else first
+    upper = _parse(window_end, "window") if window_end else None
+    until = date.fromisoformat(rule["until"]) if rule.get("until") else None
+    if until is not None and (upper is None or until < upper):
+        upper = until
+    count = rule.get("count")
+    exceptions = set(rule.get("exceptions", []))
+
+    n = _first_period_on_or_after(first, rule, lower)
+    while count is None or n < count:
+        day = _nth(first, rule, n)
+        n += 1
+        if day is None or day < lower:
+            continue
+        if upper is not None and day > upper:
+            return
+        iso_day = day.isoformat()
+        if iso_day not in exceptions:
+            yield iso_day
+
+
+def is_occurrence(start: str, rule: Dict, day: str) -> bool:
+    """Whether day is a (non-cancelled) occurrence of the series"""
+    try:
+        _parse(day, "occurrence")
+    except ValueError:
+        return False
+    return next(occurrence_dates(start, rule, day, day), None) == day
+
+
+def describe(rule: Dict) -> str:
+    """Human-readable summary of a rule, e.g. 'every 2 weeks until 2026-06-30'"""
+    unit = "week" if rule["freq"] == "weekly" else "month"
+    text = f"every {unit}" if rule["interval"] == 1 else f"every {rule['interval']} {unit}s"
+    if rule.get("until"):
+        text += f" until {rule['until']}"
+    if rule.get("count"):
+        text += f", {rule['count']} times"
+    if rule.get("exceptions"):
+        text += f" (except {', '.join(rule['exceptions'])})"
+    return text
@@ -0,0 +1,195 @@
+"""
+Memory-mapped binary rosters for very large events
+
+An event whose attendee list grows past a threshold keeps it in a sidecar
+file instead of events.json: the attendees' numeric IDs ("user_N" -> N) as a
+sorted array of native-endian uint32 values, memory-mapped on access. A
+RosterList puts a list-like face on the mapped file plus a small in-memory
+delta of registrations made since the last save:
+
+- len() is arithmetic, and `user_id in roster` is a binary search over the
+  mapping, so neither turns the roster into Python objects;
+- iteration (and therefore exports) streams IDs in ascending order straight
+  from the mapped buffer merged with the delta;
+- saving writes a new sorted file only for rosters that changed.
+
+The store closes the roster mapping a file before replacing or deleting it,
+so no mapping or file descriptor outlives its file (and Windows, which
+refuses to replace a mapped file, can save).
+"""
+
+import mmap
+import os
+from array import array
+from bisect import bisect_left, insort
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+USER_ID_PREFIX = "user_"
+SUFFIX = ".u32"
+ITEM_FORMAT = "I"
+if array(ITEM_FORMAT).itemsize != 4:  # pragma: no cover - 'I' is 4 bytes on supported platforms
+    ITEM_FORMAT = "L"
+
+
+def user_number(user_id: str) -> Optional[int]:
+    """Numeric part of a "user_N" ID, or None if the ID has another shape"""
+    if not user_id.startswith(USER_ID_PREFIX):
+        return None
+    digits = user_id[len(USER_ID_PREFIX):]
+    if not digits.isdigit() or digits.startswith("0") or int(digits) >= 2 ** 32:
+        return None
+    return int(digits)
+
+
+def can_store(attendees: Iterable[str]) -> bool:
+    """Whether every attendee ID fits the binary roster format"""
+    return all(user_number(user_id) is not None for user_id in attendees)
+
+
+def _number_or_error(user_id: str) -> int:
+    """Numeric part of a user ID; ValueError (as list.remove raises) if it has none"""
+    number = user_number(user_id)
+    if number is None:
+        raise ValueError(f"{user_id!r} cannot be stored in a binary roster")
+    return number
+
+
+class RosterList:
+    """Sorted attendee IDs backed by a memory-mapped file plus an unsaved delta"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._file = None
+        self._mapping = None
+        self._base = memoryview(array(ITEM_FORMAT))  # Empty until a file is mapped
+        if path is not None and os.path.getsize(path):
+            self._file = open(path, "rb")
+            self._mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._base = memoryview(self._mapping).cast(ITEM_FORMAT)
+        self._added: List[int] = []  # Sorted; never present in the base
+        self._removed: Set[int] = set()  # Subset of the base
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are registrations not written to the file yet"""
+        return bool(self._added or self._removed)
+
+    def _in_base(self, number: int) -> bool:
+        """Binary search of the mapped file"""
+        position = bisect_left(self._base, number)
+        return position < len(self._base) and self._base[position] == number
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._added) - len(self._removed)
+
+    def __contains__(self, user_id) -> bool:
+        number = user_number(user_id) if isinstance(user_id, str) else None
+        if number is None:
+            return False
+        if number in self._removed:
+            return False
+        position = bisect_left(self._added, number)
+        if position < len(self._added) and self._added[position] == number:
+            return True
+        return self._in_base(number)
+
+    def numbers(self) -> Iterator[int]:
+        """User numbers in ascending order, merged from the file and the delta"""
+        base = iter(self._base)
+        if self._removed:
+            removed = self._removed
+            base = (number for number in base if number not in removed)
+        return merge(base, self._added) if self._added else base
+
+    def __iter__(self) -> Iterator[str]:
+        return (f"{USER_ID_PREFIX}{number}" for number in self.numbers())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, RosterList)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RosterList({len(self)} attendees, path={self.path!r})"
+
+    def append(self, user_id: str):
+        """Add an attendee (kept in the delta until the next save)"""
+        number = _number_or_error(user_id)
+        if number in self._removed:
+            self._removed.discard(number)
+        elif not self._in_base(number):
+            insort(self._added, number)
+        else:
+            raise ValueError(f"{user_id!r} is already in the roster")
+
+    def remove(self, user_id: str):
+        """Remove an attendee; ValueError if absent, like list.remove"""
+        number = _number_or_error(user_id)
+        position = bisect_left(self._added, number)
+        if position < len(self._added) and self._added[position] == number:
+            del self._added[position]
+        elif self._in_base(number) and number not in self._removed:
+            self._removed.add(number)
+        else:
+            raise ValueError(f"{user_id!r} is not in the roster")
+
+    def close(self):
+        """Unmap the file"""
+        self._base.release()
+        self._base = memoryview(array(ITEM_FORMAT))
+        if self._mapping is not None:
+            self._mapping.close()
+            self._file.close()
+            self._mapping = self._file = None
+
+
+class RosterStore:
+    """Directory of roster sidecar files, one per large event"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._mapped: Dict[str, RosterList] = {}  # Event ID -> roster mapping its file
+
+    @staticmethod
+    def file_name(event_id: str) -> str:
+        """Sidecar file name of an event's roster"""
+        return f"{event_id}{SUFFIX}"
+
+    def open(self, event_id: str) -> RosterList:
+        """Map an event's saved roster, closing the roster that mapped it before"""
+        self._unmap(event_id)
+        path = os.path.join(self.directory, self.file_name(event_id))
+        roster = self._mapped[event_id] = RosterList(path)
+        return roster
+
+    def _unmap(self, event_id: str):
+        """Close the roster mapping an event's file, if any"""
+        roster = self._mapped.pop(event_id, None)
+        if roster is not None:
+            roster.close()
+
+    def write(self, event_id: str, attendees: Iterable[str]) -> RosterList:
+        """Write attendees as a sorted uint32 file (atomically) and return it mapped"""
+        if isinstance(attendees, RosterList):
+            numbers = array(ITEM_FORMAT, attendees.numbers())  # Already sorted
+        else:
+            numbers = array(ITEM_FORMAT, sorted(map(_number_or_error, attendees)))
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, self.file_name(event_id))
+        with open(f"{path}.tmp", "wb") as f:
+            numbers.tofile(f)
+        self._unmap(event_id)
+        os.replace(f"{path}.tmp", path)
+        return self.open(event_id)
+
+    def remove_unreferenced(self, event_ids: Set[str]):
+        """Delete sidecars of events that no longer have a roster"""
+        for event_id in [event_id for event_id in self._mapped if event_id not in event_ids]:
+            self._unmap(event_id)
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(SUFFIX) and name[:-len(SUFFIX)] not in event_ids:
+                os.remove(os.path.join(self.directory, name))
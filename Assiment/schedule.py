@@ -0,0 +1,100 @@
+"""
+Personal schedule conflicts for the Campus Event Management System
+
+An event occupies [start, start + duration) in whole minutes since 0001-01-01,
+so intervals compare as plain integers. Events whose date or time cannot be
+parsed occupy no time and never clash.
+
+Each user's schedule is a list of (start, end, event_id) sorted by start
+that also remembers its longest duration. Registrations are checked before
+they are added, but an event moved after people registered (or data saved
+before checks existed) can still leave a schedule with overlaps, so a new
+interval is checked against every interval starting before it ends and no
+more than the longest duration before it starts, not only its neighbours.
+The audit sweeps every
+user's registrations once in start order, keeping a heap of the intervals
+still running.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Interval = Tuple[int, int, str]  # (start minute, end minute, event_id)
+
+
+def event_interval(event) -> Optional[Interval]:
+    """Minutes occupied by an event (or one date of a series); None if unscheduled"""
+    try:
+        start = datetime.strptime(f"{event.date} {event.time}", "%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        return None
+    start_minute = start.toordinal() * 1440 + start.hour * 60 + start.minute
+    return start_minute, start_minute + max(1, event.duration_minutes), event.event_id
+
+
+class Schedule(list):
+    """Intervals sorted by start, with the longest duration among them"""
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        super().__init__(sorted(intervals))
+        self.longest = max((end - start for start, end, _ in self), default=0)
+
+
+def build_schedule(events: Iterable) -> Schedule:
+    """Schedule of the scheduled events among events"""
+    return Schedule(interval for interval in map(event_interval, events) if interval is not None)
+
+
+def find_clash(schedule: Schedule, interval: Interval) -> Optional[str]:
+    """ID of a scheduled event overlapping interval. Only intervals starting
+    within the longest duration before interval are looked at, so a check
+    costs O(log n) plus the intervals in that window."""
+    start, end, event_id = interval
+    # Intervals from the one starting last before end; an earlier, longer one
+    # may still be running when a later one has finished
+    earliest = start - schedule.longest
+    for index in range(bisect_left(schedule, (end,)) - 1, -1, -1):
+        other_start, other_end, other_id = schedule[index]
+        if other_start <= earliest:
+            break  # This and every earlier interval ended by start
+        if other_end > start and other_id != event_id:
+            return other_id
+    return None
+
+
+def add_interval(schedule: Schedule, interval: Interval):
+    """Insert an interval keeping the schedule sorted"""
+    insort(schedule, interval)
+    schedule.longest = max(schedule.longest, interval[1] - interval[0])
+
+
+def remove_event(schedule: Schedule, event_id: str):
+    """Remove an event's interval from a schedule"""
+    schedule[:] = [interval for interval in schedule if interval[2] != event_id]
+    schedule.longest = max((end - start for start, end, _ in schedule), default=0)
+
+
+def sweep_conflicts(schedule: List[Interval]) -> List[Tuple[str, str]]:
+    """Every overlapping pair in a sorted schedule, in one pass.
+    Cost is O(n log n + conflicts) rather than O(n^2)."""
+    conflicts = []
+    running: List[Tuple[int, str]] = []  # (end, event_id) of intervals not finished yet
+    for start, end, event_id in schedule:
+        while running and running[0][0] <= start:
+            heapq.heappop(running)
+        for _, other_id in running:
+            conflicts.append((other_id, event_id))
+        heapq.heappush(running, (end, event_id))
+    return conflicts
+
+
+def audit(schedules: Dict[str, List[Interval]]) -> Dict[str, List[Tuple[str, str]]]:
+    """Conflicting event pairs per user, for users that have any"""
+    report = {}
+    for user_id, schedule in schedules.items():
+        conflicts = sweep_conflicts(schedule)
+        if conflicts:
+            report[user_id] = conflicts
+    return report
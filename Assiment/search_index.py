@@ -0,0 +1,288 @@
+"""
+In-memory text indexes used by the Campus Event Management System
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized (lower-case) word tokens"""
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+
+def trigrams(token: str) -> Set[str]:
+    """Character trigrams of a token, padded so short tokens still have some"""
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Levenshtein distance between a and b, or max_distance + 1 once it is
+    known to exceed max_distance (only a diagonal band is computed)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    too_far = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        if low == 1:
+            current[0] = i
+        row_best = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost, too_far)
+            row_best = min(row_best, current[j])
+        if row_best > max_distance:
+            return too_far
+        previous = current
+    return min(previous[len(b)], too_far)
+
+
+def default_max_distance(token: str) -> int:
+    """Typos tolerated for a query word of this length"""
+    if len(token) <= 2:
+        return 0
+    if len(token) <= 5:
+        return 1
+    return 2
+
+
+class PrefixIndex:
+    """Sorted token index answering "which documents have a token starting with ..." queries"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._tokens: List[str] = []  # Sorted distinct tokens
+
+    def add(self, doc_id: str, text: str):
+        """Index every token of text under doc_id"""
+        for token in set(tokenize(text)):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                insort(self._tokens, token)
+            postings.add(doc_id)
+
+    def remove(self, doc_id: str, text: str):
+        """Remove doc_id from every token of text"""
+        for token in set(tokenize(text)):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def tokens_with_prefix(self, prefix: str) -> List[str]:
+        """Return the indexed tokens starting with prefix, in sorted order"""
+        start = bisect_left(self._tokens, prefix)
+        end = start
+        while end < len(self._tokens) and self._tokens[end].startswith(prefix):
+            end += 1
+        return self._tokens[start:end]
+
+    def match(self, query: str) -> Set[str]:
+        """Documents containing every complete word of query plus a token
+        starting with its last (possibly partial) word"""
+        tokens = tokenize(query)
+        if not tokens:
+            return set()
+
+        *complete, prefix = tokens
+        matches: Set[str] = set()
+        for token in self.tokens_with_prefix(prefix):
+            matches |= self._postings[token]
+
+        for token in complete:
+            if not matches:
+                break
+            matches &= self._postings.get(token, set())
+        return matches
+
+
+class CompletionIndex:
+    """Autocomplete over whole texts (event names or locations), each with a
+    score summed over the documents sharing it. The best completions for a
+    one-word prefix are ranked once, when first asked for, and then kept
+    current as scores change"""
+
+    def __init__(self, size: int = 10):
+        self.size = size  # Completions kept per ranked prefix; longer requests rank afresh
+        self._scores: Dict[str, int] = {}
+        self._documents: Dict[str, int] = {}  # completion -> documents sharing it
+        self._words = PrefixIndex()  # Documents are the completions themselves
+        self._ranked: Dict[str, List[Tuple[int, str]]] = {}  # prefix -> sorted (-score, completion)
+
+    def add(self, completion: str, score: int = 0):
+        """Add a document with this text and score"""
+        if completion in self._documents:
+            self._documents[completion] += 1
+            self.change(completion, score)
+            return
+        self._documents[completion] = 1
+        self._scores[completion] = score
+        self._words.add(completion, completion)
+        for prefix in self._prefixes(completion):
+            if prefix in self._ranked:
+                self._insert(self._ranked[prefix], (-score, completion))
+
+    def remove(self, completion: str, score: int = 0):
+        """Remove a document with this text and score"""
+        if completion not in self._documents:
+            return
+        self._documents[completion] -= 1
+        if self._documents[completion]:
+            self.change(completion, -score)
+            return
+        key = (-self._scores.pop(completion), completion)
+        del self._documents[completion]
+        self._words.remove(completion, completion)
+        for prefix in self._prefixes(completion):
+            ranked = self._ranked.get(prefix)
+            if ranked is None:
+                continue
+            if len(ranked) == self.size:
+                del self._ranked[prefix]  # A completion not kept may now belong; rank afresh
+            else:
+                ranked.remove(key)
+
+    def change(self, completion: str, delta: int):
+        """Add delta to the score of a completion"""
+        if not delta or completion not in self._scores:
+            return
+        old = (-self._scores[completion], completion)
+        self._scores[completion] += delta
+        new = (-self._scores[completion], completion)
+        for prefix in self._prefixes(completion):
+            ranked = self._ranked.get(prefix)
+            if ranked is None:
+                continue
+            position = bisect_left(ranked, old)
+            if position < len(ranked) and ranked[position] == old:
+                full = len(ranked) == self.size
+                del ranked[position]
+                if full and delta < 0 and (not ranked or new > ranked[-1]):
+                    del self._ranked[prefix]  # It may have dropped below one not kept
+                    continue
+                insort(ranked, new)
+            elif delta > 0:
+                self._insert(ranked, new)
+
+    def top(self, query: str, limit: int = 10) -> List[str]:
+        """Completions containing every complete word of query plus a word
+        starting with its last one, highest score first"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        if len(tokens) > 1 or limit > self.size:
+            candidates = ((-self._scores[completion], completion) for completion in self._words.match(query))
+            return [completion for _, completion in heapq.nsmallest(limit, candidates)]
+
+        prefix = tokens[0]
+        ranked = self._ranked.get(prefix)
+        if ranked is None:
+            candidates = ((-self._scores[completion], completion) for completion in self._words.match(prefix))
+            ranked = self._ranked[prefix] = heapq.nsmallest(self.size, candidates)
+        return [completion for _, completion in ranked[:limit]]
+
+    def _prefixes(self, completion: str) -> Set[str]:
+        """Every prefix of every word of completion"""
+        return {token[:end] for token in tokenize(completion) for end in range(1, len(token) + 1)}
+
+    def _insert(self, ranked: List[Tuple[int, str]], key: Tuple[int, str]):
+        """Insert key into a ranked list if it belongs among the kept completions"""
+        if len(ranked) < self.size:
+            insort(ranked, key)
+        elif key < ranked[-1]:
+            insort(ranked, key)
+            ranked.pop()
+
+
+class TrigramIndex:
+    """Typo-tolerant word index: trigrams pick candidate words from the
+    vocabulary, which are then verified with a bounded edit distance"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, int]] = {}  # token -> {doc_id: occurrences}
+        self._trigram_tokens: Dict[str, Set[str]] = {}
+
+    def add(self, doc_id: str, text: str):
+        """Index every token of text under doc_id"""
+        for token in tokenize(text):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                for gram in trigrams(token):
+                    self._trigram_tokens.setdefault(gram, set()).add(token)
+            postings[doc_id] = postings.get(doc_id, 0) + 1
+
+    def remove(self, doc_id: str, text: str):
+        """Remove the tokens of text indexed under doc_id"""
+        for token in tokenize(text):
+            postings = self._postings.get(token)
+            if postings is None or doc_id not in postings:
+                continue
+            postings[doc_id] -= 1
+            if postings[doc_id] == 0:
+                del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+                for gram in trigrams(token):
+                    tokens = self._trigram_tokens[gram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigram_tokens[gram]
+
+    def similar_tokens(self, word: str, max_distance: Optional[int] = None) -> Dict[str, float]:
+        """Vocabulary tokens within max_distance edits of word, with a 0..1 similarity"""
+        if max_distance is None:
+            max_distance = default_max_distance(word)
+
+        grams = trigrams(word)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for token in self._trigram_tokens.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+
+        # Each edit destroys at most three trigrams, so closer tokens must
+        # share at least this many with the query word
+        required = max(1, len(grams) - 3 * max_distance)
+        similar = {}
+        for token, count in shared.items():
+            if count < required:
+                continue
+            distance = bounded_edit_distance(word, token, max_distance)
+            if distance <= max_distance:
+                similar[token] = 1.0 - distance / max(len(word), len(token))
+        return similar
+
+    def search(self, query: str, max_distance: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Documents matching every query word (allowing typos), best first"""
+        scores: Optional[Dict[str, float]] = None
+        for word in tokenize(query):
+            word_scores: Dict[str, float] = {}
+            for token, similarity in self.similar_tokens(word, max_distance).items():
+                for doc_id in self._postings[token]:
+                    if similarity > word_scores.get(doc_id, 0.0):
+                        word_scores[doc_id] = similarity
+
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {doc_id: score + word_scores[doc_id]
+                          for doc_id, score in scores.items() if doc_id in word_scores}
+            if not scores:
+                return []
+
+        return sorted((scores or {}).items(), key=lambda item: (-item[1], item[0]))
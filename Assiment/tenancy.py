@@ -0,0 +1,172 @@
+"""
+Several campuses in one process: one EventManagementSystem per campus data
+directory, loaded on first use and evicted when idle or least recently used
+"""
+
+import io
+import os
+import re
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional, Tuple
+
+from event_management_system import EventManagementSystem
+
+TENANT_NAME = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+DEFAULT_MAX_LOADED = 8
+DEFAULT_IDLE_SECONDS = 900
+
+
+def tenant_directory(root: str, tenant: str) -> str:
+    """Data directory of a tenant; ValueError for names that are not plain identifiers"""
+    if not TENANT_NAME.match(tenant):
+        raise ValueError(f"Invalid tenant name {tenant!r}: use lowercase letters, digits, '-' and '_'")
+    return os.path.join(root, tenant)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc is not available"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class TenantManager:
+    """Lazily loaded, LRU-evicted EventManagementSystem partitions, one per tenant"""
+
+    def __init__(self, root: str = "campuses", max_loaded: int = DEFAULT_MAX_LOADED,
+                 idle_seconds: float = DEFAULT_IDLE_SECONDS, workers: int = 4,
+                 exact_memory: bool = False, clock=time.monotonic):
+        self.root = root
+        self.max_loaded = max_loaded
+        self.idle_seconds = idle_seconds
+        self.exact_memory = exact_memory  # Measure loads with tracemalloc (slow) instead of the resident set
+        self.clock = clock
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tenants")
+        self._loaded: "OrderedDict[str, EventManagementSystem]" = OrderedDict()  # LRU first
+        self._last_used: Dict[str, float] = {}
+        self._metrics: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+
+    def tenants(self) -> List[str]:
+        """Names of every tenant with a data directory, loaded or not"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if TENANT_NAME.match(name) and os.path.isdir(os.path.join(self.root, name)))
+
+    def _load(self, directory: str) -> Tuple[EventManagementSystem, Dict]:
+        """Load a partition; returns it with its load time and memory"""
+        exact = self.exact_memory and not tracemalloc.is_tracing()
+        if exact:
+            tracemalloc.start()
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            with redirect_stdout(io.StringIO()):
+                system = EventManagementSystem(data_dir=directory)
+        finally:
+            load_seconds = time.perf_counter() - started
+            if exact:
+                memory_bytes = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+            else:
+                rss_after = _rss_bytes()
+                memory_bytes = (max(0, rss_after - rss_before)
+                                if rss_before is not None and rss_after is not None else None)
+
+        return system, {"load_seconds": load_seconds, "memory_bytes": memory_bytes,
+                        "users": len(system.users), "events": len(system.events)}
+
+    def get(self, tenant: str, create: bool = False) -> EventManagementSystem:
+        """A tenant's system, loaded on first use. KeyError if the tenant has no data
+        directory and create is False; ValueError for an invalid tenant name."""
+        directory = tenant_directory(self.root, tenant)
+        with self._lock:
+            self.evict_idle()
+            system = self._use(tenant)
+            if system is not None:
+                return system
+            if not create and not os.path.isdir(directory):
+                raise KeyError(tenant)
+
+        # Loaded without the lock, so a slow load does not hold up other tenants
+        system, load_metrics = self._load(directory)
+        with self._lock:
+            loaded = self._use(tenant)
+            if loaded is not None:
+                return loaded  # Another thread loaded it meanwhile; this copy is dropped
+            metrics = self._metrics.setdefault(tenant, {"loads": 0, "hits": 0, "evictions": 0})
+            metrics.update(load_metrics, loads=metrics["loads"] + 1)
+            self._loaded[tenant] = system
+            self._last_used[tenant] = self.clock()
+            while len(self._loaded) > self.max_loaded:
+                self._evict(next(iter(self._loaded)))
+            return system
+
+    def _use(self, tenant: str) -> Optional[EventManagementSystem]:
+        """A loaded tenant's system, counted as a hit and marked used; None if not loaded"""
+        system = self._loaded.get(tenant)
+        if system is not None:
+            self._loaded.move_to_end(tenant)
+            self._metrics[tenant]["hits"] += 1
+            self._last_used[tenant] = self.clock()
+        return system
+
+    def _evict(self, tenant: str):
+        system = self._loaded.pop(tenant)
+        system.stop_trace()
+        del self._last_used[tenant]
+        self._metrics[tenant]["evictions"] += 1
+
+    def evict(self, tenant: str) -> bool:
+        """Drop a loaded tenant from memory; returns whether it was loaded"""
+        with self._lock:
+            if tenant not in self._loaded:
+                return False
+            self._evict(tenant)
+            return True
+
+    def evict_idle(self) -> int:
+        """Drop tenants unused for idle_seconds; returns how many"""
+        with self._lock:
+            cutoff = self.clock() - self.idle_seconds
+            idle = [tenant for tenant in self._loaded if self._last_used[tenant] <= cutoff]
+            for tenant in idle:
+                self._evict(tenant)
+            return len(idle)
+
+    def loaded(self) -> List[str]:
+        """Loaded tenants, least recently used first"""
+        with self._lock:
+            return list(self._loaded)
+
+    def dispatcher(self, tenant: str, sender):
+        """Notification dispatcher for a tenant, running on the shared thread pool"""
+        from notifications import NotificationDispatcher
+        return NotificationDispatcher(self.get(tenant), sender, executor=self.executor)
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-tenant load time (seconds), memory added by the load (bytes, None if it
+        cannot be measured), size at load, load/hit/eviction counts and whether it is loaded"""
+        with self._lock:
+            now = self.clock()
+            report = {}
+            for tenant, metrics in self._metrics.items():
+                report[tenant] = dict(metrics, loaded=tenant in self._loaded,
+                                      idle_seconds=now - self._last_used[tenant]
+                                      if tenant in self._last_used else None)
+            return report
+
+    def shutdown(self):
+        """Evict every tenant and stop the shared thread pool"""
+        with self._lock:
+            for tenant in list(self._loaded):
+                self._evict(tenant)
+        self.executor.shutdown(wait=True)
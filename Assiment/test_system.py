@@ -6,7 +6,32 @@ This script demonstrates all major features of the system
 
 import sys
 import os
-from event_management_system import EventManagementSystem, UserRole
+import csv
+import io
+import json
+import multiprocessing
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+from event_management_system import EventManagementSystem, UserRole, User, Event
+
+_temporary_directories = []
+
+def _temporary_directory(prefix="ems_test_"):
+    """Create an empty directory that is removed when the tests finish"""
+    directory = tempfile.TemporaryDirectory(prefix=prefix)
+    _temporary_directories.append(directory)  # Kept until exit, when it cleans itself up
+    return directory.name
+
+def _fresh_system():
+    """Create a system backed by an empty temporary data directory"""
+    return EventManagementSystem(data_dir=_temporary_directory())
+
+def _system_with_students(count):
+    """Create a fresh system with an admin and students student_0 ... student_<count - 1>"""
+    system = _fresh_system()
+    admin_id = system.register_user("admin", UserRole.ADMIN)
+    student_ids = [system.register_user(f"student_{i}", UserRole.STUDENT) for i in range(count)]
+    return system, admin_id, student_ids
 
 def test_system():
     """Run comprehensive tests of the system"""
@@ -14,7 +39,7 @@ def test_system():
     print("=" * 60)
     
     # Initialize system
-    system = EventManagementSystem()
+    system = _fresh_system()
     
     # Test 1: User Registration
     print("\n📝 TEST 1: User Registration")
@@ -210,7 +235,7 @@ def demo_user_interaction():
     print("\n🎭 DEMO: User Interaction Scenarios")
     print("=" * 60)
     
-    system = EventManagementSystem()
+    system = _fresh_system()
     
     # Scenario 1: Admin creates and manages events
     print("\n👑 SCENARIO 1: Admin Workflow")
@@ -308,6 +333,1521 @@ def demo_user_interaction():
     
     print("\n🎉 Demo scenarios completed!")
 
+def test_user_indexes():
+    """Usernames and emails are unique and usable for lookups"""
+    system = _fresh_system()
+    
+    student_id = system.register_user("Alice", UserRole.STUDENT, "Alice@Campus.edu")
+    assert student_id
+    
+    # Duplicates are rejected regardless of case and surrounding spaces
+    assert system.register_user("  alice ", UserRole.VISITOR) is None
+    assert system.register_user("bob", UserRole.VISITOR, "alice@campus.EDU") is None
+    assert system.register_user("", UserRole.VISITOR) is None
+    
+    # Users without an email never clash on email
+    assert system.register_user("carol", UserRole.VISITOR)
+    assert system.register_user("dave", UserRole.VISITOR)
+    
+    assert system.find_user(student_id).username == "Alice"
+    assert system.find_user("ALICE").user_id == student_id
+    assert system.find_user("alice@campus.edu").user_id == student_id
+    assert system.find_user("nobody") is None
+    
+    assert system.login_by_username("aLiCe")
+    assert system.current_user.user_id == student_id
+    assert not system.login_by_username("nobody")
+    
+    # Indexes are rebuilt when the data is loaded again
+    reloaded = EventManagementSystem(data_dir=system.data_dir)
+    assert reloaded.find_user("alice").user_id == student_id
+    assert reloaded.register_user("ALICE", UserRole.STUDENT) is None
+    print("✅ Username and email indexes work")
+
+def test_pagination():
+    """Listings can be walked page by page with stable cursors"""
+    system, admin_id, student_ids = _system_with_students(5)
+    
+    system.login(admin_id)
+    event_ids = [system.create_event(f"Event {i}", "Weekly meetup", f"2024-06-{10 - i:02d}",
+                                     "10:00", "Hall", 50) for i in range(7)]
+    
+    def walk(fetch):
+        items, cursor = [], None
+        while True:
+            page = fetch(cursor)
+            assert len(page["items"]) <= 3
+            items.extend(page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                return items
+    
+    events = walk(lambda cursor: system.view_all_events_page(cursor, limit=3))
+    assert [event.event_id for event in events] == list(reversed(event_ids))
+    
+    # A cursor stays valid while events are added before it
+    first_page = system.view_all_events_page(limit=3)
+    system.create_event("Early Bird", "Weekly meetup", "2024-01-01", "08:00", "Hall", 5)
+    second_page = system.view_all_events_page(first_page["next_cursor"], limit=3)
+    assert second_page["items"][0].event_id == event_ids[3]
+    
+    matches = walk(lambda cursor: system.search_events_page("meetup", cursor, limit=3))
+    assert len(matches) == 8
+    assert system.search_events_page("nothing here")["items"] == []
+    
+    for student_id in student_ids:
+        system.login(student_id)
+        system.register_for_event(event_ids[0])
+        system.register_for_event(event_ids[6])
+    
+    registered = walk(lambda cursor: system.view_registered_events_page(cursor, limit=3))
+    assert [event.event_id for event in registered] == [event_ids[6], event_ids[0]]
+    
+    system.login(admin_id)
+    attendees = walk(lambda cursor: system.get_event_attendees_page(event_ids[0], cursor, limit=3))
+    assert [user.username for user in attendees] == [f"student_{i}" for i in range(5)]
+    
+    assert len(system.view_all_events_page(limit=1000)["items"]) == 8
+    assert system.view_all_events_page("not-a-cursor")["items"] == []
+    import base64
+    for shape in ([1], ["2024-01-01"], [None, "", "", ""]):
+        cursor = base64.urlsafe_b64encode(json.dumps(shape).encode()).decode()
+        assert system.view_all_events_page(cursor)["items"] == []
+        assert system.get_event_attendees_page(event_ids[0], cursor)["items"] == []
+    print("✅ Pagination works")
+
+def test_autocomplete():
+    """Prefix suggestions follow create, update and delete, ranked by attendance"""
+    system, admin_id, student_ids = _system_with_students(3)
+    
+    system.login(admin_id)
+    tech_id = system.create_event("Tech Talk", "Talk", "2024-05-01", "10:00", "Main Hall", 50)
+    fair_id = system.create_event("Technology Fair", "Fair", "2024-05-02", "10:00", "Main Hall", 50)
+    theatre_id = system.create_event("Theatre Night", "Play", "2024-05-03", "19:00", "Mainstage", 50)
+    
+    for student_id in student_ids:
+        system.login(student_id)
+        system.register_for_event(theatre_id)
+    system.login(student_ids[0])
+    system.register_for_event(tech_id)
+    
+    assert system.autocomplete_events("te") == ["Tech Talk", "Technology Fair"]
+    assert system.autocomplete_events("T") == ["Theatre Night", "Tech Talk", "Technology Fair"]
+    assert system.autocomplete_events("t", limit=1) == ["Theatre Night"]
+    assert system.autocomplete_events("tech t") == ["Tech Talk"]
+    assert system.autocomplete_events("MAIN", field="location") == ["Mainstage", "Main Hall"]
+    assert system.autocomplete_events("zzz") == []
+    
+    # Registrations after the first suggestions re-rank them
+    for student_id in student_ids[1:]:
+        system.login(student_id)
+        system.register_for_event(fair_id)
+    assert system.autocomplete_events("te") == ["Technology Fair", "Tech Talk"]
+    system.unregister_from_event(fair_id)
+    system.login(student_ids[1])
+    system.unregister_from_event(fair_id)
+    assert system.autocomplete_events("te") == ["Tech Talk", "Technology Fair"]
+    
+    system.login(admin_id)
+    system.update_event(tech_id, name="Robotics Talk", location="Lab")
+    assert system.autocomplete_events("te") == ["Technology Fair"]
+    assert system.autocomplete_events("rob") == ["Robotics Talk"]
+    assert system.autocomplete_events("la", field="location") == ["Lab"]
+    
+    system.delete_event(theatre_id)
+    assert system.autocomplete_events("th") == []
+    assert system.autocomplete_events("main", field="location") == ["Main Hall"]
+    
+    # Ranked prefixes kept current stay equal to ranking afresh
+    import random
+    from search_index import CompletionIndex
+    rng = random.Random(7)
+    index, documents = CompletionIndex(size=2), []
+    for step in range(400):
+        if documents and rng.random() < 0.3:
+            completion, score = documents.pop(rng.randrange(len(documents)))
+            index.remove(completion, score)
+        elif documents and rng.random() < 0.5:
+            position = rng.randrange(len(documents))
+            completion, score = documents[position]
+            delta = rng.choice([-1, 1]) if score else 1
+            documents[position] = (completion, score + delta)
+            index.change(completion, delta)
+        else:
+            documents.append((rng.choice(["ta", "tb", "tc ua", "ub", "uc ta"]), rng.randrange(3)))
+            index.add(*documents[-1])
+        for prefix in ("t", "u", "ta"):
+            totals = {}
+            for completion, score in documents:
+                if any(word.startswith(prefix) for word in completion.split()):
+                    totals[completion] = totals.get(completion, 0) + score
+            expected = sorted(totals, key=lambda completion: (-totals[completion], completion))[:2]
+            assert index.top(prefix, 2) == expected, (step, prefix)
+    print("✅ Autocomplete works")
+
+def test_fuzzy_search():
+    """Misspelled queries still find events, closest matches first"""
+    system = _fresh_system()
+    admin_id = system.register_user("admin", UserRole.ADMIN)
+    system.login(admin_id)
+    
+    conference_id = system.create_event("Tech Conference", "Industry talks", "2024-05-01",
+                                        "10:00", "Main Hall", 50)
+    workshop_id = system.create_event("Robotics Workshop", "Build a robot for the conferences",
+                                      "2024-05-02", "10:00", "Lab 3", 20)
+    system.create_event("Art Exhibition", "Student artwork", "2024-05-03", "10:00", "Gallery", 20)
+    
+    assert system.search_events("confrence") == []
+    results = system.fuzzy_search_events("confrence")
+    assert [event.event_id for event in results] == [conference_id, workshop_id]
+    
+    assert [event.event_id for event in system.fuzzy_search_events("robotcs wrkshop")] == [workshop_id]
+    assert system.fuzzy_search_events("confrence galery") == []
+    assert system.fuzzy_search_events("xylophone") == []
+    assert system.fuzzy_search_events("") == []
+    
+    system.update_event(conference_id, name="Tech Summit", description="Keynotes")
+    assert [event.event_id for event in system.fuzzy_search_events("confrence")] == [workshop_id]
+    assert [event.event_id for event in system.fuzzy_search_events("sumit")] == [conference_id]
+    
+    system.delete_event(workshop_id)
+    assert system.fuzzy_search_events("robotics") == []
+    print("✅ Fuzzy search works")
+
+def test_query_cache():
+    """Repeated queries are served from the cache until data changes"""
+    system = _fresh_system()
+    admin_id = system.register_user("admin", UserRole.ADMIN)
+    student_id = system.register_user("student", UserRole.STUDENT)
+    
+    system.login(admin_id)
+    fair_id = system.create_event("Career Fair", "Meet employers", "2024-09-01", "10:00", "Gym", 2)
+    
+    baseline = system.cache_stats()
+    assert len(system.search_events("career fair")) == 1
+    results = system.search_events("Career Fair")
+    stats = system.cache_stats()
+    assert stats["misses"] == baseline["misses"] + 1
+    assert stats["hits"] == baseline["hits"] + 1
+    
+    # Callers get their own copy of cached lists
+    results.clear()
+    assert len(system.search_events("career fair")) == 1
+    
+    first_stats = system.get_statistics()
+    assert first_stats["total_attendees"] == 0
+    assert system.get_statistics() == first_stats
+    
+    # Failed mutations leave the cache alone; successful ones invalidate it
+    generation = system.cache_stats()["generation"]
+    system.login(student_id)
+    assert not system.register_for_event("missing_event")
+    assert system.cache_stats()["generation"] == generation
+    assert system.register_for_event(fair_id)
+    assert system.cache_stats()["generation"] == generation + 1
+    
+    system.login(admin_id)
+    assert system.get_statistics()["total_attendees"] == 1
+    assert [user.user_id for user in system.get_event_attendees(fair_id)] == [student_id]
+    
+    system.update_event(fair_id, name="Jobs Expo")
+    assert system.search_events("career fair") == []
+    assert len(system.view_all_events_page()["items"]) == 1
+    
+    # The cache stays within its capacity
+    for i in range(system.cache_stats()["capacity"] + 10):
+        system.search_events(f"query {i}")
+    assert system.cache_stats()["size"] == system.cache_stats()["capacity"]
+    print("✅ Query cache works")
+
+def test_delta_export():
+    """Only records changed or deleted after a version are exported"""
+    import events_cli
+    
+    system = _fresh_system()
+    admin_id = system.register_user("admin", UserRole.ADMIN)
+    student_id = system.register_user("student", UserRole.STUDENT)
+    system.login(admin_id)
+    talk_id = system.create_event("Talk", "Guest talk", "2024-05-01", "10:00", "Hall", 10)
+    fair_id = system.create_event("Fair", "Club fair", "2024-05-02", "10:00", "Quad", 10)
+    
+    first_mark = system.export_changes_since(0, "full.csv")
+    with open(os.path.join(system.data_dir, "full.csv"), newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert {(row["Record Type"], row["Record ID"]) for row in rows} == {
+        ("user", admin_id), ("user", student_id), ("event", talk_id), ("event", fair_id)}
+    assert first_mark == system.get_change_version()
+    
+    # Nothing changed since the last export
+    assert system.export_changes_since(first_mark, "empty.jsonl", fmt="jsonl") == first_mark
+    with open(os.path.join(system.data_dir, "empty.jsonl"), encoding='utf-8') as f:
+        assert f.read() == ""
+    
+    system.login(student_id)
+    system.register_for_event(talk_id)
+    system.login(admin_id)
+    system.delete_event(fair_id)
+    
+    # Versions and deletions survive a reload; the CLI exports the same delta
+    assert events_cli.main(["--data-dir", system.data_dir, "--as", "admin", "export-changes",
+                            "--since", str(first_mark), "--format", "jsonl",
+                            "--output", "delta.jsonl"]) == 0
+    with open(os.path.join(system.data_dir, "delta.jsonl"), encoding='utf-8') as f:
+        changes = [json.loads(line) for line in f]
+    assert {(change["type"], change["id"], change["change"]) for change in changes} == {
+        ("event", talk_id, "upsert"), ("user", student_id, "upsert"),
+        ("user", admin_id, "upsert"), ("event", fair_id, "delete")}
+    assert [change["version"] for change in changes] == sorted(change["version"] for change in changes)
+    assert all(change["version"] > first_mark for change in changes)
+    
+    reloaded = EventManagementSystem(data_dir=system.data_dir)
+    assert reloaded.get_change_version() == system.get_change_version()
+    print("✅ Delta export works")
+
+def test_change_feed():
+    """Every mutation is published to the changelog and can be tailed from an offset"""
+    from change_feed import ChangeFeed, OffsetExpiredError
+    
+    system = _fresh_system()
+    admin_id = system.register_user("admin", UserRole.ADMIN)
+    student_id = system.register_user("student", UserRole.STUDENT)
+    system.login(admin_id)
+    event_id = system.create_event("Talk", "Guest talk", "2024-05-01", "10:00", "Hall", 10)
+    
+    changes = list(system.follow_changes())
+    assert [change["type"] for _, change in changes] == [
+        "user.registered", "user.registered", "event.created"]
+    saved_offset = changes[-1][0]
+    
+    system.login(student_id)
+    system.register_for_event(event_id)
+    system.unregister_from_event(event_id)
+    system.login(admin_id)
+    system.update_event(event_id, location="Auditorium")
+    system.delete_event(event_id)
+    
+    # Resume after the saved offset: only the new changes, in version order
+    changes = [change for _, change in system.follow_changes(saved_offset)]
+    assert [change["type"] for change in changes] == [
+        "registration.created", "registration.cancelled", "event.updated", "event.deleted"]
+    assert changes[0]["data"] == {"event_id": event_id, "user_id": student_id}
+    assert changes[2]["data"]["changes"] == {"location": "Auditorium"}
+    assert [change["seq"] for change in changes] == sorted(change["seq"] for change in changes)
+    
+    # Following waits for new records and stops after the idle timeout
+    end = system.change_feed.end_offset()
+    assert list(system.follow_changes(end, follow=True, idle_timeout=0.05)) == []
+    
+    # Small segments rotate; retention removes old ones
+    feed = ChangeFeed(os.path.join(system.data_dir, "rotating"), max_segment_bytes=200, max_segments=3)
+    first_offset = feed.append("test", 1, {"n": 1})
+    for n in range(2, 30):
+        feed.append("test", n, {"n": n})
+    assert len(feed.segments()) == 3
+    remaining = [change["data"]["n"] for _, change in feed.read()]
+    assert remaining == list(range(remaining[0], 30))
+    try:
+        list(feed.read(first_offset))
+        assert False, "expired offset should be rejected"
+    except OffsetExpiredError:
+        pass
+    print("✅ Change feed works")
+
+def test_attendance_report():
+    """Analytics group attendance by organizer, location, weekday, month and role"""
+    system = _fresh_system()
+    admin_id = system.register_user("admin", UserRole.ADMIN)
+    organizer_id = system.register_user("organizer", UserRole.EVENT_ORGANIZER)
+    student_ids = [system.register_user(f"student_{i}", UserRole.STUDENT) for i in range(3)]
+    visitor_id = system.register_user("visitor", UserRole.VISITOR)
+    
+    system.login(admin_id)
+    monday_id = system.create_event("Talk", "Guest talk", "2024-04-15", "10:00", "Hall", 4)
+    system.login(organizer_id)
+    friday_id = system.create_event("Social", "Mixer", "2024-05-03", "18:00", "Hall", 10)
+    quiet_id = system.create_event("Quiet", "Study", "2024-05-04", "18:00", "Library", 10)
+    
+    for student_id in student_ids:
+        system.login(student_id)
+        system.register_for_event(monday_id)
+    system.login(visitor_id)
+    system.register_for_event(monday_id)
+    system.register_for_event(friday_id)
+    
+    system.login(organizer_id)
+    assert system.get_attendance_report() == {}
+    
+    system.login(admin_id)
+    report = system.get_attendance_report()
+    assert report["total_registrations"] == 5
+    assert report["fill_rate"][monday_id] == 1.0
+    assert report["fill_rate"][friday_id] == 0.1
+    assert report["by_organizer"] == {"admin": 4, "organizer": 1}
+    assert report["by_location"] == {"Hall": 5, "Library": 0}
+    assert report["by_weekday"]["Monday"] == 4
+    assert report["by_weekday"]["Friday"] == 1
+    assert report["by_month"] == {"2024-04": 4, "2024-05": 1}
+    assert report["by_role"] == {"student": 3, "visitor": 2}
+    
+    # A series counts every date registered for, each with its own seats
+    system.login(organizer_id)
+    series_id = system.create_event("Lab", "Weekly lab", "2024-06-03", "09:00", "Lab", 2,
+                                    {"freq": "weekly", "count": 10})
+    for student_id in student_ids[:2]:
+        system.login(student_id)
+        system.register_for_event(f"{series_id}@2024-06-03")
+    system.register_for_event(f"{series_id}@2024-06-10")
+    system.login(admin_id)
+    report = system.get_attendance_report()
+    assert report["total_events"] == 4
+    assert report["total_registrations"] == 8
+    assert report["fill_rate"][f"{series_id}@2024-06-03"] == 1.0
+    assert report["fill_rate"][f"{series_id}@2024-06-10"] == 0.5
+    assert series_id not in report["fill_rate"]
+    assert report["by_organizer"] == {"admin": 4, "organizer": 4}
+    assert report["by_location"]["Lab"] == 3
+    assert report["by_weekday"]["Monday"] == 7
+    assert report["by_month"]["2024-06"] == 3
+    assert report["by_role"] == {"student": 6, "visitor": 2}
+    
+    # The columns follow later changes as a fresh projection would
+    import analytics
+    with redirect_stdout(io.StringIO()):
+        system.update_event(monday_id, max_capacity=8, location="Library")
+        system.delete_event(friday_id)
+        system.cancel_occurrence(f"{series_id}@2024-06-03")
+        system.login(visitor_id)
+        system.unregister_from_event(monday_id)
+        system.register_for_event(f"{series_id}@2024-06-17")
+        system.login(admin_id)
+    report = system.get_attendance_report()
+    assert report == analytics.attendance_report(analytics.project(system.users, system.events), 3)
+    assert report["fill_rate"] == {monday_id: 0.375, quiet_id: 0.0, f"{series_id}@2024-06-10": 0.5,
+                                   f"{series_id}@2024-06-17": 0.5}
+    assert report["by_location"] == {"Library": 3, "Lab": 2}
+    
+    # A date whose last attendee leaves, and a deleted series, leave no rows behind
+    with redirect_stdout(io.StringIO()):
+        system.login(visitor_id)
+        system.unregister_from_event(f"{series_id}@2024-06-17")
+        system.login(admin_id)
+    report = system.get_attendance_report()
+    assert report == analytics.attendance_report(analytics.project(system.users, system.events), 3)
+    assert f"{series_id}@2024-06-17" not in report["fill_rate"]
+    with redirect_stdout(io.StringIO()):
+        system.delete_event(series_id)
+    report = system.get_attendance_report()
+    assert report == analytics.attendance_report(analytics.project(system.users, system.events), 2)
+    assert report["fill_rate"] == {monday_id: 0.375, quiet_id: 0.0}
+    print(f"✅ Attendance analytics work ({report['backend']} backend)")
+
+def test_bulk_deserialization():
+    """Bulk loaders rebuild the same records as the serialized dictionaries"""
+    user = User("user_1", "alice", UserRole.VISITOR, "alice@campus.edu")
+    user.registered_events = ["event_1"]
+    user.version = 3
+    event = Event("event_1", "Talk", "Guest talk", "2024-05-01", "10:00", "Hall", 10, "user_2")
+    event.attendees = ["user_1"]
+    
+    users = User.bulk_from_dicts({"user_1": user.to_dict()})
+    events = Event.bulk_from_dicts({"event_1": event.to_dict()})
+    assert users["user_1"].to_dict() == user.to_dict()
+    assert users["user_1"].role is UserRole.VISITOR
+    assert events["event_1"].to_dict() == event.to_dict()
+    assert Event.from_dict(event.to_dict()).to_dict() == event.to_dict()
+    
+    # Older files without created_at or version still load
+    legacy = event.to_dict()
+    del legacy["created_at"], legacy["version"]
+    loaded = Event.from_dict(legacy)
+    assert loaded.created_at and loaded.version == 0
+    print("✅ Bulk deserialization works")
+
+def _registration_worker(data_dir, user_ids, event_ids, results):
+    """Register users from a separate process (used by the concurrency test)"""
+    with redirect_stdout(io.StringIO()):
+        system = EventManagementSystem(data_dir=data_dir)
+        successes = 0
+        for user_id in user_ids:
+            system.login(user_id)
+            for event_id in event_ids:
+                if system.register_for_event(event_id):
+                    successes += 1
+    results.put(successes)
+
+def test_concurrent_registrations_are_not_lost():
+    """Several processes registering against one data directory lose nothing"""
+    system, admin_id, student_ids = _system_with_students(80)
+    system.login(admin_id)
+    big_id = system.create_event("Orientation", "Welcome", "2024-09-01", "09:00", "Arena", 1000)
+    small_id = system.create_event("Seminar", "Limited seats", "2024-09-02", "09:00", "Room 1", 50)
+    
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_registration_worker,
+                                       args=(system.data_dir, student_ids[i::4], [big_id, small_id], results))
+               for i in range(4)]
+    for worker in workers:
+        worker.start()
+    successes = sum(results.get(timeout=60) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=60)
+    
+    # The original process catches up with the other processes' commits
+    assert system.refresh()
+    assert not system.refresh()
+    big, small = system.events[big_id], system.events[small_id]
+    assert successes == 80 + 50
+    assert sorted(big.attendees) == sorted(student_ids)
+    assert len(small.attendees) == 50 == len(set(small.attendees))
+    for student_id in student_ids:
+        registered = system.users[student_id].registered_events
+        assert (small_id in registered) == (student_id in small.attendees)
+        assert big_id in registered
+    
+    # A stale in-memory copy rebases its next mutation onto the latest data
+    stale = EventManagementSystem(data_dir=system.data_dir)
+    system.login(admin_id)
+    system.update_event(big_id, location="Stadium")
+    stale.login(admin_id)
+    stale.update_event(small_id, location="Room 2")
+    reloaded = EventManagementSystem(data_dir=system.data_dir)
+    assert reloaded.events[big_id].location == "Stadium"
+    assert reloaded.events[small_id].location == "Room 2"
+    assert len(reloaded.events[big_id].attendees) == 80
+    
+    # A save that fails commits nothing: no file, store version or change feed entry
+    end = system.change_feed.end_offset()
+    write_json = system._write_json
+    def failing_write_json(name, data):
+        if name == "events.json":
+            raise OSError("disk full")
+        return write_json(name, data)
+    system._write_json = failing_write_json
+    try:
+        system.update_event(big_id, location="Car park")
+        assert False, "the failed save should raise"
+    except OSError:
+        pass
+    system._write_json = write_json
+    assert list(system.change_feed.read(end)) == []
+    assert not reloaded.refresh()
+    assert reloaded.events[big_id].location == "Stadium"
+    assert not [name for name in os.listdir(system.data_dir) if name.endswith(".tmp")]
+    system.update_event(small_id, description="Still limited")
+    assert system.events[big_id].location == "Stadium"
+    assert reloaded.refresh() and reloaded.events[small_id].description == "Still limited"
+    print("✅ Concurrent registrations are not lost")
+
+def test_seat_holds():
+    """Holds reserve seats until confirmed, released or expired"""
+    system, admin_id, student_ids = _system_with_students(4)
+    now = [1000.0]
+    system.clock = lambda: now[0]
+    system.login(admin_id)
+    event_id = system.create_event("Hackathon", "24h coding", "2024-10-01", "09:00", "Lab", 2)
+    
+    system.login(student_ids[0])
+    first_token = system.hold_seat(event_id, ttl_seconds=60)
+    assert first_token
+    assert system.hold_seat(event_id) is None  # One hold per user and event
+    system.login(student_ids[1])
+    second_token = system.hold_seat(event_id, ttl_seconds=120)
+    assert second_token
+    
+    # Both seats are held, so nobody else gets in
+    system.login(student_ids[2])
+    assert system.events[event_id].is_full()
+    assert system.hold_seat(event_id) is None
+    assert not system.register_for_event(event_id)
+    
+    # Only the owner can confirm; the hold becomes a registration
+    assert not system.confirm_hold(first_token)
+    system.login(student_ids[0])
+    assert system.confirm_hold(first_token)
+    assert not system.confirm_hold(first_token)
+    assert system.events[event_id].attendees == [student_ids[0]]
+    
+    # Holds are shared with other processes through the data directory
+    other = EventManagementSystem(data_dir=system.data_dir)
+    other.clock = system.clock
+    assert other.events[event_id].held_seats == 1 and other.events[event_id].is_full()
+    
+    # Once the second hold expires its seat is reclaimed for someone else
+    now[0] += 121
+    system.login(student_ids[2])
+    assert system.register_for_event(event_id)
+    system.login(student_ids[1])
+    assert not system.confirm_hold(second_token)
+    assert system.events[event_id].held_seats == 0
+    
+    # Released holds free their seat immediately
+    system.login(student_ids[2])
+    system.unregister_from_event(event_id)
+    system.login(student_ids[3])
+    token = system.hold_seat(event_id)
+    assert system.release_hold(token)
+    assert system.events[event_id].held_seats == 0
+    assert system.reclaim_expired_holds() == 0
+    print("✅ Seat holds work")
+
+def test_admission_control():
+    """Bursts are queued fairly, rate limited and rejected fast once an event is full"""
+    import admission
+    
+    queue = admission.FairQueue(capacity=5)
+    for item in ["a1", "a2", "a3"]:
+        assert queue.put("alice", item)
+    assert queue.put("bob", "b1") and queue.put("carol", "c1")
+    assert not queue.put("dave", "d1")  # Bounded
+    assert queue.get_batch(10, timeout=0) == ["a1", "b1", "c1", "a2", "a3"]
+    
+    bucket = admission.TokenBucket(rate=1.0, burst=2, now=0.0)
+    assert [bucket.allow(0.0) for _ in range(3)] == [True, True, False]
+    assert bucket.allow(1.0)
+    
+    with redirect_stdout(io.StringIO()):
+        system, admin_id, student_ids = _system_with_students(30)
+        system.login(admin_id)
+        event_id = system.create_event("Workshop", "Popular", "2024-09-01", "10:00", "Lab", 10)
+        system.logout()
+        
+        system.login(admin_id)
+        controller = admission.AdmissionController(system, batch_size=8)
+        futures = [controller.submit(student_id, event_id) for student_id in student_ids]
+        outcomes = [future.result(timeout=30) for future in futures]
+        
+        # Fast rejections once the event is known to be full
+        assert controller.submit(student_ids[0], event_id).result() in (
+            admission.EVENT_FULL, admission.FAILED)
+        assert controller.submit(student_ids[0], "missing").result() == admission.EVENT_NOT_FOUND
+        controller.shutdown()
+        assert controller.submit(student_ids[1], event_id).result() in (
+            admission.EVENT_FULL, admission.SHUT_DOWN)
+        assert system.current_user.user_id == admin_id  # The session is left alone
+    
+    assert outcomes.count(admission.REGISTERED) == 10
+    assert set(outcomes) <= {admission.REGISTERED, admission.EVENT_FULL}
+    assert len(system.events[event_id].attendees) == 10
+    assert EventManagementSystem(data_dir=system.data_dir).events[event_id].attendees == \
+        system.events[event_id].attendees
+    
+    with redirect_stdout(io.StringIO()):
+        system.login(admin_id)
+        open_id = system.create_event("Open Day", "Unlimited", "2024-09-02", "10:00", "Quad", 100)
+        system.logout()
+        controller = admission.AdmissionController(system, rate=0.001, burst=2)
+        outcomes = [controller.submit(student_ids[0], open_id).result(timeout=30) for _ in range(4)]
+        controller.shutdown()
+    assert outcomes == [admission.REGISTERED, admission.FAILED,
+                        admission.RATE_LIMITED, admission.RATE_LIMITED]
+    assert controller.stats()["requests"] == 4
+    
+    # Idle buckets are dropped, and batches whose transaction raises are counted
+    now = [0.0]
+    controller = admission.AdmissionController(system, rate=1.0, burst=2, clock=lambda: now[0])
+    with redirect_stdout(io.StringIO()):
+        for student_id in student_ids[10:13]:
+            controller.submit(student_id, open_id).result(timeout=30)
+    assert len(controller._buckets) == 3
+    now[0] = 1.0
+    controller.submit(student_ids[13], "missing")
+    assert len(controller._buckets) == 3  # Not idle long enough to have refilled
+    
+    def failing_register(user_id, event_id):
+        raise OSError("disk full")
+    system._register_user_for_event = failing_register
+    now[0] = 5.0
+    try:
+        controller.submit(student_ids[13], open_id).result(timeout=30)
+        assert False, "the failed batch should raise"
+    except OSError:
+        pass
+    del system._register_user_for_event
+    controller.shutdown()
+    assert list(controller._buckets) == [student_ids[13]]
+    assert controller.stats()["outcomes"] == {admission.REGISTERED: 3, admission.EVENT_NOT_FOUND: 1,
+                                              admission.ERROR: 1}
+    assert not hasattr(system, "register_user_for_event")  # No registering others without a login
+    print("✅ Admission control works")
+
+def test_recurring_series():
+    """A series stores one record and expands its dates only when asked"""
+    with redirect_stdout(io.StringIO()):
+        system = _fresh_system()
+        admin_id = system.register_user("admin", UserRole.ADMIN)
+        student_id = system.register_user("student", UserRole.STUDENT)
+        system.login(admin_id)
+        series_id = system.create_event(
+            "Workshop Series", "Weekly workshop", "2025-01-06", "18:00", "Lab", 2,
+            {"freq": "weekly", "until": "2026-12-28", "exceptions": ["2025-01-13"]})
+        monthly_id = system.create_event(
+            "Month End Review", "Monthly review", "2025-01-31", "09:00", "Office", 10,
+            {"freq": "monthly", "count": 4})
+        single_id = system.create_event("Talk", "One-off talk", "2025-01-20", "12:00", "Hall", 50)
+        assert system.create_event("Bad", "Bad rule", "2025-01-06", "18:00", "Lab", 2,
+                                   {"freq": "daily"}) is None
+    
+    # Only dates inside the window are generated; exceptions are skipped
+    window = system.view_events_between("2025-01-01", "2025-01-31")
+    assert [event.event_id for event in window] == [
+        f"{series_id}@2025-01-06", single_id, f"{series_id}@2025-01-20",
+        f"{series_id}@2025-01-27", f"{monthly_id}@2025-01-31"]
+    assert [event.date for event in system.view_events_between("2025-02-01", "2025-05-31")
+            if event.name == "Month End Review"] == ["2025-03-31"]  # Feb/Apr have no 31st, count is 4
+    assert len(system.view_events_between("2025-01-01", "2026-12-31")) == 104 - 1 + 2 + 1
+    
+    assert system.get_event(f"{series_id}@2025-01-13") is None  # Exception
+    assert system.get_event(f"{series_id}@2025-01-07") is None  # Not a Monday
+    assert system.get_event(f"{series_id}@2027-01-04") is None  # After until
+    assert [event.event_id for event in system.upcoming_occurrences(series_id, "2026-12-15")] == [
+        f"{series_id}@2026-12-21", f"{series_id}@2026-12-28"]
+    
+    # Registration is per date and stored sparsely on the series
+    occurrence_id = f"{series_id}@2025-03-03"
+    with redirect_stdout(io.StringIO()):
+        system.login(student_id)
+        assert not system.register_for_event(series_id)
+        assert system.register_for_event(occurrence_id)
+        assert not system.register_for_event(occurrence_id)
+        assert system.register_for_event(f"{series_id}@2025-03-10")
+        assert system.unregister_from_event(f"{series_id}@2025-03-10")
+    series = system.events[series_id]
+    assert series.occurrence_attendees == {"2025-03-03": [student_id]}
+    assert system.get_event(occurrence_id).attendees == [student_id]
+    assert [event.event_id for event in system.view_registered_events()] == [occurrence_id]
+    assert series.get_attendance_count() == 1
+    
+    with open(os.path.join(system.data_dir, "events.json"), encoding="utf-8") as f:
+        stored = json.load(f)
+    assert len(stored) == 3
+    assert stored[series_id]["occurrence_attendees"] == {"2025-03-03": [student_id]}
+    
+    reloaded = EventManagementSystem(data_dir=system.data_dir)
+    assert reloaded.get_event(occurrence_id).attendees == [student_id]
+    
+    # Cancelling a date unregisters its attendees and adds an exception
+    with redirect_stdout(io.StringIO()):
+        system.login(admin_id)
+        assert system.cancel_occurrence(occurrence_id)
+        assert not system.cancel_occurrence(series_id)
+    assert system.get_event(occurrence_id) is None
+    assert system.users[student_id].registered_events == []
+    assert series.occurrence_attendees == {}
+    assert "2025-03-03" in series.recurrence["exceptions"]
+    
+    # Moving a series keeps the registrations of dates it still has and cancels the rest
+    with redirect_stdout(io.StringIO()):
+        system.login(student_id)
+        assert system.register_for_event(f"{series_id}@2025-01-20")
+        assert system.register_for_event(f"{series_id}@2025-03-10")
+        token = system.hold_seat(f"{series_id}@2025-01-27")
+        system.login(admin_id)
+        assert not system.update_event(series_id, date="2027-01-04")  # After the series ends
+        assert system.update_event(series_id, date="2025-02-03")
+    assert series.occurrence_attendees == {"2025-03-10": [student_id]}
+    assert system.users[student_id].registered_events == [f"{series_id}@2025-03-10"]
+    assert series.get_attendance_count() == 1
+    assert token not in system._holds and series.occurrence_held_seats == {}
+    jobs = [system.outbox.claim(job_id) for job_id in system.outbox.pending()]
+    assert [(job["kind"], job["event_id"]) for job in jobs][-2:] == [
+        ("occurrence.cancelled", f"{series_id}@2025-01-20"), ("event.updated", series_id)]
+    assert EventManagementSystem(data_dir=system.data_dir).events[series_id].occurrence_attendees == {
+        "2025-03-10": [student_id]}
+    print("✅ Recurring series work")
+
+def test_ical_feeds():
+    """Feeds are valid iCalendar and unchanged feeds are skipped"""
+    import ical_export
+    
+    with redirect_stdout(io.StringIO()):
+        system = _fresh_system()
+        admin_id = system.register_user("admin", UserRole.ADMIN)
+        organizer_id = system.register_user("organizer", UserRole.EVENT_ORGANIZER)
+        student_id = system.register_user("student", UserRole.STUDENT)
+        other_id = system.register_user("other", UserRole.STUDENT)
+        system.login(organizer_id)
+        talk_id = system.create_event("Talk; Q&A, live", "Line one\nLine two " + "é" * 60,
+                                      "2025-02-03", "14:30", "Hall", 50)
+        series_id = system.create_event("Workshop Series", "Weekly", "2025-01-06", "18:00", "Lab", 20,
+                                        {"freq": "weekly", "until": "2025-06-30",
+                                         "exceptions": ["2025-01-13"]})
+        system.login(student_id)
+        system.register_for_event(talk_id)
+        system.register_for_event(f"{series_id}@2025-01-20")
+        path = system.export_calendar()
+    
+    with open(path, encoding="utf-8", newline="") as f:
+        content = f.read()
+    lines = content.split("\r\n")
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-2] == "END:VCALENDAR" and lines[-1] == ""
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    unfolded = content.replace("\r\n ", "")
+    assert f"UID:{talk_id}@campus-events" in unfolded
+    assert "SUMMARY:Talk\\; Q&A\\, live" in unfolded
+    assert "DESCRIPTION:Line one\\nLine two " + "é" * 60 in unfolded
+    assert "DTSTART:20250203T143000" in unfolded
+    assert "DTSTART:20250120T180000" in unfolded and "RRULE" not in unfolded
+    
+    with redirect_stdout(io.StringIO()):
+        system.login(organizer_id)
+        organizer_feed = system.export_calendar()
+    with open(organizer_feed, encoding="utf-8") as f:
+        organizer_content = f.read()
+    assert "RRULE:FREQ=WEEKLY;INTERVAL=1;UNTIL=20250630T235959" in organizer_content
+    assert "EXDATE:20250113T180000" in organizer_content
+    assert organizer_content.count("BEGIN:VEVENT") == 2  # The series is one VEVENT
+    
+    # Bulk export: everything first, then only feeds whose content changed
+    with redirect_stdout(io.StringIO()):
+        system.login(student_id)
+        assert system.export_all_calendars() is None  # Admin only
+        system.login(admin_id)
+        assert system.export_all_calendars() == {"written": 4, "skipped": 0, "removed": 0}
+        assert system.export_all_calendars() == {"written": 0, "skipped": 4, "removed": 0}
+        
+        system.login(other_id)
+        system.register_for_event(talk_id)  # Changes only other's feed
+        system.login(admin_id)
+        assert system.export_all_calendars() == {"written": 1, "skipped": 3, "removed": 0}
+        
+        system.update_event(talk_id, location="Main Hall")  # Changes three feeds
+        assert system.export_all_calendars() == {"written": 3, "skipped": 1, "removed": 0}
+        assert system.export_all_calendars(force=True)["written"] == 4
+    
+    with open(ical_export.feed_path(os.path.join(system.data_dir, "calendars"), other_id),
+              encoding="utf-8") as f:
+        assert "LOCATION:Main Hall" in f.read()
+    print("✅ iCalendar feeds work")
+
+def test_batch_cli():
+    """CLI subcommands run without menus or demo data; results go to stdout"""
+    import events_cli
+    
+    data_dir = _temporary_directory()
+    
+    def run(*argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            status = events_cli.main(["--data-dir", data_dir] + list(argv))
+        return status, out.getvalue(), err.getvalue()
+    
+    # Nothing is seeded
+    assert run("search") == (0, "", "")
+    assert EventManagementSystem(data_dir=data_dir).users == {}
+    
+    users_csv = os.path.join(data_dir, "users.csv")
+    with open(users_csv, "w", newline="", encoding="utf-8") as f:
+        f.write("Username,Role,Email\nadmin,admin,admin@campus.edu\norganizer,event_organizer,\n"
+                "student,student,student@campus.edu\nghost,wizard,\n")
+    status, out, err = run("import", "users", users_csv)
+    assert status == 1 and out.split() == ["user_1", "user_2", "user_3"]
+    assert "Line 5 not imported" in err
+    
+    events_csv = os.path.join(data_dir, "events.csv")
+    with open(events_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(events_cli.EVENT_IMPORT_COLUMNS)
+        writer.writerow(["Python Workshop", "Hands-on", "2024-04-01", "14:00", "Lab 1", "1"])
+        writer.writerow(["Career Fair", "Companies", "2024-04-02", "10:00", "Hall", "100"])
+    status, out, _ = run("--as", "organizer", "import", "events", events_csv)
+    assert status == 0 and out.split() == ["event_1", "event_2"]
+    assert run("--as", "student", "import", "events", "missing.csv")[0] == 1
+    
+    status, out, _ = run("search", "python")
+    assert status == 0
+    assert out == "event_1\t2024-04-01\t14:00\t0/1\tPython Workshop\tLab 1\n"
+    status, out, err = run("--json", "search", "--limit", "1")
+    page = json.loads(out)
+    assert [item["event_id"] for item in page["items"]] == ["event_1"]
+    assert page["next_cursor"] and not err
+    
+    status, out, _ = run("--as", "student@campus.edu", "register", "event_1", "event_2", "event_9")
+    assert status == 1
+    assert out.splitlines() == ["event_1\tregistered", "event_2\tregistered", "event_9\tfailed"]
+    
+    status, out, _ = run("list", "--fields", "event_id,seats_left", "--has-seats")
+    assert status == 0 and out == "event_2\t99\n"
+    status, out, _ = run("--json", "list", "--organizer", "organizer", "--to", "2024-04-01")
+    assert json.loads(out) == [{"event_id": "event_1", "name": "Python Workshop",
+                                "date": "2024-04-01", "attendance": 1}]
+    assert run("list", "--fields", "event_id,price")[0] == 1
+    
+    assert run("--as", "student", "stats")[0] == 1
+    status, out, _ = run("--as", "admin", "--json", "stats")
+    assert json.loads(out) == {"total_events": 2, "total_attendees": 2,
+                               "highest_attendance_event": "event_1",
+                               "lowest_attendance_event": "event_2"}
+    status, out, _ = run("--as", "admin", "stats")
+    assert "total_attendees\t2" in out.splitlines()
+    
+    assert run("--as", "admin", "export", "events", "--output", "report.csv")[0] == 0
+    with open(os.path.join(data_dir, "report.csv"), newline="", encoding="utf-8") as f:
+        assert [row["Name"] for row in csv.DictReader(f)] == ["Python Workshop", "Career Fair"]
+    assert run("--as", "admin", "export", "attendees")[0] == 1
+    assert run("--as", "organizer", "export", "attendees", "event_1", "--output", "a.csv")[0] == 0
+    
+    status, _, err = run("--timing", "search")
+    assert status == 0 and "load" in err and "ms" in err
+    print("✅ Batch CLI works")
+
+def test_binary_rosters():
+    """Large attendee lists are saved as mapped uint32 rosters and behave like lists"""
+    from rosters import RosterList
+    
+    with redirect_stdout(io.StringIO()):
+        system, admin_id, student_ids = _system_with_students(6)
+        system.roster_threshold = 3
+        system.login(admin_id)
+        big_id = system.create_event("Orientation", "Campus-wide", "2024-09-01", "09:00", "Stadium", 100)
+        small_id = system.create_event("Seminar", "Small", "2024-09-02", "09:00", "Room 1", 100)
+        with system.transaction():
+            for student_id in student_ids[:4]:
+                system.login(student_id)
+                system.register_for_event(big_id)
+            system.register_for_event(small_id)
+    
+    big = system.events[big_id]
+    assert isinstance(big.attendees, RosterList) and not big.attendees.dirty
+    assert isinstance(system.events[small_id].attendees, list)
+    roster_path = os.path.join(system.data_dir, "rosters", f"{big_id}.u32")
+    assert os.path.getsize(roster_path) == 4 * 4
+    with open(os.path.join(system.data_dir, "events.json"), encoding="utf-8") as f:
+        stored = json.load(f)[big_id]
+    assert stored["attendees"] == [] and stored["roster"] == f"{big_id}.u32"
+    
+    # Membership, counts and updates work on the mapped file plus the delta
+    assert len(big.attendees) == 4 and student_ids[0] in big.attendees
+    assert student_ids[5] not in big.attendees and "nobody" not in big.attendees
+    saved_roster = big.attendees
+    with redirect_stdout(io.StringIO()):
+        system.login(student_ids[0])
+        assert not system.register_for_event(big_id)  # Already registered
+        with system.transaction():
+            assert system.unregister_from_event(big_id)
+            system.login(student_ids[5])
+            assert system.register_for_event(big_id)
+            assert big.attendees.dirty  # Not saved until the transaction ends
+    assert saved_roster._mapping is None  # Closed before its file was replaced
+    big = system.events[big_id]
+    assert not big.attendees.dirty
+    assert list(big.attendees) == sorted(student_ids[1:4] + [student_ids[5]],
+                                         key=lambda user_id: int(user_id.split("_")[1]))
+    
+    reloaded = EventManagementSystem(data_dir=system.data_dir)
+    assert reloaded.events[big_id].attendees == big.attendees
+    assert reloaded.events[big_id].to_dict()["attendees"] == list(big.attendees)
+    
+    with redirect_stdout(io.StringIO()):
+        system.login(admin_id)
+        assert system.export_attendees_to_csv(big_id, "big.csv")
+        assert system.get_statistics()["total_attendees"] == 5
+        assert system.get_attendance_report()["total_registrations"] == 5
+        assert system.delete_event(big_id)
+    with open(os.path.join(system.data_dir, "big.csv"), newline="", encoding="utf-8") as f:
+        assert [row["User ID"] for row in csv.DictReader(f)] == list(reloaded.events[big_id].attendees)
+    assert not os.path.exists(roster_path)  # Sidecar removed with the event
+    assert big.attendees._mapping is None  # and unmapped first
+    print("✅ Binary rosters work")
+
+def test_recommendations():
+    """Co-attendance counts stay equal to a full rebuild as registrations change"""
+    from recommendations import CoAttendanceMatrix
+    
+    with redirect_stdout(io.StringIO()):
+        system, admin_id, student_ids = _system_with_students(5)
+        system.login(admin_id)
+        tech_id = system.create_event("Tech Conference 2024", "Talks", "2024-06-01", "09:00", "Hall", 50)
+        ai_id = system.create_event("AI Workshop", "Hands-on", "2024-06-02", "09:00", "Lab", 50)
+        fair_id = system.create_event("Career Fair", "Jobs", "2024-06-03", "09:00", "Quad", 50)
+        art_id = system.create_event("Art Show", "Gallery", "2024-06-04", "09:00", "Gallery", 50)
+        series_id = system.create_event("Coding Club", "Weekly", "2024-06-03", "18:00", "Lab", 50,
+                                        {"freq": "weekly", "count": 10})
+        
+        assert system.recommend_events("missing") == []
+        assert system.recommend_events(tech_id) == []  # Builds the (empty) matrix
+        
+        registrations = {0: [tech_id, ai_id, fair_id], 1: [tech_id, ai_id],
+                         2: [tech_id, fair_id, f"{series_id}@2024-06-03", f"{series_id}@2024-06-10"],
+                         3: [tech_id, art_id, f"{series_id}@2024-06-17"], 4: [ai_id]}
+        with system.transaction():
+            for index, event_ids in registrations.items():
+                system.login(student_ids[index])
+                for event_id in event_ids:
+                    assert system.register_for_event(event_id)
+    
+    def rebuilt():
+        return CoAttendanceMatrix.build(user.registered_events for user in system.users.values())
+    
+    matrix = system._co_attendance
+    assert matrix._rows == rebuilt()._rows
+    assert matrix.count(tech_id, ai_id) == 2
+    assert matrix.count(tech_id, f"{series_id}@2024-06-24") == 2  # Dates count as the series
+    
+    system.logout()
+    assert [event.event_id for event in system.recommend_events(tech_id)] == [
+        ai_id, fair_id, series_id, art_id]
+    assert [event.event_id for event in system.recommend_events(tech_id, limit=2)] == [ai_id, fair_id]
+    system.login(student_ids[1])  # Already registered for the AI workshop
+    assert [event.event_id for event in system.recommend_events(tech_id, limit=1)] == [fair_id]
+    
+    with redirect_stdout(io.StringIO()):
+        system.login(student_ids[2])
+        assert system.unregister_from_event(f"{series_id}@2024-06-10")  # Still has 06-03
+        assert matrix.count(tech_id, series_id) == 2
+        assert system.unregister_from_event(fair_id)
+        system.login(admin_id)
+        assert system.cancel_occurrence(f"{series_id}@2024-06-17")
+        assert system.delete_event(art_id)
+    assert matrix._rows == rebuilt()._rows
+    assert matrix.count(tech_id, fair_id) == 1 and matrix.count(tech_id, series_id) == 1
+    assert art_id not in matrix._rows
+    print("✅ Recommendations work")
+
+def test_schedule_conflicts():
+    """Clashing registrations are rejected, and the audit matches a pairwise check"""
+    import itertools
+    import random
+    import schedule
+    
+    with redirect_stdout(io.StringIO()) as output:
+        system = _fresh_system()
+        admin_id = system.register_user("admin", UserRole.ADMIN)
+        student_id = system.register_user("student", UserRole.STUDENT)
+        system.login(admin_id)
+        talk_id = system.create_event("Keynote", "Opening", "2024-06-01", "09:00", "Hall", 50,
+                                      duration_minutes=90)
+        lab_id = system.create_event("Lab", "Hands-on", "2024-06-01", "09:30", "Lab", 50)
+        lunch_id = system.create_event("Lunch", "Food", "2024-06-01", "10:30", "Cafe", 50)
+        club_id = system.create_event("Club", "Weekly", "2024-05-25", "10:00", "Lab", 50,
+                                      {"freq": "weekly", "count": 4})
+        workshop_id = system.create_event("Workshop", "Build", "2024-06-02", "10:00", "Lab", 1)
+        seminar_id = system.create_event("Seminar", "Talks", "2024-06-02", "10:30", "Hall", 50)
+        assert system.create_event("Nap", "Zero", "2024-06-01", "12:00", "Dorm", 5, duration_minutes=0) is None
+    
+        system.login(student_id)
+        assert system.register_for_event(talk_id)
+        assert not system.register_for_event(lab_id)  # Starts during the keynote
+        assert "clashes with 'Keynote'" in output.getvalue()
+        assert not system.hold_seat(f"{club_id}@2024-06-01")
+        assert system.register_for_event(lunch_id)  # Starts as the keynote ends
+        assert system.register_for_event(f"{club_id}@2024-06-08")
+        token = system.hold_seat(f"{club_id}@2024-05-25")
+        assert system.unregister_from_event(talk_id)
+        assert system.register_for_event(lab_id)  # The keynote no longer blocks it
+        assert not system.register_for_event(talk_id)
+        assert system.confirm_hold(token)
+        
+        # A clashing direct registration keeps the user's hold on the last seat
+        token = system.hold_seat(workshop_id)
+        assert system.register_for_event(seminar_id)
+        assert not system.register_for_event(workshop_id)
+        assert system.events[workshop_id].held_seats == 1
+        assert system.unregister_from_event(seminar_id)
+        assert system.register_for_event(workshop_id)
+        assert system.events[workshop_id].held_seats == 0
+    
+        # Moving an event can create clashes the audit reports
+        system.login(admin_id)
+        assert system.update_event(lunch_id, time="09:30")
+        assert system.audit_schedule_conflicts() == {student_id: [(lab_id, lunch_id)]}
+        assert system.update_event(lunch_id, time="11:00")
+        assert system.audit_schedule_conflicts() == {}
+        assert not system.update_event(lunch_id, duration_minutes=0)
+        assert system.events[lunch_id].duration_minutes == 60
+    assert list(system._schedules) == []  # Dropped when the lunch moved
+    
+    rng = random.Random(43)
+    for _ in range(50):
+        intervals = []
+        for index in range(rng.randint(0, 30)):
+            start = rng.randint(0, 500)
+            intervals.append((start, start + rng.randint(1, 60), f"event_{index}"))
+        intervals.sort()
+        expected = {frozenset((a[2], b[2])) for a, b in itertools.combinations(intervals, 2)
+                    if a[0] < b[1] and b[0] < a[1]}
+        assert {frozenset(pair) for pair in schedule.sweep_conflicts(intervals)} == expected
+        assert len(schedule.sweep_conflicts(intervals)) == len(expected)
+        
+        start = rng.randint(0, 500)
+        probe = (start, start + rng.randint(1, 60), "probe")
+        clashes = {other[2] for other in intervals if other[0] < probe[1] and probe[0] < other[1]}
+        built = schedule.Schedule(intervals)
+        assert schedule.find_clash(built, probe) in (clashes or {None})
+        
+        # Adding and removing intervals keeps the longest duration the window relies on
+        grown = schedule.Schedule()
+        for interval in rng.sample(intervals, len(intervals)):
+            schedule.add_interval(grown, interval)
+        for interval in intervals[::2]:
+            schedule.remove_event(grown, interval[2])
+            schedule.remove_event(built, interval[2])
+        assert grown == built and grown.longest == schedule.Schedule(grown).longest
+        remaining = {other[2] for other in grown if other[0] < probe[1] and probe[0] < other[1]}
+        assert schedule.find_clash(grown, probe) in (remaining or {None})
+    
+    # A long event moved over a shorter one still blocks what it overlaps
+    moved = schedule.Schedule([(540, 840, "moved"), (600, 660, "short")])
+    assert schedule.find_clash(moved, (720, 780, "new")) == "moved"
+    print("✅ Schedule conflicts work")
+
+def test_event_archival():
+    """Past events move to cold storage with their registrations and stay readable"""
+    from datetime import datetime
+    
+    with redirect_stdout(io.StringIO()):
+        system = _fresh_system()
+        system.clock = lambda: datetime(2025, 1, 1, 12).timestamp()
+        admin_id = system.register_user("admin", UserRole.ADMIN)
+        student_id = system.register_user("student", UserRole.STUDENT)
+        system.login(admin_id)
+        old_id = system.create_event("Old Talk", "Past", "2024-03-01", "09:00", "Hall", 50)
+        old_series_id = system.create_event("Old Club", "Weekly", "2024-03-04", "18:00", "Lab", 50,
+                                            {"freq": "weekly", "count": 2})
+        recent_id = system.create_event("Recent Talk", "Past", "2024-12-01", "09:00", "Hall", 50)
+        open_series_id = system.create_event("Open Club", "Weekly", "2024-03-05", "18:00", "Lab", 50,
+                                             {"freq": "weekly"})
+        system.login(student_id)
+        for event_id in [old_id, f"{old_series_id}@2024-03-11", recent_id, f"{open_series_id}@2024-03-05"]:
+            assert system.register_for_event(event_id)
+        assert system.hold_seat(f"{old_series_id}@2024-03-04")
+        
+        assert system.archive_events(90) is None  # Admin only
+        system.login(admin_id)
+        assert system.archive_events(-1) is None
+        assert system.archive_events(90) == 2
+        assert system.archive_events(90) == 0
+    
+    assert set(system.events) == {recent_id, open_series_id}
+    assert system.users[student_id].registered_events == [recent_id, f"{open_series_id}@2024-03-05"]
+    assert system.users[admin_id].created_events == [recent_id, open_series_id]
+    assert system._holds == {}
+    assert system.get_event(f"{old_series_id}@2024-03-11") is None
+    assert system.search_events("old") == []
+    
+    # A fresh process sees the same split, and reads archived events on demand
+    with redirect_stdout(io.StringIO()):
+        reloaded = EventManagementSystem(data_dir=system.data_dir)
+        assert set(reloaded.events) == {recent_id, open_series_id}
+        assert reloaded.get_archived_event(old_id).attendees == [student_id]
+        assert reloaded.get_archived_event(recent_id) is None
+        assert {event.event_id for event in reloaded.search_archived_events("club", student_id)} == {old_series_id}
+        assert [event.event_id for event in reloaded.search_archived_events()] == [old_id, old_series_id]
+        assert reloaded.search_archived_events(user_id=admin_id)  # As organizer
+        
+        # Event IDs are never reused, whether an event was archived or deleted
+        reloaded.login(admin_id)
+        assert reloaded.delete_event(open_series_id)
+        new_id = reloaded.create_event("New Talk", "Future", "2025-02-01", "09:00", "Hall", 50)
+        assert new_id == "event_5"
+        reloaded.clock = lambda: datetime(2025, 12, 1).timestamp()
+        assert reloaded.archive_events(30) == 2
+    assert len(os.listdir(os.path.join(system.data_dir, "archive"))) == 3  # Two segments and the index
+    assert [event.event_id for event in reloaded.search_archived_events("talk")] == [old_id, recent_id, new_id]
+    print("✅ Event archival works")
+
+def test_registration_timeline():
+    """Registration times survive a reload delta-encoded, and rollups stay incremental"""
+    from datetime import datetime
+    from timeline import RegistrationTimeline, delta_decode, delta_encode
+    
+    now = [datetime(2025, 1, 1, 9, 0).timestamp()]
+    with redirect_stdout(io.StringIO()):
+        system, admin_id, student_ids = _system_with_students(4)
+        system.clock = lambda: now[0]
+        system.login(admin_id)
+        talk_id = system.create_event("Talk", "Popular", "2025-02-01", "09:00", "Hall", 3)
+        club_id = system.create_event("Club", "Weekly", "2025-02-03", "18:00", "Lab", 10,
+                                      {"freq": "weekly", "count": 4})
+        system.events[talk_id].created_at = datetime(2025, 1, 1, 8, 0).isoformat()
+        
+        for offset, student_id in zip([0, 90, 3600], student_ids):
+            now[0] += offset
+            system.login(student_id)
+            assert system.register_for_event(talk_id)
+        assert system.register_for_event(f"{club_id}@2025-02-10")
+        system.login(admin_id)
+        assert system.get_registration_curve(talk_id, "minute") == [
+            ("2025-01-01 09:00", 1, 1), ("2025-01-01 09:01", 1, 2), ("2025-01-01 10:01", 1, 3)]
+        
+        now[0] += 60
+        system.login(student_ids[0])
+        assert system.unregister_from_event(talk_id)  # Updates the built minute rollup
+        system.login(student_ids[3])
+        assert system.register_for_event(talk_id)  # Full again; the first sell-out counts
+        
+        reloaded = EventManagementSystem(data_dir=system.data_dir)
+        reloaded.login(admin_id)
+        assert reloaded.get_registration_curve(talk_id, "hour") == [
+            ("2025-01-01 09:00", 2, 2), ("2025-01-01 10:00", 1, 3)]
+        assert reloaded.get_registration_curve(talk_id, "minute")[-1] == ("2025-01-01 10:02", 0, 3)
+        assert reloaded.get_registration_curve(f"{club_id}@2025-02-10", "day") == [("2025-01-01 00:00", 1, 1)]
+        assert reloaded.get_registration_curve(talk_id, "week") == []
+        assert reloaded.get_sell_out_report() == [{
+            "event_id": talk_id, "name": "Talk", "date": "2025-02-01",
+            "sold_out_at": datetime(2025, 1, 1, 10, 1, 30).isoformat(), "seconds_to_sell_out": 7290}]
+        reloaded.login(student_ids[1])
+        assert reloaded.get_registration_curve(talk_id) == []  # Students cannot see it
+    
+    with open(os.path.join(system.data_dir, "events.json"), encoding="utf-8") as f:
+        saved = json.load(f)[talk_id]["registrations"]
+    assert saved["registered"][1:] == [90, 3600, 60] and saved["cancelled"][1:] == []
+    assert list(delta_decode(delta_encode([5, 3, 9]))) == [5, 3, 9]
+    assert len(RegistrationTimeline.from_dict(saved)) == 4
+    print("✅ Registration timelines work")
+
+def test_notification_outbox():
+    """Moves and cancellations queue one job with the mutation; workers deliver it in batches"""
+    from notifications import FileSender, NotificationDispatcher, SMTPSender
+    
+    with redirect_stdout(io.StringIO()):
+        system = _fresh_system()
+        admin_id = system.register_user("admin", UserRole.ADMIN)
+        student_ids = [system.register_user(f"student_{i}", UserRole.STUDENT, f"s{i}@campus.edu")
+                       for i in range(5)]
+        student_ids.append(system.register_user("no_email", UserRole.STUDENT))
+        system.login(admin_id)
+        talk_id = system.create_event("Talk", "Popular", "2025-02-01", "09:00", "Hall", 50)
+        club_id = system.create_event("Club", "Weekly", "2025-02-03", "18:00", "Lab", 10,
+                                      {"freq": "weekly", "count": 4})
+        for student_id in student_ids:
+            system.login(student_id)
+            assert system.register_for_event(talk_id)
+        system.login(student_ids[0])
+        assert system.register_for_event(f"{club_id}@2025-02-10")
+        
+        system.login(admin_id)
+        assert system.update_event(talk_id, description="Now with snacks")
+        assert system.outbox.pending() == []  # Nothing attendees need to know
+        try:
+            with system.transaction():
+                system.update_event(talk_id, location="Gym")
+                raise RuntimeError("rolled back")
+        except RuntimeError:
+            pass
+        assert system.outbox.pending() == []
+        
+        # A save that fails leaves no job behind
+        write_json = system._write_json
+        def failing_write_json(name, data):
+            if name == "events.json":
+                raise OSError("disk full")
+            return write_json(name, data)
+        system._write_json = failing_write_json
+        try:
+            system.update_event(talk_id, location="Gym")
+        except OSError:
+            pass
+        system._write_json = write_json
+        assert os.listdir(system.outbox.directory) == []
+        assert system.update_event(talk_id, location="Main Hall", time="10:00")
+        assert system.cancel_occurrence(f"{club_id}@2025-02-10")
+    
+    jobs = system.outbox.pending()
+    assert len(jobs) == 2
+    
+    class FlakySMTP:
+        """SMTP stub that refuses the first connection"""
+        connections = 0
+        sent = []
+        
+        def __init__(self, host, port):
+            FlakySMTP.connections += 1
+            if FlakySMTP.connections == 1:
+                raise ConnectionRefusedError("try again")
+        
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *exc_info):
+            return False
+        
+        def send_message(self, message):
+            FlakySMTP.sent.append((message["To"], message["Subject"]))
+    
+    dispatcher = NotificationDispatcher(system, SMTPSender(smtp_factory=FlakySMTP), workers=1, batch_size=2)
+    first = dispatcher.run_once()
+    assert first["jobs"] == 2 and first["failed"] == 2 and first["sent"] + first["skipped"] == 5
+    assert len(system.outbox.pending()) == 1  # The failed batch is queued again
+    second = dispatcher.run_once()
+    dispatcher.stop()
+    assert second == {"jobs": 1, "sent": 2, "skipped": 0, "failed": 0}
+    assert system.outbox.pending() == []
+    assert len(FlakySMTP.sent) == 6 and ("s0@campus.edu", "Update: Talk") in FlakySMTP.sent
+    assert ("s0@campus.edu", "Cancelled: Club") in FlakySMTP.sent
+    
+    with redirect_stdout(io.StringIO()):
+        assert system.delete_event(talk_id)
+    path = os.path.join(system.data_dir, "notifications.jsonl")
+    dispatcher = NotificationDispatcher(system, FileSender(path), batch_size=2)
+    assert dispatcher.run_once() == {"jobs": 1, "sent": 5, "skipped": 1, "failed": 0}
+    dispatcher.stop()
+    with open(path, encoding="utf-8") as f:
+        messages = [json.loads(line) for line in f]
+    assert {message["to"] for message in messages} == {f"s{i}@campus.edu" for i in range(5)}
+    assert messages[0]["body"] == "'Talk' on 2025-02-01 at 10:00 has been cancelled."
+    print("✅ Notification outbox works")
+
+def test_trace_record_and_replay():
+    """A recorded session replays into a fresh directory with the same outcomes and data"""
+    import tracing
+    
+    with redirect_stdout(io.StringIO()):
+        system = _fresh_system()
+        trace_path = os.path.join(system.data_dir, "trace.jsonl")
+        system.start_trace(trace_path)
+        admin_id = system.register_user("admin", UserRole.ADMIN)
+        student_id = system.register_user("student", UserRole.STUDENT)
+        system.login(admin_id)
+        event_id = system.create_event("Talk", "Popular", "2025-02-01", "09:00", "Hall", 1,
+                                       recurrence_rule=None)
+        workshop_id = system.create_event("Workshop", "Hands-on", "2025-02-02", "09:00", "Lab", 5)
+        system.login(student_id)
+        assert system.register_for_event(event_id)
+        assert not system.register_for_event(event_id)  # Already registered
+        assert system.search_events("talk")
+        assert [row.name for row in system.query_events(location="Hall")] == ["Talk"]
+        assert list(system.query_events(location="Gym")) == []
+        with system.transaction():
+            system.unregister_from_event(event_id)
+            system.register_for_event(event_id)
+        assert system.confirm_hold(system.hold_seat(workshop_id))
+        system.stop_trace()
+        system.logout()  # Not recorded
+    
+    assert not set(tracing.traced_methods()) & set(vars(system))  # Wrappers removed
+    calls = list(tracing.read_trace(trace_path))
+    assert [call["op"] for call in calls] == [
+        "register_user", "register_user", "login", "create_event", "create_event", "login",
+        "register_for_event", "register_for_event", "search_events", "query_events", "query_events",
+        "unregister_from_event", "register_for_event", "hold_seat", "confirm_hold"]
+    assert calls[0]["args"] == ["admin", {"$role": "admin"}]
+    assert calls[3]["user"] == admin_id and calls[3]["kwargs"] == {"recurrence_rule": None}
+    assert [call["ok"] for call in calls[6:8]] == [True, False]
+    assert [call["ok"] for call in calls[9:11]] == [True, False]  # Lazy results are consumed
+    assert calls[-1]["args"] == [calls[-2]["result"]]
+    
+    replay_dir = _temporary_directory("ems_replay_test_")
+    report = tracing.replay(trace_path, data_dir=replay_dir)
+    assert report["calls"] == len(calls) and report["diverged"] == 0
+    assert report["operations"]["register_for_event"]["calls"] == 3
+    with redirect_stdout(io.StringIO()):
+        replayed = EventManagementSystem(data_dir=replay_dir)
+    assert replayed.events[event_id].attendees == [student_id]
+    assert replayed.users[student_id].registered_events == [event_id, workshop_id]
+    
+    # Seeding copies the seed into a new directory; held tokens still map to the replayed ones
+    with redirect_stdout(io.StringIO()):
+        seed_dir = _fresh_system().data_dir
+    report = tracing.replay(trace_path, seed_dir=seed_dir)
+    assert report["calls"] == len(calls) and report["diverged"] == 0
+    print("✅ Trace record and replay work")
+
+def test_tenant_manager():
+    """Campuses are isolated, loaded lazily, evicted by LRU or idleness and measured"""
+    from notifications import FileSender
+    from tenancy import TenantManager
+    
+    now = [0.0]
+    manager = TenantManager(_temporary_directory("ems_tenants_"), max_loaded=2, idle_seconds=60,
+                            exact_memory=True, clock=lambda: now[0])
+    with redirect_stdout(io.StringIO()):
+        for campus in ["north", "south"]:
+            system = manager.get(campus, create=True)
+            admin_id = system.register_user(f"{campus}_admin", UserRole.ADMIN)
+            system.login(admin_id)
+            system.create_event(f"{campus} fair", "Stalls", "2025-05-01", "10:00", "Quad", 100)
+    
+    assert manager.tenants() == ["north", "south"]
+    assert [event.name for event in manager.get("north").events.values()] == ["north fair"]
+    assert manager.get("south").find_user("north_admin") is None
+    assert manager.loaded() == ["north", "south"]
+    
+    with redirect_stdout(io.StringIO()):
+        manager.get("west", create=True)  # Evicts the least recently used tenant
+    assert manager.loaded() == ["south", "west"]
+    assert manager.get("north").events["event_1"].name == "north fair"  # Reloaded from disk
+    now[0] += 61
+    assert manager.get("south") is not None and manager.loaded() == ["south"]  # The others idled out
+    
+    metrics = manager.metrics()
+    assert metrics["north"]["loads"] == 2 and metrics["north"]["evictions"] == 2
+    assert metrics["north"]["events"] == 1 and metrics["north"]["load_seconds"] > 0
+    assert metrics["north"]["memory_bytes"] > 0 and not metrics["north"]["loaded"]
+    assert metrics["south"]["hits"] >= 1 and metrics["south"]["idle_seconds"] == 0
+    
+    for bad_name in ["../etc", "North", ""]:
+        try:
+            manager.get(bad_name, create=True)
+            assert False, bad_name
+        except ValueError:
+            pass
+    try:
+        manager.get("east")
+        assert False
+    except KeyError:
+        pass
+    
+    # A slow load does not hold up tenants that are already loaded
+    import threading
+    load = manager._load
+    loading, finish_loading = threading.Event(), threading.Event()
+    def slow_load(directory):
+        loading.set()
+        finish_loading.wait(10)
+        return load(directory)
+    manager._load = slow_load
+    loader = threading.Thread(target=manager.get, args=("north",))
+    loader.start()
+    assert loading.wait(10)
+    fetched = []
+    fetcher = threading.Thread(target=lambda: fetched.append(manager.get("south")))
+    fetcher.start()
+    fetcher.join(5)
+    assert fetched and manager.loaded() == ["south"]
+    finish_loading.set()
+    loader.join()
+    del manager._load
+    assert manager.loaded() == ["south", "north"] and manager.metrics()["north"]["loads"] == 3
+    
+    dispatcher = manager.dispatcher("south", FileSender(os.path.join(manager.root, "out.jsonl")))
+    assert dispatcher._executor is manager.executor
+    assert dispatcher.run_once()["jobs"] == 0
+    dispatcher.stop()  # Leaves the shared pool running
+    assert manager.executor.submit(lambda: 42).result() == 42
+    manager.shutdown()
+    assert manager.loaded() == []
+    print("✅ Tenant manager works")
+
+def test_projected_queries():
+    """Projected queries filter and return only the requested fields, series dates included"""
+    with redirect_stdout(io.StringIO()):
+        system = _fresh_system()
+        admin_id = system.register_user("admin", UserRole.ADMIN)
+        organizer_id = system.register_user("organizer", UserRole.EVENT_ORGANIZER, "org@campus.edu")
+        student_id = system.register_user("student", UserRole.STUDENT, "student@campus.edu")
+        system.login(organizer_id)
+        talk_id = system.create_event("Talk", "Intro", "2025-03-05", "10:00", "Main Hall", 1)
+        club_id = system.create_event("Club", "Weekly", "2025-03-03", "18:00", "Lab", 10,
+                                      {"freq": "weekly", "count": 3})
+        system.login(admin_id)
+        fair_id = system.create_event("Fair", "Stalls", "2025-04-01", "09:00", "main hall", 50)
+        system.login(student_id)
+        assert system.register_for_event(talk_id)
+        assert system.register_for_event(f"{club_id}@2025-03-10")
+        
+        rows = list(system.query_events())
+        assert [row.event_id for row in rows] == [club_id, talk_id, fair_id]  # A series is one row
+        assert rows[1] == (talk_id, "Talk", "2025-03-05", 1) and rows[1]._fields == (
+            "event_id", "name", "date", "attendance")
+        
+        march = list(system.query_events(("event_id", "date", "attendance", "series_id"),
+                                         start_date="2025-03-01", end_date="2025-03-31"))
+        assert march == [(f"{club_id}@2025-03-03", "2025-03-03", 0, club_id),
+                         (talk_id, "2025-03-05", 1, None),
+                         (f"{club_id}@2025-03-10", "2025-03-10", 1, club_id),
+                         (f"{club_id}@2025-03-17", "2025-03-17", 0, club_id)]
+        
+        assert [row.name for row in system.query_events(organizer_id=organizer_id)] == ["Club", "Talk"]
+        assert [row.event_id for row in system.query_events(location="MAIN HALL ")] == [talk_id, fair_id]
+        assert [row.seats_left for row in system.query_events(("seats_left",), has_seats=False)] == [0]
+        assert [row.event_id for row in system.query_events(has_seats=True, start_date="2025-03-06")] == [fair_id]
+        
+        assert list(system.query_events(("name", "price"))) == []
+        assert list(system.query_events(start_date="03/01/2025")) == []
+        assert list(system.query_users()) == []  # Students cannot list users
+        system.login(admin_id)
+        assert list(system.query_users(("username", "registered_count"), role=UserRole.STUDENT)) == [
+            ("student", 2)]
+        assert list(system.query_users(("user_id", "role"), user_ids=[student_id, "user_404"])) == [
+            (student_id, "student")]
+    
+    import projections
+    project = projections.event_projection(("attendance", "name", "seats_left", "location"))
+    assert project(system.events[club_id]) == (1, "Club", 10, "Lab")
+    assert project(system.events[club_id], "2025-03-10") == (1, "Club", 9, "Lab")
+    print("✅ Projected queries work")
+
+def test_organizer_dashboard():
+    """Dashboards are built once and then kept current by every change"""
+    import random
+    from datetime import datetime
+    
+    now = [datetime(2025, 1, 1, 9, 0).timestamp()]
+    with redirect_stdout(io.StringIO()):
+        system = _fresh_system()
+        system.clock = lambda: now[0]
+        admin_id = system.register_user("admin", UserRole.ADMIN)
+        organizer_id = system.register_user("organizer", UserRole.EVENT_ORGANIZER)
+        other_id = system.register_user("other", UserRole.EVENT_ORGANIZER)
+        student_ids = [system.register_user(f"student_{i}", UserRole.STUDENT) for i in range(6)]
+        system.login(organizer_id)
+        assert system.get_organizer_dashboard() == {
+            "total_events": 0, "total_seats": 0, "seats_filled": 0, "fill_rate": 0.0, "fastest_filling": None}
+        
+        talk_id = system.create_event("Talk", "Intro", "2025-02-01", "09:00", "Hall", 2)
+        fair_id = system.create_event("Fair", "Stalls", "2025-02-02", "12:00", "Quad", 4)
+        club_id = system.create_event("Club", "Weekly", "2025-02-03", "18:00", "Lab", 3,
+                                      {"freq": "weekly", "count": 4})
+        system.events[talk_id].created_at = datetime(2025, 1, 1, 8, 0).isoformat()
+        for student_id in student_ids[:3]:
+            now[0] += 60
+            system.login(student_id)
+            assert system.register_for_event(fair_id)
+            assert system.register_for_event(f"{club_id}@2025-02-10")
+        system.login(student_ids[3])
+        assert system.register_for_event(talk_id)
+        
+        system.login(organizer_id)
+        dashboard = system.get_organizer_dashboard()
+        assert system._dashboards[organizer_id] is not None  # Built on the first view
+        assert dashboard == {"total_events": 3, "total_seats": 2 + 4 + 3, "seats_filled": 7,
+                             "fill_rate": 7 / 9, "fastest_filling": {
+                                 "event_id": f"{club_id}@2025-02-10", "seconds_to_sell_out": 0,
+                                 "name": "Club"}}
+        
+        now[0] += 60
+        system.login(student_ids[4])
+        assert system.register_for_event(talk_id)  # Full 64 minutes after it was created
+        assert system.register_for_event(f"{club_id}@2025-02-17")  # A new date offers its seats
+        system.login(student_ids[0])
+        assert system.unregister_from_event(fair_id)
+        system.login(organizer_id)
+        dashboard = system.get_organizer_dashboard()
+        assert (dashboard["total_seats"], dashboard["seats_filled"]) == (12, 8)
+        assert dashboard["fastest_filling"]["event_id"] == f"{club_id}@2025-02-10"
+        assert system.get_organizer_dashboard(other_id) == {}  # Only their own
+        
+        system.login(admin_id)
+        assert system.update_event(fair_id, max_capacity=10)
+        assert system.cancel_occurrence(f"{club_id}@2025-02-10")
+        dashboard = system.get_organizer_dashboard(organizer_id)
+        assert (dashboard["total_seats"], dashboard["seats_filled"]) == (2 + 10 + 3, 5)
+        assert dashboard["fastest_filling"] == {"event_id": talk_id, "seconds_to_sell_out": 3840, "name": "Talk"}
+        
+        assert system.get_organizer_dashboard(other_id)["total_events"] == 0
+        
+        # Random changes keep the running totals equal to a rebuild from scratch
+        rng = random.Random(7)
+        event_ids = [talk_id, fair_id, f"{club_id}@2025-02-17", f"{club_id}@2025-02-24"]
+        for _ in range(200):
+            now[0] += rng.randint(1, 600)
+            system.login(rng.choice(student_ids))
+            event_id = rng.choice(event_ids)
+            if rng.random() < 0.6:
+                system.register_for_event(event_id)
+            else:
+                system.unregister_from_event(event_id)
+        system.login(other_id)
+        system.create_event("Walk", "Tour", "2025-03-01", "10:00", "Gate", 5)
+        system.login(admin_id)
+        for user_id in (organizer_id, other_id):
+            incremental = system.get_organizer_dashboard(user_id)
+            del system._dashboards[user_id]
+            assert system.get_organizer_dashboard(user_id) == incremental
+        assert system.delete_event(talk_id)
+        assert system.get_organizer_dashboard(organizer_id)["total_events"] == 2
+    print("✅ Organizer dashboards work")
+
 if __name__ == "__main__":
     print("🚀 Campus Event Management System - Test Suite")
     print("=" * 60)
@@ -320,7 +1860,7 @@ if __name__ == "__main__":
         demo_user_interaction()
         
         print("\n✅ All tests and demos completed successfully!")
-        print("📁 Check the 'data' folder for generated files")
+        print("📁 Generated files were written to temporary data folders")
         
     except Exception as e:
         print(f"❌ Error during testing: {e}")
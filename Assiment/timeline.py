@@ -0,0 +1,129 @@
+"""
+When registrations happened, per event
+
+Every registration and cancellation is logged as a Unix timestamp in whole
+seconds. Logs are append-only and nearly sorted, so they are stored
+delta-encoded: the first timestamp, then the gap to each next one. A day of
+sign-ups thus serializes as a few small integers per registration rather
+than repeated ten-digit times. Logs are decoded only when an event is
+registered for or queried, so loading untouched events costs nothing extra.
+
+Minute, hour and day rollups (net registrations per UTC bucket) are built
+from the log on first request and kept current by every later add or
+cancel, so registrations-over-time curves never rescan the log. The moment
+an event first filled up is recorded as it happens, for time-to-sell-out.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+
+
+def delta_encode(values: Iterable[int]) -> List[int]:
+    """First value, then the difference from each value to the next"""
+    encoded = []
+    previous = 0
+    for value in values:
+        encoded.append(value - previous)
+        previous = value
+    return encoded
+
+
+def delta_decode(deltas: Iterable[int]) -> array:
+    """Inverse of delta_encode, as an array of 64-bit integers"""
+    values = array("q")
+    total = 0
+    for delta in deltas:
+        total += delta
+        values.append(total)
+    return values
+
+
+class RegistrationTimeline:
+    """Registration and cancellation times of one event (or one date of a series)"""
+
+    __slots__ = ("_encoded", "_registered", "_cancelled", "sold_out_at", "_rollups")
+
+    def __init__(self, sold_out_at: Optional[int] = None):
+        self._encoded: Optional[Dict] = None  # Saved form, until first decoded
+        self._registered = array("q")
+        self._cancelled = array("q")
+        self.sold_out_at = sold_out_at  # First time every seat was taken
+        self._rollups: Dict[int, Dict[int, int]] = {}  # Bucket size -> bucket start -> net count
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RegistrationTimeline':
+        """Wrap a saved timeline without decoding it"""
+        timeline = cls(data.get("sold_out_at"))
+        timeline._encoded = data
+        return timeline
+
+    def to_dict(self) -> Dict:
+        """Delta-encoded form for JSON; an undecoded timeline is returned as loaded"""
+        if self._encoded is not None:
+            return self._encoded
+        return {"registered": delta_encode(self._registered),
+                "cancelled": delta_encode(self._cancelled),
+                "sold_out_at": self.sold_out_at}
+
+    def _decode(self):
+        """Decode the saved form on first use"""
+        if self._encoded is not None:
+            self._registered = delta_decode(self._encoded.get("registered", []))
+            self._cancelled = delta_decode(self._encoded.get("cancelled", []))
+            self._encoded = None
+
+    def _bump(self, timestamp: int, delta: int):
+        """Update the rollups built so far"""
+        for size, buckets in self._rollups.items():
+            bucket = timestamp - timestamp % size
+            buckets[bucket] = buckets.get(bucket, 0) + delta
+
+    def add(self, timestamp: int, sold_out: bool = False):
+        """Log a registration; sold_out if it took the last seat"""
+        self._decode()
+        self._registered.append(timestamp)
+        self._bump(timestamp, 1)
+        if sold_out and self.sold_out_at is None:
+            self.sold_out_at = timestamp
+
+    def cancel(self, timestamp: int):
+        """Log a cancelled registration"""
+        self._decode()
+        self._cancelled.append(timestamp)
+        self._bump(timestamp, -1)
+
+    def __len__(self) -> int:
+        """Number of registrations logged (cancelled ones included)"""
+        if self._encoded is not None:
+            return len(self._encoded.get("registered", []))
+        return len(self._registered)
+
+    @property
+    def first_registration_at(self) -> Optional[int]:
+        """Time of the earliest logged registration"""
+        self._decode()
+        return min(self._registered) if self._registered else None
+
+    def rollup(self, resolution: str) -> Dict[int, int]:
+        """Net registrations per bucket start ("minute", "hour" or "day"), built once"""
+        size = RESOLUTIONS[resolution]
+        buckets = self._rollups.get(size)
+        if buckets is None:
+            self._decode()
+            buckets = self._rollups[size] = {}
+            for timestamps, delta in ((self._registered, 1), (self._cancelled, -1)):
+                for timestamp in timestamps:
+                    bucket = timestamp - timestamp % size
+                    buckets[bucket] = buckets.get(bucket, 0) + delta
+        return buckets
+
+    def curve(self, resolution: str) -> List[Tuple[int, int, int]]:
+        """(bucket start, net registrations, running total) for each bucket with activity"""
+        points = []
+        total = 0
+        for bucket, count in sorted(self.rollup(resolution).items()):
+            total += count
+            points.append((bucket, count, total))
+        return points
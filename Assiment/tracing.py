@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Record and replay operation traces for performance regression testing
+
+Recording wraps the public methods of one EventManagementSystem instance;
+each outermost call (not the calls it makes itself) appends one JSON line
+to the trace file:
+
+    {"op": "register_for_event", "user": "user_3", "args": ["event_2"],
+     "kwargs": {}, "ok": true, "ms": 1.84}
+
+"user" is who was logged in when the call was made, "ok" is whether the
+result was truthy (false for errors too) and "ms" the recorded latency.
+Calls that return a token later calls pass back (hold_seat) also record it
+as "result", so a replay can map it to the token issued when replaying.
+Lazy results (query_events returns an iterator) are consumed within the
+call, so their work is timed and "ok" says whether they yielded anything.
+Systems that are not recording are not wrapped at all, so tracing costs
+nothing when it is off.
+
+Replaying re-executes a trace against a fresh data directory (optionally
+seeded with a copy of the data the trace was recorded on). It reports
+throughput, per-operation latency next to the recorded latency, and how
+many calls had a different outcome than when recorded:
+    python tracing.py registration_day.jsonl --seed data
+"""
+
+import argparse
+import collections.abc
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from typing import Dict, Iterator, List, Optional
+
+from event_management_system import EventManagementSystem, UserRole
+
+# Public methods that are not operations on the data
+UNTRACED = {"transaction", "refresh", "invalidate_cache", "cache_stats", "follow_changes",
+            "start_trace", "stop_trace"}
+
+# Operations returning a random token that later calls take as an argument
+TOKEN_RESULTS = {"hold_seat"}
+
+
+def traced_methods(cls=EventManagementSystem) -> List[str]:
+    """Names of the public methods recorded in a trace"""
+    return [name for name, value in vars(cls).items()
+            if callable(value) and not name.startswith("_") and name not in UNTRACED]
+
+
+def encode(value):
+    """JSON-safe form of an argument; roles are tagged so they can be restored"""
+    if isinstance(value, UserRole):
+        return {"$role": value.value}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: encode(item) for key, item in value.items()}
+    return value
+
+
+def decode(value):
+    """Inverse of encode"""
+    if isinstance(value, dict):
+        if set(value) == {"$role"}:
+            return UserRole(value["$role"])
+        return {key: decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    return value
+
+
+class TraceRecorder:
+    """Append the calls made on one system to a JSONL trace file"""
+
+    def __init__(self, system: EventManagementSystem, path: str):
+        self.system = system
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Call depth per thread, to skip nested calls
+
+    def _wrap(self, name: str, method):
+        def traced(*args, **kwargs):
+            if getattr(self._local, "depth", 0):
+                return method(*args, **kwargs)
+            user = self.system.current_user.user_id if self.system.current_user else None
+            self._local.depth = 1
+            ok = False
+            result = None
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+                if isinstance(result, collections.abc.Iterator):
+                    rows = list(result)  # Consumed here so its work is timed
+                    ok = bool(rows)
+                    return iter(rows)
+                ok = bool(result)
+                return result
+            finally:
+                elapsed = time.perf_counter() - started
+                self._local.depth = 0
+                record = {"op": name, "user": user, "args": encode(args), "kwargs": encode(kwargs),
+                          "ok": ok, "ms": round(elapsed * 1000, 3)}
+                if name in TOKEN_RESULTS:
+                    record["result"] = result
+                self._write(record)
+
+        traced.__wrapped__ = method
+        return traced
+
+    def _write(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False, default=repr) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()  # One write per line keeps lines whole across processes
+
+    def start(self):
+        """Shadow the system's public methods with recording wrappers"""
+        for name in traced_methods(type(self.system)):
+            setattr(self.system, name, self._wrap(name, getattr(self.system, name)))
+
+    def stop(self):
+        """Remove the wrappers and close the trace file"""
+        for name in traced_methods(type(self.system)):
+            self.system.__dict__.pop(name, None)
+        self._file.close()
+
+
+def read_trace(path: str) -> Iterator[Dict]:
+    """Calls of a trace file, in order"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def replay(trace_path: str, data_dir: Optional[str] = None, seed_dir: Optional[str] = None) -> Dict:
+    """Re-execute a trace against a fresh data directory and report its performance.
+
+    With seed_dir, data_dir must not exist yet; the seed is copied to it.
+    """
+    work_dir = None if data_dir else tempfile.mkdtemp(prefix="ems_replay_")
+    root = data_dir or os.path.join(work_dir, "data")
+    if seed_dir:
+        shutil.copytree(seed_dir, root, ignore=shutil.ignore_patterns(".lock"))
+
+    latencies: Dict[str, List[float]] = {}
+    recorded: Dict[str, List[float]] = {}
+    tokens: Dict[str, str] = {}  # Recorded token -> token issued in this replay
+    diverged = 0
+    with redirect_stdout(io.StringIO()):
+        system = EventManagementSystem(data_dir=root)
+        started = time.perf_counter()
+        for call in read_trace(trace_path):
+            # Act as whoever made the call; login/logout calls are replayed as well
+            system.current_user = system.users.get(call["user"]) if call["user"] else None
+            method = getattr(system, call["op"])
+            args = [tokens.get(arg, arg) if isinstance(arg, str) else arg for arg in decode(call["args"])]
+            kwargs = {key: tokens.get(value, value) if isinstance(value, str) else value
+                      for key, value in decode(call["kwargs"]).items()}
+            call_started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+                if isinstance(result, collections.abc.Iterator):
+                    result = list(result)
+                ok = bool(result)
+            except Exception:
+                result, ok = None, False
+            if call.get("result") and result:
+                tokens[call["result"]] = result
+            latencies.setdefault(call["op"], []).append((time.perf_counter() - call_started) * 1000)
+            recorded.setdefault(call["op"], []).append(call.get("ms", 0.0))
+            diverged += ok != call.get("ok", ok)
+        elapsed = time.perf_counter() - started
+
+    operations = {}
+    for name, values in latencies.items():
+        values.sort()
+        recorded_values = sorted(recorded[name])
+        operations[name] = {"calls": len(values), "p50_ms": _percentile(values, 0.50),
+                            "p95_ms": _percentile(values, 0.95), "max_ms": values[-1],
+                            "recorded_p50_ms": _percentile(recorded_values, 0.50)}
+    calls = sum(len(values) for values in latencies.values())
+
+    if work_dir is not None:
+        shutil.rmtree(work_dir)
+    return {"calls": calls, "seconds": elapsed, "calls_per_second": calls / elapsed if elapsed else 0.0,
+            "diverged": diverged, "operations": operations}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an operation trace and report its performance")
+    parser.add_argument("trace", help="JSONL trace recorded with --trace or start_trace")
+    parser.add_argument("--seed", help="Data directory copied in before replaying (default: start empty)")
+    parser.add_argument("--data-dir", help="Replay into this directory and keep it; it must not exist "
+                                           "when seeding (default: a temporary one)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = replay(args.trace, args.data_dir, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"📊 {report['calls']} calls in {report['seconds']:.2f}s "
+          f"({report['calls_per_second']:.0f}/s), {report['diverged']} with a different outcome")
+    print(f"{'operation':<28}{'calls':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'recorded p50':>14}")
+    for name, stats in sorted(report["operations"].items(), key=lambda item: -item[1]["calls"]):
+        print(f"{name:<28}{stats['calls']:>8}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+              f"{stats['max_ms']:>10.2f}{stats['recorded_p50_ms']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()